@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark results files and gate on regressions.
+
+For each benchmark the change of the median is taken in the "worse"
+direction (slower, or fewer games/s). It counts as a regression when it
+exceeds both the tolerance and SIGMA times the combined relative noise of
+the two runs (sample stdev / median), so noisy benchmarks need a bigger
+change before they fail.
+
+Only gated benchmarks (hot paths, see DEFAULT_GATES) fail the run;
+regressions elsewhere are reported as warnings.
+
+Usage:
+    compare.py <baseline.json> <current.json> [--tolerance=0.05] [--sigma=3]
+               [--gate=pattern,...] [--all]
+    compare.py record <results.json> [<baseline.json>]
+Example:
+    compare.py bench/baseline.json bench/results/current.json
+    compare.py record bench/results/current.json
+
+Exit status: 0 = no gated regression, 1 = gated regression, 2 = usage error
+"""
+import math
+import shutil
+import sys
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.harness import read_results
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# Benchmarks (substring match) whose regressions fail the gate
+DEFAULT_GATES = ('playout.random_games', 'compute_all.', 'execute_action', 'mechanic.execute.')
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.05, sigma: float = 3.0,
+            gates: tuple[str, ...] | None = DEFAULT_GATES) -> list[dict]:
+    """
+    Per-benchmark comparison of two results documents.
+
+    Args:
+        baseline, current: Documents from read_results()
+        tolerance: Relative change always allowed (0.05 = 5%)
+        sigma: Noise multiplier for the threshold
+        gates: Name patterns that fail the gate (None = all)
+
+    Returns:
+        One dict per benchmark: name, status (ok / improved / regressed /
+        new / missing), change (relative, positive = worse), threshold, gated
+    """
+    base_results, cur_results = baseline['benchmarks'], current['benchmarks']
+    rows = []
+    for name in sorted(set(base_results) | set(cur_results)):
+        gated = gates is None or any(pattern in name for pattern in gates)
+        base, cur = base_results.get(name), cur_results.get(name)
+        if base is None or cur is None:
+            rows.append({'name': name, 'status': 'new' if base is None else 'missing',
+                         'change': None, 'threshold': None, 'gated': gated})
+            continue
+
+        change = (cur['median'] - base['median']) / base['median'] if base['median'] else 0.0
+        if cur['higher_is_better']:
+            change = -change
+        noise = math.hypot(_relative_noise(base), _relative_noise(cur))
+        threshold = max(tolerance, sigma * noise)
+
+        if change > threshold:
+            status = 'regressed'
+        elif change < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'status': status, 'change': change, 'threshold': threshold,
+                     'gated': gated, 'baseline': base['median'], 'current': cur['median'], 'unit': cur['unit']})
+    return rows
+
+
+def environment_differences(baseline: dict, current: dict) -> list[str]:
+    """Environment fields that differ (numbers may not be comparable)."""
+    base_env, cur_env = baseline['environment'], current['environment']
+    differences = []
+    for key in ('hostname', 'machine', 'python', 'implementation', 'cpu_count', 'packages'):
+        if base_env.get(key) != cur_env.get(key):
+            differences.append(f"{key}: {base_env.get(key)} -> {cur_env.get(key)}")
+    return differences
+
+
+def _relative_noise(result: dict) -> float:
+    return result['stdev'] / result['median'] if result['median'] else 0.0
+
+
+def cmd_compare(baseline_path: str, current_path: str, options: dict) -> int:
+    baseline, current = read_results(baseline_path), read_results(current_path)
+    if 'all' in options:
+        gates = None
+    elif options.get('gate'):
+        gates = tuple(pattern for pattern in options['gate'].split(',') if pattern)
+    else:
+        gates = DEFAULT_GATES
+    rows = compare(baseline, current,
+                   tolerance=float(options.get('tolerance') or 0.05),
+                   sigma=float(options.get('sigma') or 3.0),
+                   gates=gates)
+
+    for difference in environment_differences(baseline, current):
+        print(f"warning: environment differs ({difference})", file=sys.stderr)
+
+    print(f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>8} {'limit':>7}  status")
+    for row in rows:
+        if row['change'] is None:
+            print(f"{row['name']:<48} {'':>12} {'':>12} {'':>8} {'':>7}  {row['status']}")
+            continue
+        status = row['status']
+        if status == 'regressed':
+            status = 'REGRESSED' if row['gated'] else 'regressed (not gated)'
+        print(f"{row['name']:<48} {row['baseline']:>12.2f} {row['current']:>12.2f} "
+              f"{row['change']:>+8.1%} {row['threshold']:>7.1%}  {status}")
+
+    failures = [row for row in rows if row['status'] == 'regressed' and row['gated']]
+    if failures:
+        print(f"\n{len(failures)} gated regression(s): {', '.join(row['name'] for row in failures)}",
+              file=sys.stderr)
+        return 1
+    print("\nno gated regressions", file=sys.stderr)
+    return 0
+
+
+def cmd_record(results_path: str, baseline_path: str | None) -> int:
+    read_results(results_path)  # Validate before replacing the baseline
+    target = Path(baseline_path) if baseline_path else DEFAULT_BASELINE
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(results_path, target)
+    print(f"recorded baseline {target} from {results_path}", file=sys.stderr)
+    return 0
+
+
+def main():
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('--'))
+
+    if positional[:1] == ['record'] and len(positional) in (2, 3):
+        sys.exit(cmd_record(positional[1], positional[2] if len(positional) == 3 else None))
+    if len(positional) == 2:
+        sys.exit(cmd_compare(positional[0], positional[1], options))
+    print(__doc__)
+    sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark harness: timing loop, result summaries, environment info and
+an isolated workspace to build fixture states in.
+
+A benchmark is a function fn(n) -> seconds that performs n operations and
+returns the time spent on them. Per-op setup (copying a state, picking a
+path) can stay outside the returned time, so mutating operations are
+measured on fresh inputs without counting the setup.
+
+Results file (JSON):
+    schema_version  RESULTS_SCHEMA
+    environment     python, platform, CPU, package versions, git commit
+    settings        repeat, min_time
+    benchmarks      name -> {unit, higher_is_better, ops, samples,
+                             median, mean, min, max, stdev}
+"""
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+RESULTS_SCHEMA = 1
+
+ROOT = Path(__file__).parent.parent
+
+
+class Benchmark(NamedTuple):
+    """A registered benchmark."""
+    name: str                       # Stable ID, e.g. "compute_all.full[midgame]"
+    fn: Callable                    # fn(n) -> seconds spent on n operations
+    unit: str = "us"                # "us" per op, or "<thing>/s" throughput
+    max_ops: int = 1_000_000        # Cap on n (bounds untimed per-op setup)
+
+
+def measure(benchmark: Benchmark, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Time a benchmark.
+
+    n is calibrated so one sample takes at least min_time (capped at
+    max_ops), then repeat samples are taken.
+
+    Returns:
+        Result dict (see module docstring)
+    """
+    n = 1
+    elapsed = benchmark.fn(n)
+    while elapsed < min_time and n < benchmark.max_ops:
+        per_op = max(elapsed / n, 1e-9)
+        n = min(benchmark.max_ops, max(n * 2, int(min_time / per_op * 1.2)))
+        elapsed = benchmark.fn(n)
+
+    per_op = [benchmark.fn(n) / n for _ in range(repeat)]
+    throughput = benchmark.unit.endswith("/s")
+    samples = [1 / s if throughput else s * 1e6 for s in per_op]
+    return {
+        'unit': benchmark.unit,
+        'higher_is_better': throughput,
+        'ops': n,
+        'samples': samples,
+        'median': statistics.median(samples),
+        'mean': statistics.fmean(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def environment() -> dict:
+    """Where the numbers came from."""
+    packages = {}
+    for name in ('networkx', 'pydot', 'numpy'):
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'hostname': platform.node(),
+        'packages': packages,
+        'git_commit': _git('rev-parse', 'HEAD'),
+        'git_dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def results_document(results: dict, settings: dict) -> dict:
+    """Results file contents for a run (see module docstring)."""
+    return {
+        'schema_version': RESULTS_SCHEMA,
+        'environment': environment(),
+        'settings': settings,
+        'benchmarks': results,
+    }
+
+
+def write_results(path: Path | str, document: dict) -> None:
+    """Write a results document as JSON (parent directories created)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def read_results(path: Path | str) -> dict:
+    """Read a results file written by write_results()."""
+    document = json.loads(Path(path).read_text())
+    if document.get('schema_version') != RESULTS_SCHEMA:
+        raise ValueError(f"{path}: results schema {document.get('schema_version')}, expected {RESULTS_SCHEMA}")
+    return document
+
+
+@contextmanager
+def workspace(data_dir: Path | str | None = None):
+    """
+    Run inside a temporary directory with data/ linked in.
+
+    The engine reads data/ and writes output/ relative to the working
+    directory; benchmarks use a scratch tree so nothing in the real
+    output/ is touched.
+    """
+    data_dir = Path(data_dir or ROOT / "data").resolve()
+    previous = os.getcwd()
+    scratch = tempfile.mkdtemp(prefix="dotcana-bench-")
+    try:
+        os.symlink(data_dir, os.path.join(scratch, "data"))
+        os.chdir(scratch)
+        yield Path(scratch)
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def _git(*args) -> str | None:
+    try:
+        result = subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
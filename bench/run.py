@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: rules engine, DOT I/O, stores, setup and random playouts.
+
+Fixture states come from the bundled decks (data/decks/bs01.txt vs
+rp01.txt) with fixed seeds, built in a scratch directory:
+    opening   first decision after the opening draw
+    midgame   halfway through a fixed random game
+    late      three quarters through it
+Per-mechanic execute benchmarks use the first state of that game where the
+mechanic has a legal action.
+
+Usage:
+    bench/run.py [--out=results.json] [--filter=a,b] [--repeat=5] [--min-time=0.2]
+                 [--quick] [--data=DIR] [--list]
+Example:
+    bench/run.py --out=bench/results/current.json
+    bench/run.py --filter=compute_all,playout --quick
+"""
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.harness import Benchmark, measure, results_document, workspace, write_results
+from lib.core.file_store import FileStore
+from lib.core.graph import load_dot, save_dot
+from lib.core.memory_store import MemoryStore
+from lib.core.navigation import format_actions
+from lib.lorcana.compute import compute_all
+from lib.lorcana.execute import execute_action
+from lib.lorcana.game_api import GameSession
+from lib.lorcana.helpers import get_player_zone
+from lib.lorcana.lore_race import race_bounds
+from lib.lorcana.mechanics.registry import get_mechanic, get_mechanics
+from lib.lorcana.setup import SeedBuilder, init_game, shuffle_and_draw
+from lib.lorcana.snapshot import GameSnapshot
+from lib.lorcana.state import LorcanaState
+from lib.lorcana.state_based_effects import check_state_based_effects
+
+DECK1 = "data/decks/bs01.txt"
+DECK2 = "data/decks/rp01.txt"
+SEED = "bench"
+GAME_SEED = 0
+
+
+# ========== Fixtures ==========
+
+class Fixtures:
+    """Matchup, seed state and the fixed random game the benchmarks run on."""
+
+    def __init__(self):
+        self.matchdir = Path("output") / init_game(DECK1, DECK2)
+        shuffle_and_draw(self.matchdir, SEED)
+        self.seed_path = self.matchdir / SEED
+        self.opening = FileStore().load_state(self.seed_path, LorcanaState)
+
+        # Fixed random game: every state along it
+        random.seed(GAME_SEED)
+        state = copy.deepcopy(self.opening)
+        self.game = [copy.deepcopy(state)]
+        self.moves = []   # (state, action taken from it)
+        while state.actions:
+            actions = [a for a in state.actions if a.action_type != 'CAN_PASS'] or state.actions
+            action = random.choice(actions)
+            self.moves.append((self.game[-1], action))
+            execute_action(state, action.action_type, action.src, action.dst)
+            self.game.append(copy.deepcopy(state))
+
+        self.states = {
+            'opening': self.opening,
+            'midgame': self.game[len(self.game) // 2],
+            'late': self.game[len(self.game) * 3 // 4],
+        }
+
+    def with_action(self, action_type: str) -> tuple[LorcanaState, object] | None:
+        """First state of the game with a legal action of this type, and that action."""
+        for state in self.game:
+            for action in state.actions:
+                if action.action_type == action_type:
+                    return state, action
+        return None
+
+
+# ========== Benchmarks ==========
+
+def build_benchmarks(fx: Fixtures, scratch: Path) -> list[Benchmark]:
+    benchmarks = []
+
+    for label, state in fx.states.items():
+        benchmarks.append(Benchmark(f"snapshot.build[{label}]", _loop(lambda s=state: GameSnapshot.from_graph(s.graph))))
+
+        snap = GameSnapshot.from_graph(state.graph)
+        for mechanic in get_mechanics():
+            benchmarks.append(Benchmark(f"mechanic.compute.{mechanic.action_type}[{label}]",
+                                        _loop(lambda m=mechanic, sn=snap: m.compute(sn))))
+
+        benchmarks.append(Benchmark(f"compute_all.full[{label}]", _compute_all_full(state)))
+        benchmarks.append(Benchmark(f"check_state_based_effects[{label}]", _state_based_effects(state)))
+
+    for mechanic in get_mechanics():
+        found = fx.with_action(mechanic.action_type)
+        if found:
+            benchmarks.append(Benchmark(f"mechanic.execute.{mechanic.action_type}", _execute(*found), max_ops=2000))
+
+    found = fx.with_action('CAN_INK')
+    if found:
+        benchmarks.append(Benchmark("compute_all.incremental[after_ink]", _compute_all_after(*found), max_ops=2000))
+    found = fx.with_action('CAN_PASS')
+    if found:
+        benchmarks.append(Benchmark("compute_all.incremental[after_pass]", _compute_all_after(*found), max_ops=2000))
+
+    mid = fx.states['midgame']
+    late = fx.states['late']
+    builder = SeedBuilder(fx.matchdir)
+    dot_path = scratch / "bench.dot"
+    save_dot(mid.export_graph(), dot_path)
+    benchmarks += [
+        Benchmark("execute_action[fixed_game]", _execute_action_full(fx), max_ops=2000),
+        Benchmark("state.deepcopy[midgame]", _loop(lambda: copy.deepcopy(mid))),
+        Benchmark("dot.save[midgame]", _loop(lambda: save_dot(mid.export_graph(), dot_path)), max_ops=2000),
+        Benchmark("dot.load[midgame]", _loop(lambda: load_dot(dot_path)), max_ops=2000),
+        Benchmark("store.file.save[midgame]", _file_save(mid, scratch / "store"), max_ops=500),
+        Benchmark("store.file.load[midgame]", _file_load(mid, scratch / "store-load"), max_ops=2000),
+        Benchmark("store.memory.save[midgame]", _memory_save(mid)),
+        Benchmark("store.memory.load[midgame]", _memory_load(mid)),
+        Benchmark("setup.shuffle_and_draw", _shuffle(fx.matchdir), max_ops=500),
+        Benchmark("setup.seed_builder.build", _loop(lambda: builder.build(SEED))),
+        Benchmark("playout.random_games", _playouts(fx.opening), unit="games/s", max_ops=200),
+        Benchmark("playout.random_games[stop_when_decided]", _playouts(fx.opening, stop_when_decided=True),
+                  unit="games/s", max_ops=200),
+        Benchmark("lore_race.race_bounds[late]", _loop(lambda: race_bounds(late))),
+    ]
+    return benchmarks
+
+
+def _loop(call):
+    """fn(n) timing n calls of a side-effect-free operation."""
+    def fn(n):
+        start = time.perf_counter()
+        for _ in range(n):
+            call()
+        return time.perf_counter() - start
+    return fn
+
+
+def _compute_all_full(state):
+    state = copy.deepcopy(state)
+
+    def fn(n):
+        start = time.perf_counter()
+        for _ in range(n):
+            state.action_cache = None
+            compute_all(state)
+        return time.perf_counter() - start
+    return fn
+
+
+def _state_based_effects(state):
+    state = copy.deepcopy(state)
+    in_play = {card for player in ('p1', 'p2') for card in state.cards_in(get_player_zone(player, 'play'))}
+
+    def fn(n):
+        start = time.perf_counter()
+        for _ in range(n):
+            state.dirty_cards = set(in_play)
+            check_state_based_effects(state)
+        return time.perf_counter() - start
+    return fn
+
+
+def _execute(state, action):
+    """The mechanic's execute alone, on a fresh copy each time."""
+    execute = get_mechanic(action.action_type).execute
+
+    def fn(n):
+        total = 0.0
+        for _ in range(n):
+            target = copy.deepcopy(state)
+            start = time.perf_counter()
+            execute(target, action.src, action.dst)
+            total += time.perf_counter() - start
+        return total
+    return fn
+
+
+def _execute_action_full(fx):
+    """execute_action (mechanic + state-based effects + compute_all) along the fixed game."""
+    def fn(n):
+        total = 0.0
+        for i in range(n):
+            state, action = fx.moves[i % len(fx.moves)]
+            target = copy.deepcopy(state)
+            start = time.perf_counter()
+            execute_action(target, action.action_type, action.src, action.dst)
+            total += time.perf_counter() - start
+        return total
+    return fn
+
+
+def _compute_all_after(state, action):
+    """Incremental compute_all right after one mechanic executed."""
+    execute = get_mechanic(action.action_type).execute
+
+    def fn(n):
+        total = 0.0
+        for _ in range(n):
+            target = copy.deepcopy(state)
+            execute(target, action.src, action.dst)
+            check_state_based_effects(target)
+            start = time.perf_counter()
+            compute_all(target)
+            total += time.perf_counter() - start
+        return total
+    return fn
+
+
+def _file_save(state, base: Path):
+    store = FileStore(max_cached=0)
+    counter = iter(range(1 << 62))
+
+    def fn(n):
+        paths = [base / str(next(counter)) for _ in range(n)]
+        start = time.perf_counter()
+        for path in paths:
+            store.save_state(state, path, format_actions_fn=format_actions)
+        return time.perf_counter() - start
+    return fn
+
+
+def _file_load(state, path: Path):
+    FileStore().save_state(state, path, format_actions_fn=format_actions)
+    store = FileStore(max_cached=0)   # Always a cold load (DOT parse)
+    return _loop(lambda: store.load_state(path, LorcanaState))
+
+
+def _memory_save(state):
+    store = MemoryStore()
+    return _loop(lambda: store.save_state(state, "bench", format_actions_fn=format_actions))
+
+
+def _memory_load(state):
+    store = MemoryStore()
+    store.save_state(state, "bench")
+    return _loop(lambda: store.load_state("bench", LorcanaState))
+
+
+def _shuffle(matchdir: Path):
+    counter = iter(range(1 << 62))
+
+    def fn(n):
+        seeds = [f"bench{next(counter)}" for _ in range(n)]
+        start = time.perf_counter()
+        for seed in seeds:
+            shuffle_and_draw(matchdir, seed)
+        return time.perf_counter() - start
+    return fn
+
+
+def _playouts(opening, stop_when_decided: bool = False):
+    """Random games from the opening (in-memory store, fixed RNG seeds)."""
+    session = GameSession(opening, stop_when_decided=stop_when_decided)
+
+    def fn(n):
+        start = time.perf_counter()
+        for game in range(n):
+            random.seed(game)
+            session.reset()
+            session.play_until_game_over()
+        return time.perf_counter() - start
+    return fn
+
+
+# ========== CLI ==========
+
+def main():
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('--'))
+    if positional:
+        print(__doc__)
+        sys.exit(1)
+
+    quick = 'quick' in options
+    repeat = int(options.get('repeat') or (3 if quick else 5))
+    min_time = float(options.get('min-time') or (0.05 if quick else 0.2))
+    filters = [f for f in options.get('filter', '').split(',') if f]
+
+    with workspace(options.get('data') or None) as scratch:
+        fixtures = Fixtures()
+        benchmarks = build_benchmarks(fixtures, scratch)
+        if filters:
+            benchmarks = [b for b in benchmarks if any(f in b.name for f in filters)]
+        if 'list' in options:
+            for benchmark in benchmarks:
+                print(benchmark.name)
+            return
+
+        print(f"[bench] fixed game: {len(fixtures.game) - 1} plies; {len(benchmarks)} benchmarks", file=sys.stderr)
+        results = {}
+        for benchmark in benchmarks:
+            result = measure(benchmark, repeat=repeat, min_time=min_time)
+            results[benchmark.name] = result
+            spread = result['stdev'] / result['median'] * 100 if result['median'] else 0.0
+            print(f"{benchmark.name:<48} {result['median']:>12.2f} {result['unit']:<8} "
+                  f"±{spread:4.1f}%  (n={result['ops']})", file=sys.stderr)
+
+    settings = {'repeat': repeat, 'min_time': min_time, 'filter': filters}
+    document = results_document(results, settings)
+    out = options.get('out')
+    if out:
+        write_results(out, document)
+        print(f"[bench] wrote {out}", file=sys.stderr)
+    else:
+        print(json.dumps(document, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Storage footprint benchmark: the same seeded games in every store format.
+
+A fixed corpus (--seeds seed states from bs01 vs rp01, --games random
+games each, fixed RNG seeds) is played once in memory, then written into
+each format:
+    file          FileStore, every state saved (game tree directories)
+    file+tt       FileStore with a transposition table (repeats symlinked)
+    replay        FileStore, final states only (apply_action_at_path)
+    replay+ckpt   final states plus checkpoints every --checkpoint plies
+    memory        MemoryStore (resident bytes instead of disk)
+    columnar      dataset shards (lib/lorcana/dataset.py; features, not states)
+
+Reported per format:
+    bytes         apparent size (files + symlinks) and allocated blocks
+    inodes        files, directories and symlinks
+    write         states/s and games/s writing the corpus
+    load          random-access latency of --samples states (median, p99);
+                  replay formats replay from the nearest stored ancestor,
+                  columnar reads one row
+    scan          reading every state once (file: raw bytes of every file,
+                  no parsing; replay: replaying every game; memory: loading
+                  every key; columnar: load_dataset)
+    projection    bytes and inodes for --project games at the same rate
+
+File numbers are warm page cache: the tree was just written.
+
+Usage:
+    bench/storage.py [--seeds=4] [--games=5] [--samples=200] [--checkpoint=10]
+                     [--formats=a,b] [--project=100000] [--data=DIR] [--out=FILE]
+Example:
+    bench/storage.py --out=bench/results/storage.json
+    bench/storage.py --formats=file,replay --games=20
+"""
+import copy
+import os
+import random
+import shutil
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench.harness import environment, workspace, write_results
+from lib.core.file_store import FileStore
+from lib.core.memory_store import MemoryStore
+from lib.core.transposition import TranspositionTable
+from lib.lorcana.dataset import export_dataset, load_dataset, load_shard, shard_name
+from lib.lorcana.execute import apply_action_at_path, execute_action
+from lib.lorcana.game_api import GameSession
+from lib.lorcana.setup import init_game, shuffle_and_draw
+from lib.lorcana.state import LorcanaState
+
+STORAGE_SCHEMA = 1
+
+DECK1 = "data/decks/bs01.txt"
+DECK2 = "data/decks/rp01.txt"
+
+FORMATS = ('file', 'file+tt', 'replay', 'replay+ckpt', 'memory', 'columnar')
+
+
+# ========== Corpus ==========
+
+class Corpus:
+    """Seed states and the action paths of the games played from them."""
+
+    def __init__(self, seeds: int, games: int):
+        self.matchdir = Path("output") / init_game(DECK1, DECK2)
+        self.seeds = []
+        for i in range(seeds):
+            # 8 lowercase alphanumerics: recognized by find_seed_path
+            seed = f"fp{i:06d}"
+            shuffle_and_draw(self.matchdir, seed)
+            self.seeds.append(seed)
+
+        # Played in memory once; every format stores the same games
+        self.games = {}   # seed -> [action ids per game]
+        for i, seed in enumerate(self.seeds):
+            root = FileStore().load_state(self.matchdir / seed, LorcanaState)
+            session = GameSession(root)
+            self.games[seed] = []
+            for game in range(games):
+                random.seed(i * 1000 + game)
+                session.reset()
+                path = session.play_until_game_over()
+                self.games[seed].append(path.strip('/').split('/'))
+
+    @property
+    def game_count(self) -> int:
+        return sum(len(games) for games in self.games.values())
+
+    @property
+    def plies(self) -> int:
+        return sum(len(ids) for games in self.games.values() for ids in games)
+
+    def copy_to(self, root: Path) -> Path:
+        """Copy the matchup and bare seed states under root; returns the new matchdir."""
+        target = root / self.matchdir
+        shutil.copytree(self.matchdir, target, symlinks=True)
+        return target
+
+    def sample(self, n: int, rng: random.Random) -> list[tuple[str, int, list[str]]]:
+        """n states drawn uniformly from all plies: (seed, game index, action ids from the seed)."""
+        plies = [(seed, game, ids[:ply])
+                 for seed, games in self.games.items()
+                 for game, ids in enumerate(games)
+                 for ply in range(1, len(ids) + 1)]
+        return [rng.choice(plies) for _ in range(n)]
+
+
+# ========== Formats ==========
+# Each writes the corpus and returns a dict: write_seconds, footprint,
+# load(seed, game, ids) and scan() (timed by measure_format)
+
+def _file_format(corpus: Corpus, root: Path, transpositions: bool = False) -> dict:
+    matchdir = corpus.copy_to(root)
+    start = time.perf_counter()
+    for seed, games in corpus.games.items():
+        store = FileStore(max_cached=64)
+        table = TranspositionTable() if transpositions else None
+        session = GameSession.from_file(matchdir / seed, store=store, transpositions=table)
+        for ids in games:
+            session.reset()
+            for action_id in ids:
+                session.apply_action(action_id)
+    elapsed = time.perf_counter() - start
+
+    store = FileStore(max_cached=0)   # Always a cold load (DOT parse)
+    return {
+        'write_seconds': elapsed,
+        'matchdir': matchdir,
+        'footprint': _disk_footprint(matchdir),
+        'load': lambda seed, game, ids: store.load_state(matchdir.joinpath(seed, *ids), LorcanaState),
+        'scan': lambda: _scan_files(matchdir),
+    }
+
+
+def _replay_format(corpus: Corpus, root: Path, every: int | None = None) -> dict:
+    matchdir = corpus.copy_to(root)
+    longest = max(len(ids) for games in corpus.games.values() for ids in games)
+    checkpoints = set(range(every, longest, every)) if every else None
+    store = FileStore(max_cached=64)
+
+    start = time.perf_counter()
+    for seed, games in corpus.games.items():
+        for ids in games:
+            apply_action_at_path(matchdir.joinpath(seed, *ids), store=store, checkpoints=checkpoints)
+    elapsed = time.perf_counter() - start
+
+    reader = FileStore(max_cached=0)
+    return {
+        'write_seconds': elapsed,
+        'footprint': _disk_footprint(matchdir),
+        'load': lambda seed, game, ids: _materialize(reader, matchdir.joinpath(seed, *ids)),
+        'scan': lambda: _scan_replay(corpus, matchdir),
+    }
+
+
+def _memory_format(corpus: Corpus, root: Path) -> dict:
+    store = MemoryStore()
+    start = time.perf_counter()
+    for seed, games in corpus.games.items():
+        opening = FileStore().load_state(corpus.matchdir / seed, LorcanaState)
+        session = GameSession(opening, store=store, root_key=seed)
+        for ids in games:
+            session.reset()
+            for action_id in ids:
+                session.apply_action(action_id)
+    elapsed = time.perf_counter() - start
+
+    usage = store.memory_usage()
+    keys = sorted({'/'.join([seed, *ids[:ply]])
+                   for seed, games in corpus.games.items()
+                   for ids in games
+                   for ply in range(1, len(ids) + 1)})
+    return {
+        'write_seconds': elapsed,
+        'footprint': {'bytes': usage['bytes'], 'allocated': usage['bytes'], 'inodes': 0,
+                      'files': 0, 'dirs': 0, 'symlinks': 0, 'resident': True},
+        'load': lambda seed, game, ids: store.load_state('/'.join([seed, *ids]), LorcanaState),
+        'scan': lambda: [store.load_state(key, LorcanaState) for key in keys],
+    }
+
+
+def _columnar_format(corpus: Corpus, root: Path, source: Path) -> dict:
+    """Dataset shards exported from the file format's tree (source matchdir)."""
+    out = root / "dataset"
+    start = time.perf_counter()
+    export_dataset([source], out, workers=1)
+    elapsed = time.perf_counter() - start
+
+    # (seed, action path) -> row; shards number games by sorted outcome suffix
+    shards, rows = {}, {}
+    for seed, games in corpus.games.items():
+        shard = load_shard(out / shard_name(source / seed))
+        shards[seed] = shard
+        index = {suffix: g for g, suffix in enumerate(shard['meta']['games'])}
+        starts = {}
+        for row, (game, ply) in enumerate(zip(shard['game'], shard['ply'])):
+            starts.setdefault(int(game), row - int(ply))
+        for ids in games:
+            rows[(seed, '.'.join(ids))] = starts[index['.'.join(ids)]]
+
+    def load(seed, game, ids):
+        # Rows are decisions: the one that led to this state
+        full = corpus.games[seed][game]
+        row = rows[(seed, '.'.join(full))] + len(ids) - 1
+        shard = shards[seed]
+        offsets = shard['legal_offsets']
+        return (shard['features'][row].copy(),
+                shard['legal_keys'][offsets[row]:offsets[row + 1]].copy())
+
+    def scan():
+        data = load_dataset(out)
+        return sum(float(data[name].sum()) for name in ('features', 'legal_keys'))
+
+    return {
+        'write_seconds': elapsed,
+        'footprint': _disk_footprint(out),
+        'load': load,
+        'scan': scan,
+        'lossless': False,
+    }
+
+
+# ========== Measurement Helpers ==========
+
+def _full_tree(corpus: Corpus, root: Path) -> Path:
+    """Build an uncounted 'file' tree to export from; returns its matchdir."""
+    return _file_format(corpus, root / "source")['matchdir']
+
+
+def _disk_footprint(path: Path) -> dict:
+    """Apparent bytes, allocated bytes and inode counts under path (symlinks not followed)."""
+    files = dirs = symlinks = size = allocated = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                info = entry.stat(follow_symlinks=False)
+                allocated += info.st_blocks * 512
+                if entry.is_symlink():
+                    symlinks += 1
+                    size += info.st_size
+                elif entry.is_dir():
+                    dirs += 1
+                    stack.append(entry.path)
+                else:
+                    files += 1
+                    size += info.st_size
+    return {'bytes': size, 'allocated': allocated, 'inodes': files + dirs + symlinks,
+            'files': files, 'dirs': dirs, 'symlinks': symlinks, 'resident': False}
+
+
+def _scan_files(path: Path) -> int:
+    """Read every file under path (through symlinks), without parsing; returns bytes read."""
+    total = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    with open(entry.path, 'rb') as f:
+                        total += len(f.read())
+    return total
+
+
+def _scan_replay(corpus: Corpus, matchdir: Path) -> int:
+    """Visit every state of every game by replaying from its seed state."""
+    store = FileStore(max_cached=0)
+    visited = 0
+    for seed, games in corpus.games.items():
+        opening = store.load_state(matchdir / seed, LorcanaState)
+        for ids in games:
+            state = copy.deepcopy(opening)
+            for action_id in ids:
+                action = state.get_action(action_id)
+                execute_action(state, action.action_type, action.src, action.dst)
+                visited += 1
+    return visited
+
+
+def _materialize(store: FileStore, path: Path) -> LorcanaState:
+    """State at path: load the nearest stored ancestor and replay the rest (nothing written)."""
+    action_ids = []
+    ancestor = path
+    while not store.state_exists(ancestor):
+        action_ids.insert(0, ancestor.name)
+        ancestor = ancestor.parent
+    state = store.load_state(ancestor, LorcanaState)
+    for action_id in action_ids:
+        action = state.get_action(action_id)
+        execute_action(state, action.action_type, action.src, action.dst)
+    return state
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure_format(fmt: dict, corpus: Corpus, samples: list, project: int) -> dict:
+    """Turn a format's write result and readers into the reported numbers."""
+    latencies = []
+    for seed, game, ids in samples:
+        start = time.perf_counter()
+        fmt['load'](seed, game, ids)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    fmt['scan']()
+    scan_seconds = time.perf_counter() - start
+
+    footprint = fmt['footprint']
+    games, states = corpus.game_count, corpus.plies
+    return {
+        'lossless': fmt.get('lossless', True),
+        **footprint,
+        'bytes_per_game': footprint['bytes'] / games,
+        'bytes_per_state': footprint['bytes'] / states,
+        'inodes_per_game': footprint['inodes'] / games,
+        'write_seconds': fmt['write_seconds'],
+        'write_states_per_s': states / fmt['write_seconds'] if fmt['write_seconds'] else 0.0,
+        'write_games_per_s': games / fmt['write_seconds'] if fmt['write_seconds'] else 0.0,
+        'load_ms_median': statistics.median(latencies) if latencies else 0.0,
+        'load_ms_p99': _percentile(latencies, 0.99) if latencies else 0.0,
+        'scan_seconds': scan_seconds,
+        'scan_states_per_s': states / scan_seconds if scan_seconds else 0.0,
+        'projected_bytes': footprint['bytes'] / games * project,
+        'projected_allocated': footprint['allocated'] / games * project,
+        'projected_inodes': footprint['inodes'] / games * project,
+    }
+
+
+def format_report(document: dict) -> str:
+    """Text table of a storage document."""
+    corpus = document['corpus']
+    project = document['settings']['project']
+    lines = [
+        f"corpus: {corpus['games']} games, {corpus['states']} states "
+        f"({corpus['states'] / corpus['games']:.0f} plies/game)",
+        f"{'format':<12} {'KB/game':>9} {'KB/state':>9} {'alloc KB/game':>13} {'inodes/game':>11} "
+        f"{'write st/s':>10} {'load ms':>8} {'p99 ms':>8} {'scan st/s':>10} "
+        f"{f'{project:,} games':>16}",
+    ]
+    for name, row in document['formats'].items():
+        size = _human(row['projected_allocated'])
+        note = " (RAM)" if row['resident'] else "" if row['lossless'] else " (lossy)"
+        lines.append(
+            f"{name:<12} {row['bytes_per_game'] / 1024:>9.1f} {row['bytes_per_state'] / 1024:>9.2f} "
+            f"{row['allocated'] / corpus['games'] / 1024:>13.1f} {row['inodes_per_game']:>11.0f} "
+            f"{row['write_states_per_s']:>10.0f} {row['load_ms_median']:>8.2f} {row['load_ms_p99']:>8.2f} "
+            f"{row['scan_states_per_s']:>10.0f} {size:>16}{note}")
+    lines.append(f"(projection: allocated bytes at the measured per-game rate)")
+    return "\n".join(lines)
+
+
+def _human(n: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if n < 1024 or unit == 'TB':
+            return f"{n:,.1f} {unit}"
+        n /= 1024
+
+
+# ========== CLI ==========
+
+def main():
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('--'))
+    if positional:
+        print(__doc__)
+        sys.exit(1)
+
+    seeds = int(options.get('seeds') or 4)
+    games = int(options.get('games') or 5)
+    sample_count = int(options.get('samples') or 200)
+    every = int(options.get('checkpoint') or 10)
+    project = int(options.get('project') or 100_000)
+    selected = [f for f in (options.get('formats') or '').split(',') if f] or list(FORMATS)
+    unknown = [f for f in selected if f not in FORMATS]
+    if unknown:
+        print(f"Unknown format(s): {', '.join(unknown)} (choose from {', '.join(FORMATS)})", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    with workspace(options.get('data') or None) as scratch:
+        corpus = Corpus(seeds, games)
+        print(f"[storage] corpus: {corpus.game_count} games, {corpus.plies} states", file=sys.stderr)
+        samples = corpus.sample(sample_count, random.Random(0))
+
+        builders = {
+            'file': lambda root: _file_format(corpus, root),
+            'file+tt': lambda root: _file_format(corpus, root, transpositions=True),
+            'replay': lambda root: _replay_format(corpus, root),
+            'replay+ckpt': lambda root: _replay_format(corpus, root, every=every),
+            'memory': lambda root: _memory_format(corpus, root),
+            'columnar': lambda root: _columnar_format(corpus, root, full_tree or _full_tree(corpus, root)),
+        }
+        full_tree = None   # A 'file' tree, the columnar export's source
+        for name in FORMATS:
+            if name not in selected:
+                continue
+            # Directory names must not look like seeds to find_seed_path
+            root = scratch / f"fmt-{name.replace('+', '-')}"
+            root.mkdir()
+            fmt = builders[name](root)
+            if name == 'file':
+                full_tree = fmt['matchdir']
+            results[name] = measure_format(fmt, corpus, samples, project)
+            row = results[name]
+            print(f"[storage] {name}: {row['bytes_per_game'] / 1024:,.1f} KB/game, "
+                  f"{row['inodes_per_game']:.0f} inodes/game, write {row['write_seconds']:.1f}s, "
+                  f"scan {row['scan_seconds']:.2f}s", file=sys.stderr)
+
+    document = {
+        'schema_version': STORAGE_SCHEMA,
+        'environment': environment(),
+        'settings': {'seeds': seeds, 'games': games, 'samples': sample_count,
+                     'checkpoint': every, 'project': project, 'decks': [DECK1, DECK2]},
+        'corpus': {'games': corpus.game_count, 'states': corpus.plies},
+        'formats': results,
+    }
+    print(format_report(document))
+    out = options.get('out')
+    if out:
+        write_results(out, document)
+        print(f"[storage] wrote {out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Board memory: k-NN over recorded decisions (see lib/lorcana/board_memory.py).
+
+Usage:
+    board-memory.py add <memory_dir> <root_path>...
+    board-memory.py build <memory_dir> [--lists=N]
+    board-memory.py query <memory_dir> <state_path> [--k=50] [--exact]
+Example:
+    board-memory.py add output/memory output/b013/b123456.0123456.ab
+    board-memory.py build output/memory
+    board-memory.py query output/memory output/b013/b123456.0123456.ab/0/3
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.core.file_store import FileStore
+from lib.lorcana.board_memory import BoardMemory
+from lib.lorcana.state import LorcanaState
+
+
+def parse_options(args: list[str]) -> tuple[list[str], dict]:
+    """Split --key=value options from positional args."""
+    positional, options = [], {}
+    for arg in args:
+        if arg.startswith('--'):
+            key, _, value = arg[2:].partition('=')
+            options[key] = value
+        else:
+            positional.append(arg)
+    return positional, options
+
+
+def cmd_add(memory: BoardMemory, roots: list[str]) -> None:
+    store = FileStore(max_cached=0)
+    for root in roots:
+        start = time.time()
+        added = memory.record_finished_games(root, store)
+        print(f"[board-memory] {root}: +{added} rows in {time.time() - start:.1f}s "
+              f"({len(memory)} total)", file=sys.stderr)
+
+
+def cmd_build(memory: BoardMemory, options: dict) -> None:
+    start = time.time()
+    n_lists = int(options['lists']) if options.get('lists') else None
+    memory.index.build_partitions(n_lists=n_lists)
+    print(f"[board-memory] partitioned {len(memory)} rows in {time.time() - start:.1f}s", file=sys.stderr)
+
+
+def cmd_query(memory: BoardMemory, state_path: str, options: dict) -> None:
+    state = FileStore().load_state(state_path, LorcanaState)
+    k = int(options.get('k') or 50)
+    n_probe = None if 'exact' in options else 8
+
+    start = time.perf_counter()
+    scores = memory.score_actions(state, k=k, n_probe=n_probe)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for action, score, support in scores:
+        rate = f"{score:.2f}" if score is not None else "  - "
+        print(f"{action.id:>3}  {rate}  n={support:<3} {action.description}")
+    print(f"[board-memory] k={k} over {len(memory)} rows in {elapsed_ms:.1f}ms", file=sys.stderr)
+
+
+def main():
+    positional, options = parse_options(sys.argv[1:])
+    if len(positional) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command, memory_dir = positional[0], positional[1]
+    memory = BoardMemory(memory_dir)
+
+    if command == 'add' and len(positional) > 2:
+        cmd_add(memory, positional[2:])
+    elif command == 'build':
+        cmd_build(memory, options)
+    elif command == 'query' and len(positional) == 3:
+        cmd_query(memory, positional[2], options)
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
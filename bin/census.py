@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Census of a stored game tree: nodes per depth/turn, branching factor,
+terminal rate and storage (see lib/core/census.py).
+
+Usage:
+    census.py <root_path> [--workers=N] [--sample=WALKS] [--seed=N] [--json]
+Example:
+    census.py output/b013/b123456.0123456.ab
+    census.py output/b013/b123456.0123456.ab --sample=2000
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.core.census import census_tree, sample_census
+
+
+def main():
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('--'))
+    if len(positional) != 1:
+        print(__doc__)
+        sys.exit(1)
+
+    root = positional[0]
+    start = time.time()
+    if options.get('sample'):
+        seed = int(options['seed']) if options.get('seed') else None
+        census = sample_census(root, walks=int(options['sample']), seed=seed)
+    else:
+        workers = int(options['workers']) if options.get('workers') else None
+        census = census_tree(root, workers=workers)
+    elapsed = time.time() - start
+
+    if 'json' in options:
+        print(json.dumps(census.to_dict(), indent=2))
+    else:
+        print(census.format())
+    print(f"[census] {root} in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
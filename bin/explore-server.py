@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Dotcana Exploration Server
+
+Asyncio service for many concurrent explorers (agents, notebooks, UIs):
+batches requests per parent state, computes each path once, runs playouts
+in a process pool. Speaks JSON lines; run from the repo root.
+
+Usage:
+    explore-server.py [--host 127.0.0.1] [--port 5152]
+    explore-server.py --socket /tmp/dotcana-explore.sock
+
+Options:
+    --max-queue N         Parent states queued before clients wait (default: 256)
+    --playout-workers N   Playout processes (default: CPU count)
+    --max-cached N        Hot states kept in memory (default: 4096)
+
+Requests (one JSON object per line, "id" is echoed back):
+    {"id": 1, "op": "expand", "path": "output/b013/b123456.0123456.ab"}
+    {"id": 2, "op": "apply", "path": "output/b013/b123456.0123456.ab", "action_id": "0"}
+    {"id": 3, "op": "playout", "path": "output/b013/b123456.0123456.ab", "games": 100, "seed": 1}
+    {"id": 4, "op": "metrics"}
+"""
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.lorcana.exploration import ExplorationService, serve
+
+
+async def run(args) -> None:
+    async with ExplorationService(max_cached=args.max_cached, max_queue=args.max_queue,
+                                  playout_workers=args.playout_workers) as service:
+        where = f"unix://{args.socket}" if args.socket else f"{args.host}:{args.port}"
+        print(f"[explore-server] listening on {where}", file=sys.stderr)
+        await serve(service, socket_path=args.socket, host=args.host, port=args.port)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='explore-server.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5152)
+    parser.add_argument('--socket', help='Listen on a Unix socket instead of TCP host/port')
+    parser.add_argument('--max-queue', type=int, default=256)
+    parser.add_argument('--playout-workers', type=int, default=None)
+    parser.add_argument('--max-cached', type=int, default=4096)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
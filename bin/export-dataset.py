@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Export finished games as a columnar training dataset (one shard per seed).
+
+Shards are .npy directories loadable with memory mapping. Rerunning skips
+seeds whose shard is up to date and re-exports seeds with games finished
+since their shard was written (see lib/lorcana/dataset.py).
+
+Usage:
+    export-dataset.py <out_dir> <path>... [--workers=N]
+Example:
+    export-dataset.py dataset output/b013
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.lorcana.dataset import export_dataset
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--workers=')]
+    workers = next((int(arg.split('=', 1)[1]) for arg in sys.argv[1:] if arg.startswith('--workers=')), None)
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    out_dir, paths = args[0], args[1:]
+    start = time.time()
+    result = export_dataset(paths, out_dir, workers=workers)
+    print(f"[export-dataset] {result['seeds']} seeds: {result['exported']} exported "
+          f"({result['updated']} with new games), {result['skipped']} up to date, {result['rows']} rows in {time.time() - start:.1f}s "
+          f"-> {out_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
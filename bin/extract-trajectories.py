@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Extract card trajectories for every finished game under a state.
+
+Replays the game tree once (shared prefixes replayed once) and writes
+columnar per-card timelines to a .npz (see lib/lorcana/trajectory.py).
+
+Usage:
+    extract-trajectories.py <root_path> <out.npz>
+Example:
+    extract-trajectories.py output/b013/b123456.0123456.ab trajectories.npz
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.lorcana.trajectory import extract_trajectories
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    root_path, out_path = sys.argv[1], sys.argv[2]
+
+    start = time.time()
+    trajectories = extract_trajectories(root_path)
+    trajectories.save(out_path)
+    elapsed = time.time() - start
+
+    steps = sum(len(trajectories.game_nodes(g)) for g in range(len(trajectories.games)))
+    print(f"[extract-trajectories] {len(trajectories.games)} games, {steps} steps, "
+          f"{len(trajectories.node_parent)} unique states, {len(trajectories.row_card)} card rows "
+          f"in {elapsed:.1f}s -> {out_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,13 @@
 Demo script showing the in-memory game API.
 
 Plays a random game using MemoryStore - much faster than file I/O.
+
+--profile prints call counts and timers for the hot paths;
+--profile=trace.json also writes a Chrome trace.
+--memory traces allocations (tracemalloc) and reports them by engine
+module, plus the store's resident size per state.
+--decided stops each game once the lore race decides it and records the
+forced winner (see lib/lorcana/lore_race.py).
 """
 import time
 import sys
@@ -13,6 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from lib.lorcana.game_api import GameSession
 from lib.core.file_store import FileStore
+from lib.core.instrument import parse_profile_flag, report
+from lib.core.memsize import allocation_report, format_usage, start_tracing
 
 
 def play_game(session):
@@ -23,25 +32,37 @@ def play_game(session):
     t3 = time.time()
     print(f"Game completed in {(t3-t2)*1000:.1f}ms")
     print(f"Final path: {final_path}")
-    print(f"Winner: {session.get_winner()}")
+    print(f"Winner: {session.get_winner()}" + (" (decided by the lore race)" if session.is_decided() else ""))
     print(f"Game over: {session.is_game_over()}")
     print(f"Actions taken: {final_path.count('/') if final_path else 0}")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: play-random.py <initial_state_path> [count]")
+    argv, profile = parse_profile_flag(sys.argv)
+    memory = '--memory' in argv
+    decided = '--decided' in argv
+    argv = [arg for arg in argv if arg not in ('--memory', '--decided')]
+    if len(argv) < 2:
+        print("Usage: play-random.py <initial_state_path> [count] [--profile[=trace.json]] [--memory] [--decided]")
         print("Example: play-random.py output/b013/b123456.0123456.ab 10")
         sys.exit(1)
 
-    initial_path = sys.argv[1]
-    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    initial_path = argv[1]
+    count = int(argv[2]) if len(argv) > 2 else 1
+    if memory:
+        start_tracing()
 
-    session = GameSession.from_file(initial_path, FileStore())
+    session = GameSession.from_file(initial_path, FileStore(), stop_when_decided=decided)
     for x in range(count):
         session.reset()  # Reset to initial state before each game
         play_game(session)
 
+    report(profile)
+    if memory:
+        print(allocation_report(), file=sys.stderr)
+        print("\nstore:", file=sys.stderr)
+        print(format_usage(session.store.memory_usage()), file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
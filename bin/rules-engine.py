@@ -4,25 +4,40 @@ Dotcana Rules Engine
 
 Commands:
     init <deck1.txt> <deck2.txt>   - Create matchup from decklists
-    shuffle <matchdir> <seed>      - Shuffle and deal starting hands
+    shuffle <matchdir> <seed> [--canonical] - Shuffle and deal starting hands
+    shuffle-many <matchdir> <seeds-file|count> [--workers=N] [--rng-seed=N] [--canonical]
+                                   - Many seeds in one run (seeds file: one per line;
+                                     count: that many random 8-char seeds)
+    seeds <matchdir> [--limit=N] [--order=index|probability] [--sample=N [--uniform]]
+          [--suffix=aa] [--weights] [--count]
+                                   - Canonical hand-spec seeds, one per distinct pair of
+                                     opening hands (feed to shuffle-many)
     show <game.dot>                - Show available actions
-    play <path> [--store=file|memory] - Navigate and show state
+    play <path> [--store=file|memory] [--checkpoints=10,20] - Navigate and show state
 
 Options:
     --store=file|memory           Storage backend (default: file)
+    --checkpoints=D1,D2,...       Also save states at these depths when replaying
+    --canonical                   Collapse actions on identical card copies (the rules
+                                  server also links transposed states; one-shot play does not)
+    --profile[=trace.json]        Print call counts/timers (and write a Chrome trace)
 """
 import sys
 import argparse
+import random
+import string
 from pathlib import Path
 
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from lib.core.graph import get_node_attr, edges_by_label
+from lib.core.graph import get_node_attr
+from lib.core.instrument import parse_profile_flag, report
 from lib.core.file_store import FileStore
 from lib.core.memory_store import MemoryStore
 from lib.core.navigation import read_actions_file, format_actions
-from lib.lorcana.setup import init_game, shuffle_and_draw
+from lib.lorcana.openings import count_openings, enumerate_openings, matchup_decklists, sample_openings
+from lib.lorcana.setup import init_game, shuffle_and_draw, shuffle_many
 from lib.lorcana.state import LorcanaState
 from lib.lorcana.execute import apply_action_at_path
 
@@ -36,9 +51,9 @@ def cmd_init(deck1: str, deck2: str) -> None:
     print(f"[rules-engine] init: output/{matchup_hash}/game.dot", file=sys.stderr)
 
 
-def cmd_shuffle(matchdir: str, seed: str) -> None:
+def cmd_shuffle(matchdir: str, seed: str, canonical: bool = False) -> None:
     """Shuffle decks and draw starting hands."""
-    seed = shuffle_and_draw(matchdir, seed)
+    seed = shuffle_and_draw(matchdir, seed, canonical=canonical)
     output_path = Path(matchdir) / seed
 
     print(seed)
@@ -53,6 +68,52 @@ def cmd_shuffle(matchdir: str, seed: str) -> None:
             print(f"  [{a['id']}] {a['description']}", file=sys.stderr)
 
 
+def cmd_shuffle_many(matchdir: str, source: str, workers: int | None = None,
+                     rng_seed: int | None = None, canonical: bool = False) -> None:
+    """Create many seed roots; prints each created seed on stdout."""
+    if source.isdigit() and not Path(source).exists():
+        # Random simple seeds (same alphabet as generate-games)
+        rng = random.Random(rng_seed)
+        alphabet = string.ascii_lowercase + string.digits
+        seeds = [''.join(rng.choices(alphabet, k=8)) for _ in range(int(source))]
+    else:
+        lines = Path(source).read_text().splitlines()
+        # First field per line (seeds output may carry a weight column)
+        seeds = [line.split()[0] for line in lines if line.strip() and not line.lstrip().startswith('#')]
+
+    result = shuffle_many(matchdir, seeds, workers=workers, canonical=canonical)
+
+    for seed in result['created']:
+        print(seed)
+    print(f"[rules-engine] shuffle-many: {len(result['created'])} created, "
+          f"{len(result['skipped'])} already existed -> {matchdir}", file=sys.stderr)
+
+
+def cmd_seeds(matchdir: str, limit: int | None = None, order: str = 'index', sample: int | None = None,
+              uniform: bool = False, rng_seed: int | None = None, suffix: str = 'aa',
+              weights: bool = False, count: bool = False) -> None:
+    """Print canonical seeds for distinct opening-hand pairs."""
+    deck1, deck2 = matchup_decklists(matchdir)
+
+    if count:
+        counts = count_openings(deck1, deck2)
+        print(f"p1 hands: {counts['p1_hands']:,}  p2 hands: {counts['p2_hands']:,}  pairs: {counts['pairs']:,}")
+        return
+
+    if sample:
+        openings = sample_openings(deck1, deck2, sample, suffix=suffix, weighted=not uniform,
+                                   rng=random.Random(rng_seed))
+    else:
+        openings = enumerate_openings(deck1, deck2, suffix=suffix, by_probability=order == 'probability',
+                                      limit=limit)
+
+    printed = 0
+    for opening in openings:
+        print(f"{opening.seed}\t{opening.probability:.6e}" if weights else opening.seed)
+        printed += 1
+    print(f"[rules-engine] seeds: {printed} openings", file=sys.stderr)
+
+
 def cmd_show(game_dot: str) -> None:
     """Show available actions."""
     path = Path(game_dot).parent
@@ -69,20 +130,21 @@ def cmd_show(game_dot: str) -> None:
         print(f"  [{a['id']}] {a['description']}")
 
 
-def cmd_play(path: str, store_type: str = 'file') -> None:
+def cmd_play(path: str, store_type: str = 'file', checkpoints: set[int] | None = None) -> None:
     """Navigate to state, apply action if needed, show available actions."""
     path = Path(path)
 
+    # Ensure state exists (replays from the nearest stored ancestor if needed)
+    file_store = FileStore()
+    plies = apply_action_at_path(path, store=file_store, checkpoints=checkpoints)
+    if plies:
+        print(f"[rules-engine] play: replayed {plies} plies", file=sys.stderr)
+
     # Create appropriate store
     if store_type == 'file':
-        store = FileStore()
-        # Ensure state exists (recursively applies actions if needed)
-        apply_action_at_path(path)
+        store = file_store
     else:
         # Memory store - load from file first
-        file_store = FileStore()
-        if not file_store.state_exists(path):
-            apply_action_at_path(path)
         state = file_store.load_state(path, LorcanaState)
         store = MemoryStore()
         store.save_state(state, str(path), format_actions_fn=format_actions)
@@ -98,8 +160,7 @@ def cmd_play(path: str, store_type: str = 'file') -> None:
     # Show game state summary
 
     # Get current turn
-    turn_edges = edges_by_label(state.graph, "CURRENT_TURN")
-    current_player = turn_edges[0][1] if turn_edges else "?"
+    current_player = state.current_player or "?"
 
     # Get player stats
     p1_lore = get_node_attr(state.graph, 'p1', 'lore', '0')
@@ -125,6 +186,14 @@ def cmd_play(path: str, store_type: str = 'file') -> None:
 
 
 def main():
+    sys.argv, profile = parse_profile_flag(sys.argv)
+    try:
+        run_command()
+    finally:
+        report(profile)
+
+
+def run_command():
     if len(sys.argv) < 2:
         print(__doc__)
         sys.exit(1)
@@ -138,10 +207,37 @@ def main():
         cmd_init(sys.argv[2], sys.argv[3])
 
     elif cmd == "shuffle":
-        if len(sys.argv) != 4:
-            print("Usage: rules-engine.py shuffle <matchdir> <seed>")
-            sys.exit(1)
-        cmd_shuffle(sys.argv[2], sys.argv[3])
+        parser = argparse.ArgumentParser(prog='rules-engine.py shuffle')
+        parser.add_argument('matchdir')
+        parser.add_argument('seed')
+        parser.add_argument('--canonical', action='store_true')
+        args = parser.parse_args(sys.argv[2:])
+        cmd_shuffle(args.matchdir, args.seed, args.canonical)
+
+    elif cmd == "shuffle-many":
+        parser = argparse.ArgumentParser(prog='rules-engine.py shuffle-many')
+        parser.add_argument('matchdir')
+        parser.add_argument('source', help='File with one seed per line, or a number of random seeds')
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+        parser.add_argument('--rng-seed', type=int, default=None, help='Make generated seeds reproducible')
+        parser.add_argument('--canonical', action='store_true')
+        args = parser.parse_args(sys.argv[2:])
+        cmd_shuffle_many(args.matchdir, args.source, args.workers, args.rng_seed, args.canonical)
+
+    elif cmd == "seeds":
+        parser = argparse.ArgumentParser(prog='rules-engine.py seeds')
+        parser.add_argument('matchdir')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after N seeds')
+        parser.add_argument('--order', choices=['index', 'probability'], default='index')
+        parser.add_argument('--sample', type=int, default=None, help='N distinct random openings instead')
+        parser.add_argument('--uniform', action='store_true', help='Sample uniformly, not by probability')
+        parser.add_argument('--rng-seed', type=int, default=None, help='Make sampling reproducible')
+        parser.add_argument('--suffix', default='aa', help='Seed suffix (2 lowercase letters)')
+        parser.add_argument('--weights', action='store_true', help='Print each opening\'s probability')
+        parser.add_argument('--count', action='store_true', help='Only count distinct hands and pairs')
+        args = parser.parse_args(sys.argv[2:])
+        cmd_seeds(args.matchdir, args.limit, args.order, args.sample, args.uniform, args.rng_seed,
+                  args.suffix, args.weights, args.count)
 
     elif cmd == "show":
         if len(sys.argv) != 3:
@@ -154,8 +250,11 @@ def main():
         parser = argparse.ArgumentParser(prog='rules-engine.py play')
         parser.add_argument('path')
         parser.add_argument('--store', choices=['file', 'memory'], default='file')
+        parser.add_argument('--checkpoints', default='',
+                            help='Comma-separated depths to also save when replaying (e.g. 10,20)')
         args = parser.parse_args(sys.argv[2:])
-        cmd_play(args.path, args.store)
+        checkpoints = {int(d) for d in args.checkpoints.split(',') if d}
+        cmd_play(args.path, args.store, checkpoints)
 
     else:
         print(f"Unknown command: {cmd}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Dotcana Rules Server
+
+Long-running rules engine: keeps the card DB and hot states in memory and
+serves rules-engine operations over localhost HTTP or a Unix socket.
+Run from the repo root (like rules-engine.py).
+
+Usage:
+    rules-server.py [--host 127.0.0.1] [--port 5151]
+    rules-server.py --socket /tmp/dotcana.sock
+
+Endpoints (JSON; GET query args or a JSON body):
+    GET  /health
+    GET  /show?path=<state dir>           - actions.txt of a state
+    GET  /actions?path=<state dir>        - legal actions of a state
+    POST /play     {path, checkpoints}    - navigate (replays if needed)
+    POST /apply    {path, action_id}      - apply one action from path
+    POST /playout  {path, games, seed, persist, stop_when_decided} - batch random playouts
+    GET  /metrics                         - request latency per endpoint
+
+show and play accept format=text for rules-engine.py style output.
+
+Example:
+    curl -s 'http://127.0.0.1:5151/play?path=output/b013/b123456.0123456.ab/0/1&format=text'
+    curl -s --unix-socket /tmp/dotcana.sock 'http://x/actions?path=output/b013/b123456.0123456.ab'
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from flask import Flask, g, jsonify, request
+from lib.core.latency import LatencyStats
+from lib.lorcana.service import RulesService
+
+
+def create_app(service: RulesService) -> Flask:
+    """Flask app exposing a RulesService."""
+    app = Flask("dotcana")
+    latency = {}  # endpoint -> LatencyStats
+
+    def params() -> dict:
+        """Request parameters from the JSON body, else the query string."""
+        body = request.get_json(silent=True)
+        return body if isinstance(body, dict) else request.args.to_dict()
+
+    def required(args: dict, name: str) -> str:
+        if name not in args:
+            raise ValueError(f"Missing parameter: {name}")
+        return args[name]
+
+    def text_response(lines: list[str]):
+        return "\n".join(lines) + "\n", 200, {'Content-Type': 'text/plain; charset=utf-8'}
+
+    @app.before_request
+    def start_timer():
+        g.start = time.perf_counter()
+
+    @app.after_request
+    def record_latency(response):
+        elapsed = time.perf_counter() - g.start
+        name = request.endpoint or 'unknown'
+        latency.setdefault(name, LatencyStats()).record(elapsed)
+        response.headers['Server-Timing'] = f"app;dur={elapsed * 1000:.3f}"
+        return response
+
+    @app.errorhandler(FileNotFoundError)
+    def not_found(error):
+        return jsonify(error=str(error)), 404
+
+    @app.errorhandler(ValueError)
+    def bad_request(error):
+        return jsonify(error=str(error)), 400
+
+    @app.get('/health')
+    def health():
+        return jsonify(status='ok')
+
+    @app.get('/show')
+    def show():
+        args = params()
+        actions = service.show(required(args, 'path'))
+        if args.get('format') == 'text':
+            if not actions:
+                return text_response(["No actions available."])
+            return text_response(["Available actions:"] + [f"  [{a['id']}] {a['description']}" for a in actions])
+        return jsonify(actions=actions)
+
+    @app.get('/actions')
+    def actions():
+        return jsonify(actions=service.actions(required(params(), 'path')))
+
+    @app.route('/play', methods=['GET', 'POST'])
+    def play():
+        args = params()
+        checkpoints = args.get('checkpoints') or []
+        if isinstance(checkpoints, str):
+            checkpoints = checkpoints.split(',')
+        result = service.play(required(args, 'path'), {int(d) for d in checkpoints if d != ''})
+        return _play_response(args, result)
+
+    @app.route('/apply', methods=['GET', 'POST'])
+    def apply():
+        args = params()
+        result = service.apply(required(args, 'path'), required(args, 'action_id'))
+        return _play_response(args, result)
+
+    @app.route('/playout', methods=['GET', 'POST'])
+    def playout():
+        args = params()
+        seed = args.get('seed')
+        result = service.playout(
+            required(args, 'path'),
+            games=int(args.get('games', 1)),
+            seed=int(seed) if seed is not None else None,
+            prefer_non_end=str(args.get('prefer_non_end', True)).lower() not in ('0', 'false'),
+            max_actions=int(args.get('max_actions', 1000)),
+            persist=str(args.get('persist', False)).lower() in ('1', 'true'),
+            stop_when_decided=str(args.get('stop_when_decided', False)).lower() in ('1', 'true'),
+        )
+        return jsonify(result)
+
+    @app.get('/metrics')
+    def metrics():
+        return jsonify({name: stats.summary() for name, stats in sorted(latency.items())})
+
+    def _play_response(args: dict, result: dict):
+        if args.get('format') != 'text':
+            return jsonify(result)
+
+        # Same layout as `rules-engine.py play`
+        lines = [""]
+        players = result['players']
+        for player in ('p1', 'p2'):
+            marker = "►" if result['current_player'] == player else " "
+            p = players[player]
+            lines.append(f"{marker} {player.upper()}: {p['lore']} lore, {p['ink_available']}/{p['ink_total']} ink")
+
+        if not result['actions']:
+            lines.append("\nNo actions available.")
+        else:
+            lines.append("\nAvailable actions:")
+            lines.extend(f"  [{a['id']}] {a['description']}" for a in result['actions'])
+        return text_response(lines)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='rules-server.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5151)
+    parser.add_argument('--socket', help='Listen on a Unix socket instead of HTTP host/port')
+    parser.add_argument('--max-cached', type=int, default=4096, help='Hot states kept in memory')
+    args = parser.parse_args()
+
+    app = create_app(RulesService(max_cached=args.max_cached))
+
+    if args.socket:
+        print(f"[rules-server] listening on unix://{args.socket}", file=sys.stderr)
+        app.run(host=f"unix://{args.socket}")
+    else:
+        print(f"[rules-server] listening on http://{args.host}:{args.port}", file=sys.stderr)
+        app.run(host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Solve a stored position: exact winner and best line (see lib/lorcana/solver.py).
+
+Searches to game end or --depth plies with alpha-beta, a transposition
+table and iterative deepening. The state is materialized first if only an
+ancestor is stored.
+
+Usage:
+    solve.py <state_path> [--depth=40] [--time=SECONDS] [--nodes=N] [--workers=N] [--bounds] [--json]
+Example:
+    solve.py output/b013/b123456.0123456.ab/0/1/0/2 --depth=12
+    solve.py output/b013/b123456.0123456.ab/0/1/0/2 --workers=8 --time=300
+
+--workers splits the root actions across processes.
+--bounds stops at positions the lore race already decides (lib/lorcana/lore_race.py):
+much smaller searches, exact winner, but no ply count for such wins.
+"""
+import copy
+import json
+import sys
+from pathlib import Path
+
+# Add lib to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.core.file_store import FileStore
+from lib.lorcana.execute import apply_action_at_path, execute_action
+from lib.lorcana.lore_race import race_bounds
+from lib.lorcana.solver import Solver, solve_parallel
+from lib.lorcana.state import LorcanaState
+
+
+def main():
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('--'))
+    if len(positional) != 1:
+        print(__doc__)
+        sys.exit(1)
+
+    path = Path(positional[0])
+    store = FileStore()
+    apply_action_at_path(path, store=store)
+    state = store.load_state(path, LorcanaState)
+
+    depth = int(options.get('depth') or 40)
+    time_limit = float(options['time']) if options.get('time') else None
+    node_limit = int(options['nodes']) if options.get('nodes') else None
+    lore_bounds = 'bounds' in options
+    if options.get('workers'):
+        result = solve_parallel(state, workers=int(options['workers']), max_depth=depth,
+                                time_limit=time_limit, node_limit=node_limit, lore_bounds=lore_bounds)
+    else:
+        result = Solver(depth, time_limit, node_limit, lore_bounds=lore_bounds).solve(state)
+
+    race = race_bounds(state)
+    if 'json' in options:
+        print(json.dumps({'path': str(path), **result.to_dict(),
+                          'race': {'p1': race.p1._asdict(), 'p2': race.p2._asdict(), 'winner': race.winner}},
+                         indent=2))
+    else:
+        if result.winner and result.plies is None:
+            after = f" after {len(result.line)} plies" if result.line else ""
+            print(f"{result.winner} wins (decided by the lore race{after})")
+        elif result.winner:
+            print(f"{result.winner} wins in {result.plies} plies")
+        else:
+            print(f"undecided within {result.depth} plies")
+        for player in ('p1', 'p2'):
+            bounds = getattr(race, player)
+            print(f"lore race {player}: {bounds.lore} lore, 20 in {_turns(bounds.min_turns)}"
+                  f"..{_turns(bounds.max_turns)} own turns")
+        print("line:")
+        for action_id, description in _describe(state, result.line):
+            print(f"  [{action_id}] {description}")
+        if result.line:
+            print(f"end: {path / '/'.join(result.line)}")
+
+    budget = "" if result.complete else " (budget exhausted)"
+    print(f"[solve] depth {result.depth}, {result.nodes:,} nodes, {result.tt_hits:,} table hits, "
+          f"{result.seconds:.1f}s{budget}", file=sys.stderr)
+
+
+def _turns(turns: int | None) -> str:
+    return '-' if turns is None else str(turns)
+
+
+def _describe(state: LorcanaState, line: list[str]) -> list[tuple[str, str]]:
+    """(action ID, description) along a line from state."""
+    state = copy.deepcopy(state)
+    described = []
+    for action_id in line:
+        action = state.get_action(action_id)
+        described.append((action_id, action.description))
+        execute_action(state, action.action_type, action.src, action.dst)
+    return described
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Crash- and race-safe filesystem primitives.
+
+Parallel workers share the output tree, so files are never written in
+place: content goes to a hidden temp file in the same directory and is
+renamed over the target (os.replace is atomic on POSIX). Readers need no
+locks - they see the old file or the new one, never a truncated one.
+
+Directory claims make sure only one worker computes a given state: a
+claim is a ".claim" file created with O_EXCL, removed when done. Claims
+left behind by crashed workers go stale and are broken.
+"""
+import os
+import socket
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+CLAIM_FILE = ".claim"
+
+# Claims older than this are assumed to belong to a crashed worker
+CLAIM_STALE_SECONDS = 300.0
+
+# Process umask (read once: os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path: Path | str, mode: str = 'w'):
+    """
+    Open a temp file that replaces path on successful exit.
+
+    Usage:
+        with atomic_write(path) as f:
+            f.write(...)
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        # mkstemp creates 0600; give the file the mode open() would have
+        # (or the replaced file's), so shared trees stay readable
+        try:
+            file_mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            file_mode = 0o666 & ~_UMASK
+        with os.fdopen(fd, mode) as f:
+            os.fchmod(f.fileno(), file_mode)
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def atomic_symlink(target: Path | str, link: Path | str) -> None:
+    """Create or replace a symlink without a window where link is missing."""
+    link = Path(link)
+    # Short temp name: link names (outcome.txt.<action path>) can be near NAME_MAX
+    tmp = link.parent / f".symlink.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    os.symlink(target, tmp)
+    try:
+        os.replace(tmp, link)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@contextmanager
+def claim_directory(path: Path | str, stale_after: float = CLAIM_STALE_SECONDS):
+    """
+    Try to claim a directory for exclusive computation.
+
+    Yields True if this process holds the claim (released on exit), False
+    if another live worker holds it. Stale claims are broken. Directories
+    created for the claim are removed again if nothing was saved in them.
+    """
+    path = Path(path)
+    created = []
+    missing = path
+    while not missing.exists():
+        created.append(missing)
+        missing = missing.parent
+    path.mkdir(parents=True, exist_ok=True)
+    claim = path / CLAIM_FILE
+
+    owned = _create_claim(claim)
+    if not owned and _claim_is_stale(claim, stale_after):
+        _break_claim(claim)
+        owned = _create_claim(claim)
+
+    try:
+        yield owned
+    finally:
+        if owned:
+            try:
+                os.unlink(claim)
+            except FileNotFoundError:
+                pass
+        for directory in created:
+            try:
+                directory.rmdir()
+            except OSError:
+                break
+
+
+def is_claimed(path: Path | str, stale_after: float = CLAIM_STALE_SECONDS) -> bool:
+    """True if a live (non-stale) claim exists on the directory."""
+    claim = Path(path) / CLAIM_FILE
+    return claim.exists() and not _claim_is_stale(claim, stale_after)
+
+
+# ========== Internal Helpers ==========
+
+def _create_claim(claim: Path) -> bool:
+    try:
+        fd = os.open(claim, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, 'w') as f:
+        f.write(f"{socket.gethostname()} {os.getpid()} {time.time():.0f}\n")
+    return True
+
+
+def _claim_is_stale(claim: Path, stale_after: float) -> bool:
+    """Stale if older than stale_after, or held by a dead process on this host."""
+    try:
+        age = time.time() - claim.stat().st_mtime
+        host, pid, _ = claim.read_text().split()
+    except (FileNotFoundError, ValueError):
+        # Vanished (released) or still being written: not stale
+        return False
+
+    if age > stale_after:
+        return True
+    if host == socket.gethostname():
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+    return False
+
+
+def _break_claim(claim: Path) -> None:
+    """Remove a stale claim (atomically, so two breakers can't both win)."""
+    broken = claim.parent / f"{CLAIM_FILE}.{os.getpid()}.broken"
+    try:
+        os.rename(claim, broken)
+        os.unlink(broken)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,257 @@
+"""
+Census of a stored game tree.
+
+Walks FileStore directories with os.scandir and reads only actions.txt
+(one line per legal action) and the game node's line in game.dot (turn,
+game over) - no DOT parsing. Reports node counts per depth and per turn,
+branching-factor histograms, terminal rates and bytes on disk.
+
+Two modes:
+- census_tree: exact, walks every node; subtrees are walked in parallel
+- sample_census: Knuth's estimator for trees too large to walk - random
+  root-to-leaf walks through the explored children, each visited node
+  weighted by the product of the child counts above it
+"""
+import os
+import random
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+_GAME_FILE = "game.dot"
+_ACTIONS_FILE = "actions.txt"
+_OUTCOME_FILE = "outcome.txt"
+
+# The game node's line is near the top of game.dot; read this much first
+_HEAD_BYTES = 4096
+_GAME_LINE = re.compile(rb'^game \[(.*)\];$', re.MULTILINE)
+_ATTR = re.compile(rb'(\w+)="?([^",\]]*)"?')
+
+
+class Census:
+    """
+    Aggregated tree statistics. Counts are floats so sampled estimates
+    (weighted) and exact walks share one structure; merge() combines
+    partial censuses from parallel workers.
+    """
+
+    def __init__(self, estimated: bool = False):
+        self.estimated = estimated
+        self.nodes = 0.0
+        self.terminal = 0.0
+        self.linked = 0.0            # States stored as symlinks to an equivalent state
+        self.bytes = 0.0             # Files and symlinks (lstat sizes)
+        self.by_depth = Counter()
+        self.terminal_by_depth = Counter()
+        self.by_turn = Counter()
+        self.actions_by_turn = Counter()   # Sum of legal actions per turn (mean = / by_turn)
+        self.branching = Counter()         # Legal actions -> nodes
+        self.explored = Counter()          # Stored children -> non-terminal nodes
+        self.walks = 0
+
+    def record(self, node: dict, depth: int, weight: float = 1.0) -> None:
+        """
+        Add one visited directory (see _visit) with a weight.
+
+        Directories without game.dot (left on the way to a state replayed
+        from an ancestor) are not states: only their bytes count, and the
+        walk goes on through them to stored descendants.
+        """
+        self.bytes += node['bytes'] * weight
+        if not node['stored']:
+            return
+        self.nodes += weight
+        self.by_depth[depth] += weight
+        self.by_turn[node['turn']] += weight
+        self.actions_by_turn[node['turn']] += node['actions'] * weight
+        self.branching[node['actions']] += weight
+        if node['linked']:
+            self.linked += weight
+        if node['terminal']:
+            self.terminal += weight
+            self.terminal_by_depth[depth] += weight
+        else:
+            self.explored[len(node['children'])] += weight
+
+    def merge(self, other: "Census") -> None:
+        for name in ('nodes', 'terminal', 'linked', 'bytes', 'walks'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for name in ('by_depth', 'terminal_by_depth', 'by_turn', 'actions_by_turn', 'branching', 'explored'):
+            getattr(self, name).update(getattr(other, name))
+
+    def to_dict(self) -> dict:
+        """Plain dict (JSON-friendly) of all statistics."""
+        return {
+            'estimated': self.estimated,
+            'walks': self.walks,
+            'nodes': self.nodes,
+            'terminal': self.terminal,
+            'terminal_rate': self.terminal / self.nodes if self.nodes else 0.0,
+            'linked': self.linked,
+            'bytes': self.bytes,
+            'by_depth': _sorted(self.by_depth),
+            'terminal_by_depth': _sorted(self.terminal_by_depth),
+            'by_turn': _sorted(self.by_turn),
+            'mean_actions_by_turn': {
+                turn: self.actions_by_turn[turn] / count
+                for turn, count in sorted(self.by_turn.items()) if count
+            },
+            'branching': _sorted(self.branching),
+            'explored': _sorted(self.explored),
+        }
+
+    def format(self) -> str:
+        """Human-readable report."""
+        d = self.to_dict()
+        n = (lambda x: f"~{x:,.0f}") if self.estimated else (lambda x: f"{x:,.0f}")
+        lines = [
+            f"nodes:     {n(d['nodes'])}" + (f"  (estimated from {self.walks} walks)" if self.estimated else ""),
+            f"terminal:  {n(d['terminal'])}  ({d['terminal_rate']:.1%})",
+            f"linked:    {n(d['linked'])}",
+            f"storage:   {'~' if self.estimated else ''}{_format_bytes(d['bytes'])}"
+            + (f"  ({d['bytes'] / d['nodes']:,.0f} B/node)" if d['nodes'] else ""),
+            "",
+            "depth      nodes   terminal",
+        ]
+        for depth, count in d['by_depth'].items():
+            lines.append(f"{depth:>5} {n(count):>10} {n(d['terminal_by_depth'].get(depth, 0)):>10}")
+        lines += ["", "turn       nodes  mean actions"]
+        for turn, count in d['by_turn'].items():
+            lines.append(f"{turn:>4} {n(count):>11} {d['mean_actions_by_turn'][turn]:>13.1f}")
+        lines += ["", "legal actions      nodes"]
+        for actions, count in d['branching'].items():
+            lines.append(f"{actions:>13} {n(count):>10}")
+        lines += ["", "stored children    nodes  (non-terminal)"]
+        for children, count in d['explored'].items():
+            lines.append(f"{children:>15} {n(count):>8}")
+        return "\n".join(lines)
+
+
+def census_tree(root: Path | str, workers: int | None = None) -> Census:
+    """
+    Exact census of every stored state under root.
+
+    The top of the tree is expanded breadth-first until there are enough
+    subtrees to keep the workers busy; each subtree is walked in a
+    separate process and the partial censuses merged.
+    """
+    root = str(root)
+    workers = workers or os.cpu_count() or 1
+    census = Census()
+
+    frontier = [(root, 0)]
+    while frontier and len(frontier) < workers * 4:
+        next_frontier = []
+        for path, depth in frontier:
+            node = _visit(path)
+            census.record(node, depth)
+            next_frontier.extend((os.path.join(path, child), depth + 1) for child in node['children'])
+        frontier = next_frontier
+        if not next_frontier:
+            break
+
+    if frontier:
+        with ProcessPoolExecutor(workers) as pool:
+            for partial in pool.map(_walk, frontier, chunksize=max(1, len(frontier) // (workers * 4))):
+                census.merge(partial)
+    return census
+
+
+def sample_census(root: Path | str, walks: int = 1000, seed: int | None = None) -> Census:
+    """
+    Estimate the census with random walks (Knuth's estimator).
+
+    Each walk descends from root through uniformly chosen stored children
+    until a node without any; a node reached after choosing among
+    b1, b2, ... children stands for b1*b2*... nodes. Averaging over walks
+    gives unbiased estimates of every count.
+    """
+    rng = random.Random(seed)
+    census = Census(estimated=True)
+    census.walks = walks
+    for _ in range(walks):
+        path, depth, weight = str(root), 0, 1.0
+        while True:
+            node = _visit(path)
+            census.record(node, depth, weight / walks)
+            if not node['children']:
+                break
+            weight *= len(node['children'])
+            path = os.path.join(path, rng.choice(node['children']))
+            depth += 1
+    return census
+
+
+# ========== Internal Helpers ==========
+
+def _walk(start: tuple[str, int]) -> Census:
+    """Exact census of one subtree (worker entry point)."""
+    census = Census()
+    stack = [start]
+    while stack:
+        path, depth = stack.pop()
+        node = _visit(path)
+        census.record(node, depth)
+        stack.extend((os.path.join(path, child), depth + 1) for child in node['children'])
+    return census
+
+
+def _visit(path: str) -> dict:
+    """
+    Read one state directory: stored children (numeric subdirectories),
+    legal action count, turn, terminal flag, symlinked flag, bytes and
+    whether a state is stored there at all (game.dot).
+    """
+    children = []
+    size = 0
+    actions = 0
+    turn = -1
+    terminal = False
+    linked = False
+    stored = False
+
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.isdigit() and entry.is_dir(follow_symlinks=False):
+                children.append(entry.name)
+                continue
+            size += entry.stat(follow_symlinks=False).st_size
+            if entry.name == _ACTIONS_FILE:
+                with open(entry.path, 'rb') as f:
+                    actions = f.read().count(b'\n')
+            elif entry.name == _GAME_FILE:
+                stored = True
+                linked = entry.is_symlink()
+                attrs = _game_attrs(entry.path)
+                turn = int(attrs.get('turn', -1))
+                terminal = terminal or attrs.get('game_over') == '1'
+            elif entry.name == _OUTCOME_FILE:
+                terminal = True
+
+    return {'children': children, 'bytes': size, 'actions': actions,
+            'turn': turn, 'terminal': terminal, 'linked': linked, 'stored': stored}
+
+
+def _game_attrs(dot_path: str) -> dict:
+    """Attributes of the game node, from its line in game.dot."""
+    with open(dot_path, 'rb') as f:
+        head = f.read(_HEAD_BYTES)
+        match = _GAME_LINE.search(head)
+        if match is None:
+            match = _GAME_LINE.search(head + f.read())
+    if match is None:
+        return {}
+    return {key.decode(): value.decode() for key, value in _ATTR.findall(match.group(1))}
+
+
+def _sorted(counter: Counter) -> dict:
+    return {key: counter[key] for key in sorted(counter)}
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024:
+            return f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} TB"
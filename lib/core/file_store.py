@@ -4,16 +4,21 @@ File-based state storage using DOT files.
 Persists game states to filesystem as .dot files and .dek files.
 """
 import copy
-import os
+import time
+from collections import OrderedDict
 from pathlib import Path
+from lib.core.atomic import atomic_symlink, atomic_write, claim_directory, is_claimed
 from lib.core.store import StateStore
 from lib.core.graph import load_dot, save_dot
+from lib.core.instrument import count, instrumented
+from lib.core.memsize import store_usage
 from lib.core.navigation import write_actions_file, read_actions_file
 
 # File names
 _DEK1_FILE = "deck1.dek"
 _DEK2_FILE = "deck2.dek"
 _GAME_FILE = "game.dot"
+_ACTIONS_FILE = "actions.txt"
 _OUTCOME_FILE = "outcome.txt"
 
 
@@ -23,11 +28,27 @@ class FileStore(StateStore):
 
     Saves states as DOT graphs and deck lists to filesystem.
     Caches loaded states to avoid repeated disk reads.
+
+    Safe with several processes sharing one tree: every file is replaced
+    atomically and game.dot (what state_exists checks) is written last,
+    so readers never see a partial state. claim() lets one worker own the
+    computation of a directory.
     """
 
-    def __init__(self):
-        self._cache = {}  # path -> state
+    def __init__(self, max_cached: int | None = None):
+        """
+        Args:
+            max_cached: Keep at most this many states in the cache, evicting
+                        the least recently used (unbounded by default; set it
+                        for long-running processes)
+        """
+        self._cache = OrderedDict()  # path -> state
+        self._max_cached = max_cached
+        # High-water mark of states held, and the largest sampled size (see memory_usage)
+        self._peak_states = 0
+        self._max_sampled_bytes = 0
 
+    @instrumented("store.file.load")
     def load_state(self, path: Path | str, state_class):
         """
         Load game state from filesystem (cached).
@@ -46,6 +67,8 @@ class FileStore(StateStore):
         cache_key = str(path)
 
         if cache_key in self._cache:
+            count("store.file.cache_hit")
+            self._cache.move_to_end(cache_key)
             return copy.deepcopy(self._cache[cache_key])
 
         game_file = path / _GAME_FILE
@@ -58,9 +81,11 @@ class FileStore(StateStore):
         deck2_ids = self._load_deck(path, player=2)
 
         state = state_class(graph, deck1_ids, deck2_ids)
-        self._cache[cache_key] = state
-        return state
+        self._remember(cache_key, state)
+        # Callers mutate loaded states; keep the cached copy pristine
+        return copy.deepcopy(state)
 
+    @instrumented("store.file.save")
     def save_state(self, state, path: Path | str, format_actions_fn=None):
         """
         Save game state to filesystem.
@@ -73,19 +98,21 @@ class FileStore(StateStore):
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
 
-        # Save core state
-        save_dot(state.graph, path / _GAME_FILE)
         self._save_deck(state.deck1_ids, path, player=1)
         self._save_deck(state.deck2_ids, path, player=2)
 
-        # Update cache
-        self._cache[str(path)] = state
-
         # Write actions file if formatter provided
         if format_actions_fn:
-            actions = format_actions_fn(state.graph)
+            actions = format_actions_fn(state)
             write_actions_file(path, actions)
 
+        # Save core state last: game.dot marks the directory as complete
+        # (action edges materialized for the DOT file)
+        save_dot(state.export_graph(), path / _GAME_FILE)
+
+        # Update cache
+        self._remember(str(path), state)
+
     def state_exists(self, path: Path | str) -> bool:
         """
         Check if state exists on filesystem.
@@ -111,6 +138,57 @@ class FileStore(StateStore):
         """
         return read_actions_file(Path(path))
 
+    def link_state(self, path: Path | str, target: Path | str) -> bool:
+        """
+        Alias a state directory to an equivalent stored state.
+
+        Symlinks game.dot, deck files and actions.txt to the target
+        directory (like _save_deck does for unchanged decks). Outcomes are
+        still written per directory.
+        """
+        path = Path(path)
+        target = Path(target)
+
+        if not self.state_exists(target):
+            return False
+
+        path.mkdir(parents=True, exist_ok=True)
+        # game.dot last, as in save_state
+        for name in (_DEK1_FILE, _DEK2_FILE, _ACTIONS_FILE, _GAME_FILE):
+            source = target / name
+            if source.exists():
+                atomic_symlink(source.resolve(), path / name)
+
+        if str(target) in self._cache:
+            self._remember(str(path), self._cache[str(target)])
+        return True
+
+    def claim(self, path: Path | str):
+        """
+        Claim a state directory for computation (context manager).
+
+        Yields True if this worker should compute the state, False if
+        another live worker already is (wait with wait_for_state).
+        """
+        return claim_directory(path)
+
+    def wait_for_state(self, path: Path | str, timeout: float | None = None, poll: float = 0.05) -> bool:
+        """
+        Wait while another worker holds the claim on path.
+
+        Returns:
+            True if the state exists, False if the claim went away (or
+            timed out) without it - the caller should claim it itself
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.state_exists(path):
+            if not is_claimed(path):
+                return self.state_exists(path)
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(poll)
+        return True
+
     def save_outcome(self, path: Path | str, suffix: str | None, data: dict) -> None:
         """
         Save outcome data at a path.
@@ -123,7 +201,7 @@ class FileStore(StateStore):
         if suffix is None:
             # Winning state - write actual file
             outcome_file = path / _OUTCOME_FILE
-            with open(outcome_file, 'w') as f:
+            with atomic_write(outcome_file) as f:
                 for key, value in data.items():
                     f.write(f"{key}: {value}\n")
         else:
@@ -134,9 +212,7 @@ class FileStore(StateStore):
             # Target: 0/1/2/outcome.txt
             relative_target = Path(*suffix.split('.')) / _OUTCOME_FILE
 
-            if symlink_path.exists() or symlink_path.is_symlink():
-                symlink_path.unlink()
-            os.symlink(relative_target, symlink_path)
+            atomic_symlink(relative_target, symlink_path)
 
     def get_outcomes(self, path: Path | str) -> list[str]:
         """Get outcome suffixes at this state."""
@@ -150,8 +226,25 @@ class FileStore(StateStore):
 
         return outcomes
 
+    def memory_usage(self) -> dict:
+        """RAM held by the state cache (see StateStore.memory_usage)."""
+        usage = store_usage(self._cache.values(), extras={'keys': list(self._cache)})
+        self._max_sampled_bytes = max(self._max_sampled_bytes, usage['bytes'])
+        usage['peak_states'] = self._peak_states
+        usage['max_sampled_bytes'] = self._max_sampled_bytes
+        return usage
+
     # ========== Internal Helpers ==========
 
+    def _remember(self, cache_key: str, state) -> None:
+        """Cache a state, evicting the least recently used beyond max_cached."""
+        self._cache[cache_key] = state
+        self._cache.move_to_end(cache_key)
+        if self._max_cached is not None:
+            while len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        self._peak_states = max(self._peak_states, len(self._cache))
+
     def _load_deck(self, base_path: Path, player: int) -> list[str]:
         """Load deck card IDs for a player."""
         deck_file = _DEK1_FILE if player == 1 else _DEK2_FILE
@@ -178,12 +271,10 @@ class FileStore(StateStore):
             parent_ids = self._load_deck(base_path.parent, player)
             if parent_ids == deck_ids:
                 # Content matches - create symlink instead of copying
-                if path.exists() or path.is_symlink():
-                    path.unlink()
-                os.symlink(parent_deck.resolve(), path)
+                atomic_symlink(parent_deck.resolve(), path)
                 return
 
         # Content differs or no parent - write new file
-        with open(path, 'w') as f:
+        with atomic_write(path) as f:
             for card_id in deck_ids:
                 f.write(f"{card_id}\n")
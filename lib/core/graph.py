@@ -10,29 +10,38 @@ Getters need transformation:
 - We want clean strings: 'Player'
 - Helpers abstract quote-stripping and common filtering patterns
 
-Setters don't need transformation:
-- We write clean values: node['lore'] = '5'
-- pydot adds quotes when saving (we don't care)
-- Direct graph access is fine: G.nodes[n]['attr'] = value
-
-If you're writing game logic, use graph mutations directly.
+Setters belong to the state, not the graph:
+- Game logic must mutate through LorcanaState (set_attr, exert/ready,
+  move_card, draw, damage_card, add_lore, set_current_player/step)
+- Those operations keep the incremental Zobrist hash, StateChanges and
+  dirty_cards in sync; a raw G.nodes[n]['attr'] = value or add_edge
+  silently breaks transposition lookups and incremental compute_all
+- Writing the graph directly is only fine before a LorcanaState wraps it
+  (e.g. building a template)
+
+If you're writing game logic, use the LorcanaState operations.
 If you're reading graph state, use the helpers below.
 """
 import networkx as nx
 from pathlib import Path
+from lib.core.atomic import atomic_write
+from lib.core.instrument import instrumented
 
 
+@instrumented("graph.load_dot")
 def load_dot(path: str | Path) -> nx.MultiDiGraph:
     """Load a DOT file into a networkx MultiDiGraph."""
     G = nx.drawing.nx_pydot.read_dot(str(path))
     return G
 
 
+@instrumented("graph.save_dot")
 def save_dot(G: nx.MultiDiGraph, path: str | Path) -> None:
-    """Save a networkx graph to DOT format."""
+    """Save a networkx graph to DOT format (atomically: readers never see a partial file)."""
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    nx.drawing.nx_pydot.write_dot(G, str(path))
+    with atomic_write(path) as f:
+        nx.drawing.nx_pydot.write_dot(G, f)
 
 
 def get_node_attr(G: nx.MultiDiGraph, node: str, attr: str, default=None):
@@ -56,6 +65,7 @@ def nodes_by_type(G: nx.MultiDiGraph, node_type: str) -> list[str]:
     return [n for n in G.nodes() if get_node_attr(G, n, "type") == node_type]
 
 
+@instrumented("graph.edges_by_label")
 def edges_by_label(G: nx.MultiDiGraph, label: str) -> list[tuple[str, str, str]]:
     """Get all edges with a given label. Returns list of (u, v, key)."""
     result = []
@@ -68,6 +78,7 @@ def edges_by_label(G: nx.MultiDiGraph, label: str) -> list[tuple[str, str, str]]
     return result
 
 
+@instrumented("graph.can_edges")
 def can_edges(G: nx.MultiDiGraph) -> list[tuple[str, str, str, str, str]]:
     """Get all action edges. Returns list of (u, v, key, action_type, action_id)."""
     result = []
@@ -0,0 +1,181 @@
+"""
+Opt-in instrumentation: call counts and timers for hot paths.
+
+Functions are wrapped once with @instrumented(name). While disabled (the
+default) a wrapper costs one flag check and the extra call; when enabled
+it counts calls and accumulates inclusive wall time per name, and in
+trace mode also records every call as a Chrome trace event (open the
+file in chrome://tracing or https://ui.perfetto.dev).
+
+    from lib.core import instrument
+
+    instrument.enable(trace=True)
+    ... play games ...
+    print(instrument.format_summary())
+    instrument.write_trace("trace.json")
+
+CLIs accept --profile (summary table on stderr) or --profile=<file.json>
+(table plus Chrome trace), see parse_profile_flag / report.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+_ENABLED = False
+_TRACE = False
+
+# Trace events beyond this are dropped (bounds memory on long runs)
+MAX_TRACE_EVENTS = 2_000_000
+
+_stats = {}      # name -> [calls, total_seconds, max_seconds]
+_counters = {}   # name -> count
+_events = []     # Chrome trace "X" events
+_origin = time.perf_counter()
+
+
+def enable(trace: bool = False) -> None:
+    """Start counting (and with trace=True, recording every call)."""
+    global _ENABLED, _TRACE
+    _ENABLED = True
+    _TRACE = trace
+
+
+def disable() -> None:
+    global _ENABLED, _TRACE
+    _ENABLED = False
+    _TRACE = False
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset() -> None:
+    """Drop all collected numbers and events."""
+    global _origin
+    _stats.clear()
+    _counters.clear()
+    _events.clear()
+    _origin = time.perf_counter()
+
+
+def instrumented(name):
+    """
+    Decorator: count and time calls under a name.
+
+    Args:
+        name: Timer name, or a function of the call's arguments returning
+              one (e.g. per action type); only evaluated when enabled
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            label = name(*args, **kwargs) if callable(name) else name
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(label, start, time.perf_counter())
+        return wrapper
+    return decorate
+
+
+def count(name: str, n: int = 1) -> None:
+    """Bump a plain counter (no timing)."""
+    if _ENABLED:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def stats() -> dict:
+    """name -> {calls, total_ms, mean_us, max_us}; counters under 'counters'."""
+    timers = {
+        label: {
+            'calls': calls,
+            'total_ms': total * 1000,
+            'mean_us': total / calls * 1e6 if calls else 0.0,
+            'max_us': longest * 1e6,
+        }
+        for label, (calls, total, longest) in _stats.items()
+    }
+    return {'timers': timers, 'counters': dict(_counters)}
+
+
+def format_summary(wall_seconds: float | None = None) -> str:
+    """Table of timers (by total time, inclusive) and counters."""
+    data = stats()
+    wall = wall_seconds or (time.perf_counter() - _origin)
+    lines = [f"{'name':<40} {'calls':>10} {'total ms':>11} {'mean us':>10} {'max us':>10} {'% wall':>7}"]
+    for label, row in sorted(data['timers'].items(), key=lambda item: -item[1]['total_ms']):
+        share = row['total_ms'] / 1000 / wall * 100 if wall else 0.0
+        lines.append(f"{label:<40} {row['calls']:>10} {row['total_ms']:>11.1f} "
+                     f"{row['mean_us']:>10.1f} {row['max_us']:>10.1f} {share:>6.1f}%")
+    for label, value in sorted(data['counters'].items()):
+        lines.append(f"{label:<40} {value:>10}")
+    lines.append(f"(inclusive times; nested timers overlap; wall {wall:.2f}s)")
+    return "\n".join(lines)
+
+
+def write_trace(path: Path | str) -> None:
+    """Write recorded events as a Chrome trace JSON file."""
+    document = {'traceEvents': _events, 'displayTimeUnit': 'ms', 'otherData': stats()}
+    Path(path).write_text(json.dumps(document))
+
+
+# ========== CLI Helpers ==========
+
+def parse_profile_flag(argv: list[str]) -> tuple[list[str], str | None]:
+    """
+    Strip --profile / --profile=<file> from argv and enable instrumentation.
+
+    Returns:
+        (remaining argv, profile target): None = not profiling, "" = table
+        only, otherwise the Chrome trace path
+    """
+    remaining, target = [], None
+    for arg in argv:
+        if arg == '--profile':
+            target = ""
+        elif arg.startswith('--profile='):
+            target = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    if target is not None:
+        reset()
+        enable(trace=bool(target))
+    return remaining, target
+
+
+def report(target: str | None) -> None:
+    """Print the summary to stderr and write the trace (see parse_profile_flag)."""
+    if target is None:
+        return
+    print(format_summary(), file=sys.stderr)
+    if target:
+        write_trace(target)
+        dropped = " (truncated)" if len(_events) >= MAX_TRACE_EVENTS else ""
+        print(f"[profile] {len(_events)} events -> {target}{dropped}", file=sys.stderr)
+
+
+# ========== Internal Helpers ==========
+
+def _record(label: str, start: float, end: float) -> None:
+    elapsed = end - start
+    entry = _stats.get(label)
+    if entry is None:
+        _stats[label] = [1, elapsed, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+    if _TRACE and len(_events) < MAX_TRACE_EVENTS:
+        _events.append({
+            'name': label, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+            'ts': (start - _origin) * 1e6, 'dur': elapsed * 1e6,
+        })
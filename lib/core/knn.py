@@ -0,0 +1,290 @@
+"""
+k-nearest-neighbor index over fixed-width float32 vectors.
+
+Vectors live on disk as raw float32 files opened with np.memmap, so an
+index of millions of rows loads instantly and only touched pages are
+read. Rows are append-only (incremental inserts as games finish); each
+row carries an int32 label and an int8 outcome, and the caller keeps any
+richer metadata keyed by row number.
+
+The row count in index.json is written after the row files, so it only
+ever covers complete rows. A crash between the two leaves the files
+longer than the count; open() truncates them back.
+
+Search modes:
+- exact: brute-force squared L2 over the whole index in blocks
+- approximate (IVF): after build_partitions(), rows are clustered around
+  k-means centroids and stored in cluster order; a query scans only the
+  n_probe nearest clusters, plus rows inserted since the last build
+
+Files in the index directory:
+    index.json          dim, row count, partition info
+    vectors.f32         rows in insertion order
+    labels.i32          per-row label
+    outcomes.i8         per-row outcome
+    ivf_centroids.npy   cluster centroids
+    ivf_offsets.npy     cluster c is rows ivf_offsets[c]:ivf_offsets[c+1] of ivf_*
+    ivf_rows.i64        row numbers in cluster order
+    ivf_vectors.f32     vectors in cluster order
+"""
+import json
+import os
+from pathlib import Path
+import numpy as np
+
+_META_FILE = "index.json"
+_VECTORS_FILE = "vectors.f32"
+_LABELS_FILE = "labels.i32"
+_OUTCOMES_FILE = "outcomes.i8"
+_CENTROIDS_FILE = "ivf_centroids.npy"
+_OFFSETS_FILE = "ivf_offsets.npy"
+_IVF_ROWS_FILE = "ivf_rows.i64"
+_IVF_VECTORS_FILE = "ivf_vectors.f32"
+
+# Rows per block in brute-force scans (bounds temporary memory)
+BLOCK_ROWS = 1 << 16
+
+
+class VectorIndex:
+    """
+    Append-only, memory-mapped k-NN index (see module docstring).
+
+    Usage:
+        index = VectorIndex.open("output/knn", dim=37)
+        index.add(vectors, labels, outcomes)
+        rows, dists = index.search(query, k=50)
+    """
+
+    def __init__(self, path: Path | str, meta: dict):
+        self.path = Path(path)
+        self.dim = meta['dim']
+        self.count = meta['count']
+        self.partitioned = meta.get('partitioned', 0)  # Rows covered by the IVF partitions
+        self._maps = {}
+        self._ivf = None  # (centroids, offsets), loaded on first approximate search
+
+    @classmethod
+    def open(cls, path: Path | str, dim: int | None = None):
+        """
+        Open an index directory, creating it if dim is given.
+
+        Raises:
+            FileNotFoundError: If the index doesn't exist and dim is None
+            ValueError: If dim doesn't match an existing index
+        """
+        path = Path(path)
+        meta_file = path / _META_FILE
+        if meta_file.exists():
+            meta = json.loads(meta_file.read_text())
+            if dim is not None and dim != meta['dim']:
+                raise ValueError(f"Index at {path} has dim {meta['dim']}, not {dim}")
+        elif dim is None:
+            raise FileNotFoundError(f"No {_META_FILE} at {path}")
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+            meta = {'dim': dim, 'count': 0}
+        index = cls(path, meta)
+        index._repair()
+        index._save_meta()
+        return index
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ========== Inserts ==========
+
+    def add(self, vectors: np.ndarray, labels: np.ndarray, outcomes: np.ndarray) -> range:
+        """
+        Append rows.
+
+        Returns:
+            Row numbers of the new rows
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        labels = np.asarray(labels, dtype=np.int32)
+        outcomes = np.asarray(outcomes, dtype=np.int8)
+        if not len(vectors) == len(labels) == len(outcomes):
+            raise ValueError("vectors, labels and outcomes must have the same length")
+
+        for name, array in ((_VECTORS_FILE, vectors), (_LABELS_FILE, labels), (_OUTCOMES_FILE, outcomes)):
+            with open(self.path / name, 'ab') as f:
+                f.write(array.tobytes())
+
+        start = self.count
+        self.count += len(vectors)
+        self._maps.clear()
+        self._save_meta()
+        return range(start, self.count)
+
+    # ========== Queries ==========
+
+    def vectors(self) -> np.ndarray:
+        """All rows (memory-mapped, read-only)."""
+        return self._map(_VECTORS_FILE, np.float32, (self.count, self.dim))
+
+    def labels(self) -> np.ndarray:
+        """Per-row labels (memory-mapped)."""
+        return self._map(_LABELS_FILE, np.int32, (self.count,))
+
+    def outcomes(self) -> np.ndarray:
+        """Per-row outcomes (memory-mapped)."""
+        return self._map(_OUTCOMES_FILE, np.int8, (self.count,))
+
+    def search(self, query: np.ndarray, k: int = 10, n_probe: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        k nearest rows to query (squared L2).
+
+        Args:
+            query: Vector of length dim
+            k: Number of neighbors
+            n_probe: Clusters to scan (approximate). None = exact search;
+                     ignored if build_partitions() was never run
+
+        Returns:
+            (row numbers, squared distances), nearest first
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+
+        if n_probe is None or not self.partitioned:
+            return _top_k(*_scan(self.vectors(), query, 0), k)
+
+        if self._ivf is None:
+            self._ivf = (np.load(self.path / _CENTROIDS_FILE), np.load(self.path / _OFFSETS_FILE))
+        centroids, offsets = self._ivf
+        ivf_vectors = self._map(_IVF_VECTORS_FILE, np.float32, (self.partitioned, self.dim))
+        ivf_rows = self._map(_IVF_ROWS_FILE, np.int64, (self.partitioned,))
+
+        probe = np.argsort(((centroids - query) ** 2).sum(axis=1))[:n_probe]
+        rows, dists = [], []
+        for cluster in probe:
+            start, end = offsets[cluster], offsets[cluster + 1]
+            if start == end:
+                continue
+            _, block_dists = _scan(ivf_vectors[start:end], query, 0)
+            rows.append(ivf_rows[start:end])
+            dists.append(block_dists)
+
+        # Rows added since the last build are scanned exactly
+        if self.count > self.partitioned:
+            tail_rows, tail_dists = _scan(self.vectors()[self.partitioned:], query, self.partitioned)
+            rows.append(tail_rows)
+            dists.append(tail_dists)
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return _top_k(np.concatenate(rows), np.concatenate(dists), k)
+
+    # ========== Approximate Mode ==========
+
+    def build_partitions(self, n_lists: int | None = None, sample: int = 100_000,
+                         iterations: int = 10, seed: int = 0) -> None:
+        """
+        (Re)build the IVF partitions over all current rows.
+
+        Args:
+            n_lists: Number of clusters (default ~sqrt(rows))
+            sample: Rows used to fit the k-means centroids
+            iterations: k-means iterations
+            seed: RNG seed for sampling/initialization
+        """
+        if self.count == 0:
+            return
+        vectors = self.vectors()
+        n_lists = max(1, min(n_lists or int(np.sqrt(self.count)), self.count))
+        rng = np.random.default_rng(seed)
+
+        # Fit centroids on a sample (Lloyd's k-means)
+        picks = np.sort(rng.choice(self.count, size=min(sample, self.count), replace=False))
+        train = np.asarray(vectors[picks])
+        n_lists = min(n_lists, len(train))
+        centroids = train[rng.choice(len(train), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assign = _nearest_centroid(train, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            counts = np.bincount(assign, minlength=n_lists)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+
+        # Assign every row in blocks, then write rows in cluster order
+        assign = np.empty(self.count, dtype=np.int32)
+        for start in range(0, self.count, BLOCK_ROWS):
+            assign[start:start + BLOCK_ROWS] = _nearest_centroid(np.asarray(vectors[start:start + BLOCK_ROWS]), centroids)
+        order = np.argsort(assign, kind='stable').astype(np.int64)
+        offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assign, minlength=n_lists))
+
+        self._maps.clear()
+        tmp = self.path / (_IVF_VECTORS_FILE + ".tmp")
+        ivf = np.memmap(tmp, dtype=np.float32, mode='w+', shape=(self.count, self.dim))
+        for start in range(0, self.count, BLOCK_ROWS):
+            ivf[start:start + BLOCK_ROWS] = vectors[order[start:start + BLOCK_ROWS]]
+        ivf.flush()
+        del ivf
+        os.replace(tmp, self.path / _IVF_VECTORS_FILE)
+
+        order.tofile(self.path / _IVF_ROWS_FILE)
+        np.save(self.path / _CENTROIDS_FILE, centroids)
+        np.save(self.path / _OFFSETS_FILE, offsets)
+        self.partitioned = self.count
+        self._ivf = None
+        self._save_meta()
+
+    # ========== Internal Helpers ==========
+
+    def _map(self, name: str, dtype, shape: tuple) -> np.ndarray:
+        """Memory-map a raw array file (cached until the next insert/build)."""
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+        array = self._maps.get(name)
+        if array is None:
+            array = np.memmap(self.path / name, dtype=dtype, mode='r', shape=shape)
+            self._maps[name] = array
+        return array
+
+    def _repair(self) -> None:
+        """Drop rows appended after the last saved count (interrupted add)."""
+        for name, row_bytes in ((_VECTORS_FILE, 4 * self.dim), (_LABELS_FILE, 4), (_OUTCOMES_FILE, 1)):
+            truncate_file(self.path / name, self.count * row_bytes)
+
+    def _save_meta(self) -> None:
+        meta = {'dim': self.dim, 'count': self.count, 'partitioned': self.partitioned}
+        tmp = self.path / (_META_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.path / _META_FILE)
+
+
+def truncate_file(path: Path, size: int) -> None:
+    """Cut a file down to size bytes if it is longer (missing files are left alone)."""
+    try:
+        if os.path.getsize(path) > size:
+            os.truncate(path, size)
+    except FileNotFoundError:
+        pass
+
+
+def _scan(vectors: np.ndarray, query: np.ndarray, first_row: int) -> tuple[np.ndarray, np.ndarray]:
+    """Squared distances from query to every row, in blocks."""
+    dists = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + BLOCK_ROWS])
+        diff = block - query
+        dists[start:start + len(block)] = np.einsum('ij,ij->i', diff, diff)
+    return np.arange(first_row, first_row + len(vectors), dtype=np.int64), dists
+
+
+def _top_k(rows: np.ndarray, dists: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """k smallest distances, sorted."""
+    if len(dists) > k:
+        keep = np.argpartition(dists, k - 1)[:k]
+        rows, dists = rows[keep], dists[keep]
+    order = np.argsort(dists, kind='stable')
+    return rows[order], dists[order]
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid for each row."""
+    # |v - c|^2 = |v|^2 - 2 v.c + |c|^2; |v|^2 doesn't change the argmin
+    scores = vectors @ centroids.T * -2 + (centroids ** 2).sum(axis=1)
+    return np.argmin(scores, axis=1).astype(np.int32)
+
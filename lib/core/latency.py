@@ -0,0 +1,48 @@
+"""
+Request latency accounting.
+
+Cheap per-operation accumulators for long-running processes: totals since
+start plus percentiles over a window of recent samples.
+"""
+from collections import deque
+
+
+class LatencyStats:
+    """
+    Latency accumulator for one operation.
+
+    Keeps count/total/max since start and the last `window` samples for
+    percentiles, so memory stays constant however long the process runs.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """Record one sample (seconds)."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """Percentile (0-100) over the recent window, in seconds (0.0 if empty)."""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        """Summary in milliseconds: count, mean, p50, p99, max."""
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            'count': self.count,
+            'mean_ms': round(mean * 1000, 3),
+            'p50_ms': round(self.percentile(50) * 1000, 3),
+            'p99_ms': round(self.percentile(99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+        }
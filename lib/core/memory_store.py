@@ -6,6 +6,8 @@ Useful for performance-critical operations like game tree search.
 """
 from pathlib import Path
 from copy import deepcopy
+from lib.core.instrument import instrumented
+from lib.core.memsize import store_usage
 from lib.core.store import StateStore
 
 
@@ -19,7 +21,7 @@ class MemoryStore(StateStore):
 
     def __init__(self):
         """Initialize empty in-memory storage."""
-        # Storage: path -> (graph, deck1_ids, deck2_ids)
+        # Storage: path -> state (deep copy, keeps derived caches)
         self._states = {}
         # Optional: path -> formatted_actions (for navigation)
         self._actions = {}
@@ -27,7 +29,11 @@ class MemoryStore(StateStore):
         self._outcomes = {}
         # Outcome refs: path -> list of action-path suffixes
         self._outcome_refs = {}
+        # High-water mark of states held, and the largest sampled size (see memory_usage)
+        self._peak_states = 0
+        self._max_sampled_bytes = 0
 
+    @instrumented("store.memory.load")
     def load_state(self, path: Path | str, state_class):
         """
         Load game state from memory.
@@ -37,7 +43,7 @@ class MemoryStore(StateStore):
             state_class: Class to instantiate (e.g., LorcanaState)
 
         Returns:
-            Loaded state instance with deep-copied graph
+            Loaded state instance (deep copy)
 
         Raises:
             KeyError: If state doesn't exist
@@ -47,12 +53,12 @@ class MemoryStore(StateStore):
         if path not in self._states:
             raise KeyError(f"State not found: {path}")
 
-        graph, deck1_ids, deck2_ids = self._states[path]
-
-        # Deep copy graph to prevent mutation of stored state
-        # Deck lists are copied in state constructor
-        return state_class(deepcopy(graph), list(deck1_ids), list(deck2_ids))
+        # Deep copy the whole state to prevent mutation of stored state.
+        # Copying the object (not rebuilding from graph + decks) keeps
+        # derived caches like incremental legal actions warm.
+        return deepcopy(self._states[path])
 
+    @instrumented("store.memory.save")
     def save_state(self, state, path: Path | str, format_actions_fn=None):
         """
         Save game state to memory.
@@ -65,15 +71,12 @@ class MemoryStore(StateStore):
         path = str(path)  # Normalize to string key
 
         # Store deep copy to prevent external mutations
-        self._states[path] = (
-            deepcopy(state.graph),
-            list(state.deck1_ids),
-            list(state.deck2_ids)
-        )
+        self._states[path] = deepcopy(state)
+        self._peak_states = max(self._peak_states, len(self._states))
 
         # Store formatted actions if provided
         if format_actions_fn:
-            self._actions[path] = format_actions_fn(state.graph)
+            self._actions[path] = format_actions_fn(state)
 
     def state_exists(self, path: Path | str) -> bool:
         """
@@ -99,6 +102,23 @@ class MemoryStore(StateStore):
         """
         return self._actions.get(str(path), [])
 
+    def link_state(self, path: Path | str, target: Path | str) -> bool:
+        """
+        Alias a state to an equivalent stored state (no copy).
+
+        Safe to share: stored states are never mutated, loads deep copy.
+        """
+        path, target = str(path), str(target)
+
+        if target not in self._states:
+            return False
+
+        self._states[path] = self._states[target]
+        if target in self._actions:
+            self._actions[path] = self._actions[target]
+        self._peak_states = max(self._peak_states, len(self._states))
+        return True
+
     def clear(self):
         """Clear all stored states from memory."""
         self._states.clear()
@@ -123,3 +143,15 @@ class MemoryStore(StateStore):
     def get_outcomes(self, path: Path | str) -> list[str]:
         """Get outcome suffixes at this state."""
         return self._outcome_refs.get(str(path), [])
+
+    def memory_usage(self) -> dict:
+        """RAM held by stored states, formatted actions and outcomes (see StateStore)."""
+        usage = store_usage(self._states.values(), extras={
+            'keys': list(self._states),
+            'formatted_actions': self._actions,
+            'outcomes': [self._outcomes, self._outcome_refs],
+        })
+        self._max_sampled_bytes = max(self._max_sampled_bytes, usage['bytes'])
+        usage['peak_states'] = self._peak_states
+        usage['max_sampled_bytes'] = self._max_sampled_bytes
+        return usage
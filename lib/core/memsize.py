@@ -0,0 +1,190 @@
+"""
+Memory accounting for states and stores.
+
+deep_sizeof walks an object graph (dicts, sequences, sets, instance
+__dict__/__slots__) summing sys.getsizeof once per object. Passing the
+same `seen` set across calls counts shared objects once - how store
+totals avoid double-counting ActionEdge tuples that deep copies share,
+or states aliased by link_state.
+
+state_breakdown splits one state's footprint into graph node attributes,
+edges, decks, legal actions, the action cache and everything else.
+
+For where allocations come from (rather than what is resident), see
+allocation_report, which attributes tracemalloc traces to the innermost
+engine (lib/) frame.
+"""
+import sys
+import tracemalloc
+import types
+from pathlib import Path
+
+# Not part of any state's footprint (shared by everything)
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+_LIB_ROOT = Path(__file__).resolve().parent.parent
+
+
+def deep_sizeof(obj, seen: set | None = None) -> int:
+    """
+    Bytes reachable from obj (each object counted once).
+
+    Args:
+        obj: Root object
+        seen: ids already counted (shared across calls to count shared
+              objects once); updated in place
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SKIP_TYPES):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, int, float, bool)) and o is not None:
+            attrs = getattr(o, '__dict__', None)
+            if attrs is not None:
+                stack.append(attrs)
+            for slot in getattr(type(o), '__slots__', ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def state_breakdown(state, seen: set | None = None) -> dict:
+    """
+    Bytes per component of one state (networkx graph + deck lists).
+
+    Components are claimed in order, so an object reachable from two
+    (e.g. a card ID string in a deck and in the graph) counts toward the
+    first: graph.nodes, graph.edges, decks, actions, action_cache, other.
+
+    Returns:
+        dict component -> bytes, plus 'total'
+    """
+    seen = set() if seen is None else seen
+    G = state.graph
+    parts = {
+        'graph.nodes': [G._node],
+        'graph.edges': [G._succ, G._pred],
+        'decks': [state.deck1_ids, state.deck2_ids],
+        'actions': [getattr(state, 'actions', None)],
+        'action_cache': [getattr(state, 'action_cache', None)],
+    }
+    result = {name: sum(deep_sizeof(o, seen) for o in objs if o is not None) for name, objs in parts.items()}
+    result['other'] = deep_sizeof(state, seen)  # State object, graph shell, change tracking, ...
+    result['total'] = sum(result.values())
+    return result
+
+
+def store_usage(states, extras: dict | None = None) -> dict:
+    """
+    Resident size of a store's states plus its other tables.
+
+    Args:
+        states: Stored state objects (aliases of one object counted once)
+        extras: name -> object for other resident data (formatted action
+                lists, outcomes, ...)
+
+    Returns:
+        dict with entries, states (distinct), bytes, bytes_per_state and
+        breakdown (component -> bytes, states' components then extras)
+    """
+    seen = set()
+    breakdown = {}
+    entries = 0
+    distinct = 0
+    for state in states:
+        entries += 1
+        if id(state) in seen:
+            continue
+        distinct += 1
+        for name, size in state_breakdown(state, seen).items():
+            if name != 'total':
+                breakdown[name] = breakdown.get(name, 0) + size
+    states_bytes = sum(breakdown.values())
+    for name, obj in (extras or {}).items():
+        breakdown[name] = deep_sizeof(obj, seen)
+
+    total = sum(breakdown.values())
+    return {
+        'entries': entries,
+        'states': distinct,
+        'bytes': total,
+        'bytes_per_state': states_bytes / distinct if distinct else 0.0,
+        'breakdown': breakdown,
+    }
+
+
+def format_usage(usage: dict) -> str:
+    """Human-readable store_usage() result (plus the memory_usage() high-water fields if present)."""
+    lines = [
+        f"entries: {usage['entries']}  distinct states: {usage['states']}  "
+        f"total: {usage['bytes'] / 1024:,.1f} KB  per state: {usage['bytes_per_state'] / 1024:,.1f} KB",
+    ]
+    if 'peak_states' in usage:
+        lines.append(f"high-water: {usage['peak_states']} states; largest sample {usage['max_sampled_bytes'] / 1024:,.1f} KB")
+    for name, size in sorted(usage['breakdown'].items(), key=lambda item: -item[1]):
+        share = size / usage['bytes'] * 100 if usage['bytes'] else 0.0
+        lines.append(f"  {name:<20} {size / 1024:>12,.1f} KB {share:>6.1f}%")
+    return "\n".join(lines)
+
+
+# ========== Allocation Tracing ==========
+
+def start_tracing(frames: int = 25) -> None:
+    """Start tracemalloc, keeping enough frames to reach engine code."""
+    tracemalloc.start(frames)
+
+
+def allocation_report(limit: int = 15, root: Path | str | None = None) -> str:
+    """
+    Live allocations since start_tracing(), attributed to engine modules.
+
+    Each allocation is charged to the innermost frame under root (default:
+    lib/), so memory allocated inside networkx, pydot or copy on the
+    engine's behalf lands on the engine line that asked for it.
+    """
+    root = str(Path(root).resolve() if root else _LIB_ROOT)
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+
+    modules = {}   # filename -> module name, or None outside root
+    by_module, by_line = {}, {}
+    for trace in snapshot.traces:
+        module, lineno = None, None
+        for frame in reversed(trace.traceback):   # Innermost last
+            if frame.filename not in modules:
+                modules[frame.filename] = _module_name(frame.filename, root)
+            module = modules[frame.filename]
+            if module is not None:
+                lineno = frame.lineno
+                break
+        module = module or "(outside engine)"
+        line = f"{module}:{lineno}" if lineno else module
+        by_module[module] = by_module.get(module, 0) + trace.size
+        by_line[line] = by_line.get(line, 0) + trace.size
+
+    lines = [f"traced: {current / 1024:,.1f} KB live, {peak / 1024:,.1f} KB peak", "", "by module:"]
+    for name, size in sorted(by_module.items(), key=lambda item: -item[1])[:limit]:
+        lines.append(f"  {name:<44} {size / 1024:>12,.1f} KB")
+    lines += ["", "by line:"]
+    for name, size in sorted(by_line.items(), key=lambda item: -item[1])[:limit]:
+        lines.append(f"  {name:<44} {size / 1024:>12,.1f} KB")
+    return "\n".join(lines)
+
+
+def _module_name(filename: str, root: str) -> str | None:
+    """lib/lorcana/state.py -> lib.lorcana.state (None outside root)"""
+    path = Path(filename).resolve()
+    if not str(path).startswith(root):
+        return None
+    return ".".join(path.relative_to(Path(root).parent).with_suffix("").parts)
@@ -3,15 +3,14 @@ Navigation file utilities for game tree exploration.
 
 Manages path.txt and actions.txt files that document game state navigation.
 """
-import networkx as nx
 from pathlib import Path
 from typing import NamedTuple
-from lib.core.graph import can_edges, get_edge_attr
+from lib.core.atomic import atomic_write
 
 
 class Action(NamedTuple):
     """
-    Represents an available action read from the game graph.
+    Represents an available action of a game state.
 
     Created by format_actions after action_id has been assigned.
     """
@@ -22,29 +21,28 @@ class Action(NamedTuple):
     description: str
 
 
-def format_actions(G: nx.MultiDiGraph) -> list[Action]:
+def format_actions(state) -> list[Action]:
     """
-    Format action edges into list of Action objects.
+    Format a state's legal actions into list of Action objects.
 
-    Reads from graph edges that have action_type set.
+    Args:
+        state: State with an `actions` list (index = action ID) of
+               tuples with src, dst, action_type, description fields
 
     Returns:
-        List of Action objects sorted by (action_type, src, dst)
+        List of Action objects in ID order (already sorted by
+        (action_type, src, dst) when computed)
     """
-    actions = []
-    # Sort edges by action_type for deterministic ordering
-    sorted_edges = sorted(can_edges(G), key=lambda e: (e[3], e[0], e[1]))  # (action_type, from, to)
-
-    for u, v, key, action_type, action_id in sorted_edges:
-        description = get_edge_attr(G, u, v, key, "description", action_type.lower())
-        actions.append(Action(
-            id=action_id,
-            action_type=action_type,
-            src=u,
-            dst=v,
-            description=description,
-        ))
-    return actions
+    return [
+        Action(
+            id=str(idx),
+            action_type=edge.action_type,
+            src=edge.src,
+            dst=edge.dst,
+            description=edge.description,
+        )
+        for idx, edge in enumerate(state.actions)
+    ]
 
 
 def write_actions_file(path: Path, actions: list[Action]) -> None:
@@ -56,7 +54,7 @@ def write_actions_file(path: Path, actions: list[Action]) -> None:
         actions: List of Action objects
     """
     path.mkdir(parents=True, exist_ok=True)
-    with open(path / "actions.txt", 'w') as f:
+    with atomic_write(path / "actions.txt") as f:
         for action in actions:
             f.write(f"{action.id}: {action.description}\n")
 
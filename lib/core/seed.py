@@ -7,7 +7,16 @@ Seed format: xxxxxxx.xxxxxxx.xx
 - Last 2 chars: RNG suffix for shuffling remainder
 
 Character mapping: 0-9 → 0-9, a-z → 10-35
+
+A hand is a multiset: specs that list the same indices in another order
+deal the same cards. canonical_seed() sorts each hand, and hand_multisets()
+enumerates every distinct hand once.
 """
+from math import comb
+from typing import Iterator
+
+# Indices a hand-spec character can address (0-9, a-z)
+MAX_INDEX = 35
 
 
 def parse_seed(seed: str) -> dict | None:
@@ -57,3 +66,83 @@ def char_to_index(c: str) -> int | None:
     elif 'a' <= c <= 'z':
         return ord(c) - ord('a') + 10
     return None
+
+
+def index_to_char(index: int) -> str:
+    """
+    Convert index to character (inverse of char_to_index).
+
+    Raises:
+        ValueError: If index is outside 0-35
+    """
+    if 0 <= index <= 9:
+        return chr(ord('0') + index)
+    if 10 <= index <= MAX_INDEX:
+        return chr(ord('a') + index - 10)
+    raise ValueError(f"Hand index {index} can't be encoded (hand-spec seeds address 0-{MAX_INDEX})")
+
+
+def format_seed(p1_hand: list[int], p2_hand: list[int], suffix: str) -> str:
+    """Hand-spec seed from both hands' indices and a 2-char suffix."""
+    return f"{''.join(map(index_to_char, p1_hand))}.{''.join(map(index_to_char, p2_hand))}.{suffix}"
+
+
+def canonical_seed(seed: str) -> str | None:
+    """
+    Hand-spec seed with each hand's indices sorted (one seed per hand pair).
+
+    The cards dealt only depend on the multiset of indices, but the whole
+    seed string seeds the shuffle of the rest of the deck, so an
+    equivalent seed deals the same hands over a different remainder.
+
+    Returns:
+        Canonical seed, or None if seed is not a valid hand-spec
+    """
+    spec = parse_seed(seed)
+    if spec is None:
+        return None
+    return format_seed(sorted(spec['p1_hand']), sorted(spec['p2_hand']), seed.split('.')[2])
+
+
+def hand_multisets(copies: list[int], size: int = 7) -> Iterator[tuple[int, ...]]:
+    """
+    Every distinct hand of size cards, as sorted index tuples in lexicographic order.
+
+    Args:
+        copies: Copies of each unique card (index = position)
+        size: Cards in hand
+    """
+    # Copies available at index i or later (prunes branches that can't fill the hand)
+    remaining = [0] * (len(copies) + 1)
+    for i in range(len(copies) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + copies[i]
+
+    hand = []
+
+    def extend(start: int, needed: int):
+        if needed == 0:
+            yield tuple(hand)
+            return
+        for i in range(start, len(copies)):
+            if remaining[i] < needed:
+                return
+            for k in range(min(copies[i], needed), 0, -1):
+                hand.extend([i] * k)
+                yield from extend(i + 1, needed - k)
+                del hand[-k:]
+
+    yield from extend(0, size)
+
+
+def hand_probability(hand: tuple[int, ...] | list[int], copies: list[int]) -> float:
+    """
+    Chance that the top len(hand) cards of a uniformly shuffled deck are this multiset.
+
+    Args:
+        hand: Unique-card indices (any order)
+        copies: Copies of each unique card (index = position)
+    """
+    ways = 1
+    for index in set(hand):
+        ways *= comb(copies[index], hand.count(index))
+    return ways / comb(sum(copies), len(hand))
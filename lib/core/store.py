@@ -5,6 +5,7 @@ Defines contract for loading/saving game states.
 Implementations: FileStore (DOT files), MemoryStore (dict-based).
 """
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from pathlib import Path
 
 
@@ -35,8 +36,9 @@ class StateStore(ABC):
 
         Args:
             state: State object with graph, deck1_ids, deck2_ids attributes
+                   and export_graph() (graph with action edges, for DOT)
             path: Identifier for where to save (file path or key)
-            format_actions_fn: Optional function to format actions for navigation
+            format_actions_fn: Optional function state -> actions for navigation
         """
         pass
 
@@ -78,6 +80,40 @@ class StateStore(ABC):
         """
         pass
 
+    def link_state(self, path: Path | str, target: Path | str) -> bool:
+        """
+        Store a state as an alias of an already stored, equivalent state.
+
+        Used to merge transpositions (same position reached by a different
+        action ordering) without storing the position twice.
+
+        Args:
+            path: Identifier for the new state
+            target: Identifier of the stored equivalent state
+
+        Returns:
+            True if linked, False if unsupported (caller should save_state)
+        """
+        return False
+
+    def claim(self, path: Path | str):
+        """
+        Claim a state for computation, so concurrent workers don't duplicate it.
+
+        Context manager yielding True if the caller should compute the
+        state. Single-process stores always yield True.
+        """
+        return nullcontext(True)
+
+    def wait_for_state(self, path: Path | str, timeout: float | None = None) -> bool:
+        """
+        Wait for a state claimed by another worker.
+
+        Returns:
+            True if the state now exists
+        """
+        return self.state_exists(path)
+
     def get_outcomes(self, path: Path | str) -> list[str]:
         """
         Get outcome suffixes at this state.
@@ -89,3 +125,18 @@ class StateStore(ABC):
             List of action-path suffixes (e.g., ["0.1.2", "3.4"])
         """
         return []
+
+    def memory_usage(self) -> dict:
+        """
+        RAM held by the store's resident states and tables.
+
+        Returns:
+            lib.core.memsize.store_usage() dict plus peak_states (most
+            states held at once, tracked on every save) and
+            max_sampled_bytes (largest size any memory_usage() call has
+            measured: sizing walks every state, so bytes are only sampled
+            here, and the true peak between calls can be higher); all zero
+            for stores that hold nothing
+        """
+        return {'entries': 0, 'states': 0, 'bytes': 0, 'bytes_per_state': 0.0,
+                'breakdown': {}, 'peak_states': 0, 'max_sampled_bytes': 0}
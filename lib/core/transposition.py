@@ -0,0 +1,75 @@
+"""
+Transposition table keyed by state hash.
+
+Different action orderings often reach the same position. A transposition
+table remembers the first entry stored for each position hash so that
+searchers and stores can merge equivalent nodes instead of expanding them again.
+
+Entries are opaque: GameSession stores the canonical path of a position,
+searchers can store values or visit statistics.
+"""
+
+
+class TranspositionTable:
+    """
+    Dict-backed map from 64-bit state hash to an arbitrary entry.
+
+    Tracks hit/miss counts so callers can report how much work was shared.
+    """
+
+    def __init__(self):
+        """Initialize empty table."""
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, state_hash: int, default=None):
+        """
+        Look up the entry for a position.
+
+        Args:
+            state_hash: Position hash (e.g., LorcanaState.zobrist_hash)
+            default: Returned if the position is unknown
+
+        Returns:
+            Stored entry, or default
+        """
+        if state_hash in self._entries:
+            self.hits += 1
+            return self._entries[state_hash]
+        self.misses += 1
+        return default
+
+    def put(self, state_hash: int, entry) -> None:
+        """Store (or overwrite) the entry for a position."""
+        self._entries[state_hash] = entry
+
+    def setdefault(self, state_hash: int, entry):
+        """
+        Store entry only if the position is new.
+
+        Args:
+            state_hash: Position hash
+            entry: Entry to store for a new position
+
+        Returns:
+            The entry now associated with the position (existing one on a hit)
+        """
+        if state_hash in self._entries:
+            self.hits += 1
+            return self._entries[state_hash]
+        self.misses += 1
+        self._entries[state_hash] = entry
+        return entry
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, state_hash: int) -> bool:
+        return state_hash in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
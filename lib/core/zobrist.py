@@ -0,0 +1,38 @@
+"""
+Zobrist hashing utilities.
+
+Each hashable feature of a state (e.g. "card X is in zone Y") maps to a
+random-looking 64-bit key. A state's hash is the sum of the keys of all its
+features modulo 2^64, so changing one feature is O(1): subtract the old key,
+add the new one. Summing (rather than the classic XOR) keeps repeated
+features from cancelling out, which matters when identical card copies are
+hashed as the same feature.
+
+Keys are derived from a digest of the feature tuple rather than a random
+table, so they are identical across processes and runs. That makes hashes
+safe to persist and to compare between workers.
+"""
+import hashlib
+
+HASH_BITS = 64
+HASH_MASK = (1 << HASH_BITS) - 1
+
+_KEYS = {}
+
+
+def zobrist_key(*feature) -> int:
+    """
+    Get the 64-bit key for a feature tuple (memoized).
+
+    Args:
+        *feature: Hashable, repr-stable values (strings, ints)
+
+    Returns:
+        Unsigned 64-bit integer key
+    """
+    key = _KEYS.get(feature)
+    if key is None:
+        digest = hashlib.blake2b(repr(feature).encode(), digest_size=HASH_BITS // 8).digest()
+        key = int.from_bytes(digest, 'little')
+        _KEYS[feature] = key
+    return key
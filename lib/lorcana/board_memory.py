@@ -0,0 +1,259 @@
+"""
+Board layer of AI.md: similar positions, and which actions won there.
+
+Every recorded decision is a row: the board vector before the action
+(vectorize_board, from the acting player's perspective), the action
+taken and whether the acting player eventually won. Rows live in a
+memory-mapped VectorIndex, so a finished game is appended cheaply and a
+query is a k-NN lookup plus a tally.
+
+Actions are keyed by what they do, not by IDs or card copies:
+"CAN_QUEST:mulan_disguised_soldier:player", "CAN_INK:diablo_obedient_raven:ink".
+
+Files (in the memory directory, next to the VectorIndex files):
+    memory.json     vectorizer schema version
+    action_keys.txt action key per label
+    games.txt       "<root path>\t<action path>" per game id
+    games.i32       per-row game id
+    plies.i16       per-row ply (the row's state is root + first N actions)
+
+A game's side files are appended before its rows are added to the
+index, whose saved row count is the commit point: opening the memory
+truncates anything a crash left beyond it.
+"""
+import copy
+import json
+from pathlib import Path
+from typing import NamedTuple
+import numpy as np
+from lib.core.file_store import FileStore
+from lib.core.graph import get_node_attr
+from lib.core.knn import VectorIndex, truncate_file
+from lib.core.navigation import Action, format_actions
+from lib.lorcana.execute import execute_action
+from lib.lorcana.lore_race import forced_winner
+from lib.lorcana.state import LorcanaState
+from lib.lorcana.vectorize import NUM_FEATURES, SCHEMA_VERSION, vectorize_board
+
+_MEMORY_FILE = "memory.json"
+_ACTION_KEYS_FILE = "action_keys.txt"
+_GAMES_FILE = "games.txt"
+_GAME_IDS_FILE = "games.i32"
+_PLIES_FILE = "plies.i16"
+
+
+class ActionScore(NamedTuple):
+    """How a legal action fared in similar positions."""
+    action: Action
+    score: float | None   # Distance-weighted win rate (None = never seen nearby)
+    support: int          # Neighbors that took this action
+
+
+def action_key(action_type: str, src: str, dst: str) -> str:
+    """Copy- and seat-independent key for an action (see module docstring)."""
+    return f"{action_type}:{_node_key(src)}:{_node_key(dst)}"
+
+
+class BoardMemory:
+    """Recorded decisions with k-NN lookup (see module docstring)."""
+
+    def __init__(self, path: Path | str):
+        """Open (or create) a memory directory."""
+        self.path = Path(path)
+        self.index = VectorIndex.open(self.path, dim=NUM_FEATURES)
+
+        meta_file = self.path / _MEMORY_FILE
+        if meta_file.exists():
+            version = json.loads(meta_file.read_text())['schema_version']
+            if version != SCHEMA_VERSION:
+                raise ValueError(f"Board memory at {path} uses vectorizer schema {version}, "
+                                 f"current is {SCHEMA_VERSION}; rebuild it")
+        else:
+            meta_file.write_text(json.dumps({'schema_version': SCHEMA_VERSION}))
+
+        self._repair()
+        self.action_keys = _read_lines(self.path / _ACTION_KEYS_FILE)
+        self._key_ids = {key: i for i, key in enumerate(self.action_keys)}
+        self.games = _read_lines(self.path / _GAMES_FILE)
+        self._recorded = set(self.games)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    # ========== Recording ==========
+
+    def record_game(self, start: LorcanaState, action_ids: list[str], root_path: str) -> int:
+        """
+        Replay a finished game from its start state and record each decision.
+
+        Args:
+            start: State the game starts from (not modified)
+            action_ids: Actions taken, in order
+            root_path: Stored path of start (for provenance)
+
+        Returns:
+            Number of rows added (0 if the game is already recorded or has
+            no winner: neither over nor decided by the lore race)
+        """
+        game = f"{root_path}\t{'.'.join(action_ids)}"
+        if game in self._recorded or not action_ids:
+            return 0
+
+        state = copy.deepcopy(start)
+        vectors = np.zeros((len(action_ids), NUM_FEATURES), dtype=np.float32)
+        keys, movers = [], []
+
+        for ply, action_id in enumerate(action_ids):
+            action = state.get_action(action_id)
+            if action is None:
+                raise ValueError(f"Action {action_id} not found at {root_path}/{'/'.join(action_ids[:ply])}")
+            vectorize_board(state, out=vectors[ply])
+            keys.append(action_key(action.action_type, action.src, action.dst))
+            movers.append(state.current_player)
+            execute_action(state, action.action_type, action.src, action.dst)
+
+        # Games stopped early at a decided position (stop_when_decided) have no winner node yet
+        winner = get_node_attr(state.graph, 'game', 'winner', None) or forced_winner(state)
+        if winner is None:
+            return 0
+
+        # Key IDs are only allocated (and persisted) for games that are recorded
+        labels = [self._key_id(key) for key in keys]
+        game_id = len(self.games)
+        self.games.append(game)
+        self._recorded.add(game)
+        with open(self.path / _GAMES_FILE, 'a') as f:
+            f.write(f"{game}\n")
+        with open(self.path / _GAME_IDS_FILE, 'ab') as f:
+            f.write(np.full(len(action_ids), game_id, dtype=np.int32).tobytes())
+        with open(self.path / _PLIES_FILE, 'ab') as f:
+            f.write(np.arange(len(action_ids), dtype=np.int16).tobytes())
+
+        outcomes = [1 if mover == winner else 0 for mover in movers]
+        self.index.add(vectors, labels, outcomes)
+        return len(action_ids)
+
+    def record_finished_games(self, root_path: Path | str, store: FileStore | None = None) -> int:
+        """
+        Record the finished games under a stored state (outcome.txt.* links)
+        that are not recorded yet, so repeated calls only add new games.
+
+        Returns:
+            Number of rows added
+        """
+        store = store or FileStore()
+        new = [suffix for suffix in sorted(store.get_outcomes(root_path))
+               if f"{root_path}\t{suffix}" not in self._recorded]
+        if not new:
+            return 0
+        root = store.load_state(root_path, LorcanaState)
+        added = 0
+        for suffix in new:
+            added += self.record_game(root, suffix.split('.'), str(root_path))
+        return added
+
+    # ========== Queries ==========
+
+    def score_actions(self, state: LorcanaState, k: int = 50, n_probe: int | None = 8) -> list[ActionScore]:
+        """
+        Score the state's legal actions by what won in the k nearest positions.
+
+        Args:
+            state: Current state
+            k: Neighbors to consult
+            n_probe: IVF clusters to scan (None = exact search)
+
+        Returns:
+            ActionScore per legal action, in action ID order
+        """
+        rows, dists = self.index.search(vectorize_board(state), k=k, n_probe=n_probe)
+        labels = self.index.labels()[rows]
+        outcomes = self.index.outcomes()[rows]
+        weights = 1.0 / (1.0 + np.sqrt(dists))
+
+        scores = []
+        for action in format_actions(state):
+            key_id = self._key_ids.get(action_key(action.action_type, action.src, action.dst))
+            match = labels == key_id if key_id is not None else np.zeros(len(rows), dtype=bool)
+            support = int(match.sum())
+            score = None
+            if support:
+                score = float((weights[match] * outcomes[match]).sum() / weights[match].sum())
+            scores.append(ActionScore(action, score, support))
+        return scores
+
+    def neighbors(self, state: LorcanaState, k: int = 10, n_probe: int | None = 8) -> list[dict]:
+        """Nearest recorded decisions: state path, action key, won, distance."""
+        rows, dists = self.index.search(vectorize_board(state), k=k, n_probe=n_probe)
+        count = len(self.index)
+        game_ids = np.memmap(self.path / _GAME_IDS_FILE, dtype=np.int32, mode='r', shape=(count,))
+        plies = np.memmap(self.path / _PLIES_FILE, dtype=np.int16, mode='r', shape=(count,))
+
+        result = []
+        for row, dist in zip(rows, dists):
+            root_path, actions = self.games[game_ids[row]].split('\t')
+            prefix = actions.split('.')[:plies[row]]
+            result.append({
+                'path': '/'.join([root_path, *prefix]),
+                'action': self.action_keys[self.index.labels()[row]],
+                'won': bool(self.index.outcomes()[row]),
+                'distance': float(np.sqrt(dist)),
+            })
+        return result
+
+    # ========== Internal Helpers ==========
+
+    def _repair(self) -> None:
+        """Cut the side files back to the index's rows (see module docstring)."""
+        count = len(self.index)
+        truncate_file(self.path / _GAME_IDS_FILE, count * 4)
+        truncate_file(self.path / _PLIES_FILE, count * 2)
+        games = 0
+        if count:
+            game_ids = np.memmap(self.path / _GAME_IDS_FILE, dtype=np.int32, mode='r', shape=(count,))
+            games = int(game_ids[-1]) + 1
+            del game_ids
+        _truncate_lines(self.path / _GAMES_FILE, games)
+        _truncate_lines(self.path / _ACTION_KEYS_FILE, None)
+
+    def _key_id(self, key: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = len(self.action_keys)
+            self.action_keys.append(key)
+            self._key_ids[key] = key_id
+            with open(self.path / _ACTION_KEYS_FILE, 'a') as f:
+                f.write(f"{key}\n")
+        return key_id
+
+
+def _node_key(node: str) -> str:
+    """Zone kind, card name (no owner/copy), 'player' or the node itself."""
+    parts = node.split('.')
+    if parts[0] == 'z':
+        return parts[-1]
+    if len(parts) == 3:
+        return parts[1]
+    if node in ('p1', 'p2'):
+        return 'player'
+    return node
+
+
+def _truncate_lines(path: Path, lines: int | None) -> None:
+    """Keep the first `lines` complete lines of a text file (None: all complete ones)."""
+    if not path.exists():
+        return
+    data = path.read_bytes()
+    end = 0
+    complete = data.count(b'\n')
+    for _ in range(complete if lines is None else min(lines, complete)):
+        end = data.index(b'\n', end) + 1
+    truncate_file(path, end)
+
+
+def _read_lines(path: Path) -> list[str]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [line.rstrip('\n') for line in f]
+
@@ -1,54 +1,103 @@
 """
 Compute legal actions (CAN_* edges) from Lorcana game state.
 
-Orchestrates mechanics to compute all legal actions.
+Orchestrates mechanics to compute all legal actions. The result is held on
+the state as an ID-indexed list (state.actions); CAN_* edges are only
+written to the graph when saving DOT (LorcanaState.export_graph).
+
+Incremental: each mechanic's actions are cached on the state per action
+type and only recomputed when the state changes it depends on (see
+Mechanic.invalidated_by). IDs are always assigned over the merged, sorted
+list, so they match a full recompute exactly.
+
+Stale mechanics share one GameSnapshot, built with a single graph pass.
 """
 import networkx as nx
-from lib.lorcana.mechanics.turn import compute_can_pass
-from lib.lorcana.mechanics.ink import compute_can_ink
-from lib.lorcana.mechanics.play import compute_can_play
-from lib.lorcana.mechanics.quest import compute_can_quest
-from lib.lorcana.mechanics.challenge import compute_can_challenge
+from lib.core.graph import get_node_attr
+from lib.core.instrument import instrumented
+from lib.lorcana.mechanics.registry import get_mechanics
+from lib.lorcana.snapshot import GameSnapshot
+
+# Built-in mechanics register themselves on import
+from lib.lorcana.mechanics import turn, ink, play, quest, challenge  # noqa: F401
+# TODO: Add other mechanics (activate abilities)
+
+
+def _copy_class(G: nx.MultiDiGraph, node: str):
+    """
+    Equivalence class of a node for symmetry reduction.
 
+    Card copies (p1.x.a, p1.x.b) with the same status are interchangeable,
+    so cards are identified by name without the copy suffix plus status.
+    Other nodes (zones, players) are their own class.
+    """
+    if get_node_attr(G, node, 'type') != 'Card':
+        return node
+    return (
+        node.rsplit('.', 1)[0],
+        get_node_attr(G, node, 'exerted', '0'),
+        get_node_attr(G, node, 'damage', '0'),
+        get_node_attr(G, node, 'entered_play', ''),
+    )
 
-def _clear_can_edges(G: nx.MultiDiGraph) -> None:
-    """Remove all existing action edges from the graph."""
-    to_remove = []
-    for u, v, key, data in G.edges(keys=True, data=True):
-        if data.get("action_type"):
-            to_remove.append((u, v, key))
-    for edge in to_remove:
-        G.remove_edge(*edge)
 
+def _collapse_copies(G: nx.MultiDiGraph, sorted_edges: list) -> list:
+    """Keep the first action of each group that differs only by card copy."""
+    seen = set()
+    result = []
+    for edge in sorted_edges:
+        key = (edge.action_type, _copy_class(G, edge.src), _copy_class(G, edge.dst))
+        if key not in seen:
+            seen.add(key)
+            result.append(edge)
+    return result
 
-def _add_can_edge(G: nx.MultiDiGraph, src: str, dst: str, action_type: str, action_id: str, description: str) -> str:
-    """Add an action edge with sequential action_id and description."""
-    key = G.add_edge(src, dst, action_type=action_type, action_id=action_id, description=description)
-    return key
 
+@instrumented("compute_all")
+def compute_all(state) -> None:
+    """
+    Recompute legal actions (state.actions) from current state.
 
-def compute_all(G: nx.MultiDiGraph) -> None:
-    """Recompute all CAN_* edges from current state."""
-    _clear_can_edges(G)
+    Only mechanics invalidated by state.changes are recomputed; the rest
+    come from state.action_cache. A state without a cache (fresh from
+    disk) gets a full recompute.
+
+    In canonical mode (game node canonical="1"), actions that differ only by
+    which copy of a card they use are collapsed into one (lowest copy
+    suffix wins).
+    """
+    G = state.graph
 
     # Don't compute actions if game is over
     game_over = G.nodes.get('game', {}).get('game_over', '0')
     if game_over == '1':
+        state.actions = []
+        state.action_cache = None
+        state.changes.clear()
         return
 
-    # Collect edges from all mechanics
+    cache = state.action_cache
+    if cache is None or state.changes.turn:
+        cache = {}
+
+    # Collect edges from all mechanics (recomputing stale ones only)
+    snap = None
     edges_to_add = []
-    edges_to_add.extend(compute_can_pass(G))
-    edges_to_add.extend(compute_can_ink(G))
-    edges_to_add.extend(compute_can_play(G))
-    edges_to_add.extend(compute_can_quest(G))
-    edges_to_add.extend(compute_can_challenge(G))
-    # TODO: Add other mechanics (activate abilities)
-
-    # Sort deterministically and assign sequential action IDs
+    for mechanic in get_mechanics():
+        if mechanic.action_type not in cache or mechanic.invalidated_by(state.changes):
+            if snap is None:
+                snap = GameSnapshot.from_graph(G)
+            cache[mechanic.action_type] = mechanic.compute(snap) if snap else []
+        edges_to_add.extend(cache[mechanic.action_type])
+
+    state.action_cache = cache
+    state.changes.clear()
+
+    # Sort deterministically; list index = sequential action ID
     # ActionEdge is a NamedTuple so we can use tuple indexing or named attributes
     sorted_edges = sorted(edges_to_add, key=lambda e: (e.action_type, e.src, e.dst))
 
-    # Add edges with sequential action_ids
-    for idx, edge in enumerate(sorted_edges):
-        _add_can_edge(G, edge.src, edge.dst, edge.action_type, action_id=str(idx), description=edge.description)
+    if G.nodes.get('game', {}).get('canonical', '0') == '1':
+        sorted_edges = _collapse_copies(G, sorted_edges)
+
+    state.actions = sorted_edges
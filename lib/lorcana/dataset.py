@@ -0,0 +1,319 @@
+"""
+Columnar training dataset export.
+
+One row per decision in every finished game under a seed: board features
+(vectorize_board), the legal actions, the action chosen, and how the game
+ended. Each seed becomes one shard directory of uncompressed .npy files,
+so every column can be memory-mapped (np.load(..., mmap_mode='r')) and
+re-read without parsing DOT again.
+
+Shard layout (<out_dir>/<seed name>/):
+    features.npy        (N, NUM_FEATURES) float32, mover's perspective
+    legal_offsets.npy   (N+1,) int64; row i's legal actions are
+                        legal_keys[legal_offsets[i]:legal_offsets[i+1]]
+    legal_keys.npy      int32 action key ids, in action ID order
+    chosen.npy          (N,) int16 action ID taken (index into row's legal actions)
+    chosen_key.npy      (N,) int32 action key id taken
+    mover.npy           (N,) int8 player to act (1 or 2)
+    winner.npy          (N,) int8 final winner (1 or 2, 0 = none); the forced
+                        winner for games stopped at a decided position
+    final_lore.npy      (N, 2) int16 final lore of p1, p2
+    game.npy, ply.npy   (N,) int32 game index / int16 ply within the game
+    keys.json           action key per key id (shard-local, see load_dataset)
+    meta.json           schema version, seed path, games (action paths)
+
+<seed name> is a symlink to the current version of the shard, a hidden
+directory (.<seed name>.<pid>.<ns>) written in full before the symlink
+is switched to it with one atomic replace; the previous version is only
+deleted afterwards. Readers see the old shard or the new one, and an
+interrupted export leaves no partial shard. meta.json lists the games
+(outcome suffixes) a shard holds: a rerun skips seeds whose shard is up
+to date and re-exports those where more games have finished since.
+"""
+import copy
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from lib.core.atomic import atomic_symlink
+from lib.core.file_store import FileStore
+from lib.core.graph import get_node_attr
+from lib.lorcana.board_memory import action_key
+from lib.lorcana.execute import execute_action
+from lib.lorcana.lore_race import forced_winner
+from lib.lorcana.state import LorcanaState
+from lib.lorcana.vectorize import NUM_FEATURES, SCHEMA_VERSION, vectorize_board
+
+_COLUMNS = ('features', 'legal_offsets', 'legal_keys', 'chosen', 'chosen_key',
+            'mover', 'winner', 'final_lore', 'game', 'ply')
+
+# Key columns that load_dataset remaps to the merged vocabulary
+_KEY_COLUMNS = ('legal_keys', 'chosen_key')
+
+
+def find_seeds(path: Path | str) -> list[Path]:
+    """
+    Seed directories (states with finished games below) under path.
+
+    Descends through matchup/output directories but not into action
+    subdirectories (numeric names), which belong to their seed.
+    """
+    path = Path(path)
+    store = FileStore()
+    if store.get_outcomes(path):
+        return [path]
+    seeds = []
+    for child in sorted(path.iterdir()):
+        if child.is_dir() and not child.name.isdigit():
+            seeds.extend(find_seeds(child))
+    return seeds
+
+
+def shard_name(seed_path: Path | str) -> str:
+    """Shard directory name for a seed (matchup and seed, e.g. b013__b123456.0123456.ab)."""
+    parts = Path(seed_path).parts
+    return '__'.join(parts[-2:])
+
+
+def export_seed(seed_path: Path | str, out_dir: Path | str) -> int:
+    """
+    Export one seed's finished games as a shard, replacing an older shard
+    of the seed that lacks some of them.
+
+    Returns:
+        Rows written (0 if the shard is already up to date)
+    """
+    out_dir = Path(out_dir)
+    final = out_dir / shard_name(seed_path)
+    store = FileStore(max_cached=0)
+    games = sorted(store.get_outcomes(seed_path))
+    previous = _shard_games(final)
+    if previous is not None and set(games) <= set(previous):
+        return 0
+
+    root = store.load_state(seed_path, LorcanaState)
+    columns = _Columns()
+    for game_index, game in enumerate(games):
+        columns.add_game(root, game.split('.'), game_index)
+
+    version = out_dir / f".{final.name}.{os.getpid()}.{time.time_ns()}"
+    version.mkdir(parents=True)
+    for name, array in columns.arrays().items():
+        np.save(version / f"{name}.npy", array)
+    (version / "keys.json").write_text(json.dumps(columns.keys))
+    (version / "meta.json").write_text(json.dumps({
+        'schema_version': SCHEMA_VERSION,
+        'seed': str(seed_path),
+        'games': games,
+    }))
+
+    # Point the shard at the new version in one step, then drop the old one
+    old = _shard_version(final)
+    atomic_symlink(version.name, final)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+    return columns.rows
+
+
+def export_dataset(paths: list[Path | str], out_dir: Path | str, workers: int | None = None) -> dict:
+    """
+    Export every seed under paths, one shard per seed, in parallel.
+
+    Resumable and incremental: seeds whose shard holds all their finished
+    games are skipped; seeds with games finished since their shard was
+    written are re-exported (counted in exported and in updated).
+
+    Args:
+        paths: Seed directories, or directories containing seeds
+        out_dir: Dataset directory
+        workers: Worker processes (default: CPU count)
+
+    Returns:
+        dict with seeds, exported, updated, skipped, rows
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    seeds = [seed for path in paths for seed in find_seeds(path)]
+    store = FileStore(max_cached=0)
+    todo, updated = [], 0
+    for seed in seeds:
+        previous = _shard_games(out_dir / shard_name(seed))
+        if previous is None:
+            todo.append(seed)
+        elif not set(store.get_outcomes(seed)) <= set(previous):
+            todo.append(seed)
+            updated += 1
+
+    rows = 0
+    exported = 0
+    if todo:
+        with ProcessPoolExecutor(workers) as pool:
+            for count in pool.map(export_seed, todo, [out_dir] * len(todo)):
+                rows += count
+                exported += count > 0
+    return {'seeds': len(seeds), 'exported': exported, 'updated': updated,
+            'skipped': len(seeds) - len(todo), 'rows': rows}
+
+
+def load_shard(shard_dir: Path | str) -> dict:
+    """One shard's columns, memory-mapped, plus 'keys' and 'meta'."""
+    shard_dir = Path(shard_dir)
+    data = {
+        path.stem: np.load(path, mmap_mode='r')
+        for path in sorted(shard_dir.glob("*.npy"))
+    }
+    data['keys'] = json.loads((shard_dir / "keys.json").read_text())
+    data['meta'] = json.loads((shard_dir / "meta.json").read_text())
+    return data
+
+
+def load_dataset(out_dir: Path | str, columns: list[str] | None = None) -> dict:
+    """
+    Concatenate shards into single arrays with one merged key vocabulary.
+
+    Args:
+        out_dir: Dataset directory
+        columns: Columns to load (default: all)
+
+    Returns:
+        dict of column -> array (copied; use load_shard to memory-map),
+        plus 'keys' (merged vocabulary); key columns are remapped and
+        legal_offsets rebased over the concatenation
+    """
+    shards = [load_shard(path) for path in sorted(Path(out_dir).iterdir())
+              if path.is_dir() and not path.name.startswith('.')]
+    for shard in shards:
+        version = shard['meta']['schema_version']
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Shard {shard['meta']['seed']} uses vectorizer schema {version}, "
+                             f"current is {SCHEMA_VERSION}; re-export it")
+
+    keys, key_ids = [], {}
+    remaps = []
+    for shard in shards:
+        remap = np.empty(len(shard['keys']), dtype=np.int32)
+        for i, key in enumerate(shard['keys']):
+            if key not in key_ids:
+                key_ids[key] = len(keys)
+                keys.append(key)
+            remap[i] = key_ids[key]
+        remaps.append(remap)
+
+    names = columns or (list(_COLUMNS) if shards else [])
+    result = {'keys': keys}
+    for name in names:
+        if name == 'legal_offsets':
+            parts, base = [np.zeros(1, dtype=np.int64)], 0
+            for shard in shards:
+                offsets = np.asarray(shard['legal_offsets'])
+                parts.append(offsets[1:] + base)
+                base += offsets[-1]
+            result[name] = np.concatenate(parts)
+        elif name in _KEY_COLUMNS:
+            result[name] = np.concatenate([remap[shard[name]] for shard, remap in zip(shards, remaps)])
+        else:
+            result[name] = np.concatenate([shard[name] for shard in shards])
+    return result
+
+
+def legal_mask(dataset: dict) -> np.ndarray:
+    """(rows, len(keys)) bool mask of legal action keys, from a loaded dataset."""
+    offsets = dataset['legal_offsets']
+    mask = np.zeros((len(offsets) - 1, len(dataset['keys'])), dtype=bool)
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    mask[rows, dataset['legal_keys']] = True
+    return mask
+
+
+class _Columns:
+    """Accumulates one shard's rows."""
+
+    def __init__(self):
+        self.keys = []
+        self._key_ids = {}
+        self.rows = 0
+        self.features = []
+        self.legal_offsets = [0]
+        self.legal_keys = []
+        self.chosen, self.chosen_key, self.mover = [], [], []
+        self.winner, self.final_lore, self.game, self.ply = [], [], [], []
+
+    def add_game(self, root: LorcanaState, action_ids: list[str], game_index: int) -> None:
+        """Replay one game from the seed and append a row per decision."""
+        state = copy.deepcopy(root)
+        features = np.zeros((len(action_ids), NUM_FEATURES), dtype=np.float32)
+
+        for ply, action_id in enumerate(action_ids):
+            action = state.get_action(action_id)
+            if action is None:
+                raise ValueError(f"Action {action_id} not found at ply {ply} of game {'.'.join(action_ids)}")
+            vectorize_board(state, out=features[ply])
+            for edge in state.actions:
+                self.legal_keys.append(self._key(action_key(edge.action_type, edge.src, edge.dst)))
+            self.legal_offsets.append(len(self.legal_keys))
+            self.chosen.append(int(action_id))
+            self.chosen_key.append(self._key(action_key(action.action_type, action.src, action.dst)))
+            self.mover.append(_player_number(state.current_player))
+            execute_action(state, action.action_type, action.src, action.dst)
+
+        # Games stopped early at a decided position (stop_when_decided) have no winner node yet
+        winner = _player_number(get_node_attr(state.graph, 'game', 'winner', None) or forced_winner(state))
+        lore = (int(get_node_attr(state.graph, 'p1', 'lore', 0)), int(get_node_attr(state.graph, 'p2', 'lore', 0)))
+        self.features.append(features)
+        self.winner.extend([winner] * len(action_ids))
+        self.final_lore.extend([lore] * len(action_ids))
+        self.game.extend([game_index] * len(action_ids))
+        self.ply.extend(range(len(action_ids)))
+        self.rows += len(action_ids)
+
+    def arrays(self) -> dict:
+        features = np.concatenate(self.features) if self.features else np.zeros((0, NUM_FEATURES), dtype=np.float32)
+        return {
+            'features': features,
+            'legal_offsets': np.array(self.legal_offsets, dtype=np.int64),
+            'legal_keys': np.array(self.legal_keys, dtype=np.int32),
+            'chosen': np.array(self.chosen, dtype=np.int16),
+            'chosen_key': np.array(self.chosen_key, dtype=np.int32),
+            'mover': np.array(self.mover, dtype=np.int8),
+            'winner': np.array(self.winner, dtype=np.int8),
+            'final_lore': np.array(self.final_lore, dtype=np.int16).reshape(-1, 2),
+            'game': np.array(self.game, dtype=np.int32),
+            'ply': np.array(self.ply, dtype=np.int16),
+        }
+
+    def _key(self, key: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = len(self.keys)
+            self._key_ids[key] = key_id
+            self.keys.append(key)
+        return key_id
+
+
+def _player_number(player: str | None) -> int:
+    """'p1' -> 1, 'p2' -> 2, None -> 0."""
+    return int(player[1:]) if player else 0
+
+
+def _shard_games(shard_dir: Path) -> list[str] | None:
+    """Games recorded in an exported shard's meta.json (None if there is no shard)."""
+    try:
+        return json.loads((shard_dir / "meta.json").read_text())['games']
+    except FileNotFoundError:
+        return None
+
+
+def _shard_version(shard_dir: Path) -> Path | None:
+    """Directory the shard currently points at (None if there is no shard)."""
+    if shard_dir.is_symlink():
+        return shard_dir.parent / os.readlink(shard_dir)
+    if not shard_dir.is_dir():
+        return None
+    # A plain directory (exported before versioned shards): move it aside so
+    # the symlink can take its name (the only time the shard is briefly missing)
+    legacy = shard_dir.parent / f".{shard_dir.name}.{os.getpid()}.legacy"
+    os.rename(shard_dir, legacy)
+    return legacy
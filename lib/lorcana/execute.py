@@ -4,33 +4,26 @@ Execute actions on Lorcana game state.
 Applies mutations to the graph based on action types.
 Routes to specific mechanic implementations.
 """
+import copy
 from pathlib import Path
 import sys
-from lib.core.graph import can_edges, get_node_attr
+from lib.core.graph import get_node_attr
+from lib.core.instrument import instrumented
 from lib.core.file_store import FileStore
 from lib.core.outcome import backpropagate, find_seed_path
+from lib.core.transposition import TranspositionTable
 from lib.lorcana.state import LorcanaState
 from lib.lorcana.compute import compute_all
-from lib.lorcana.mechanics.turn import advance_turn
-from lib.lorcana.mechanics.ink import execute_ink
-from lib.lorcana.mechanics.play import execute_play
-from lib.lorcana.mechanics.quest import execute_quest
-from lib.lorcana.mechanics.challenge import execute_challenge
+from lib.lorcana.mechanics.registry import get_mechanic
 from lib.lorcana.state_based_effects import check_state_based_effects
 
 
+@instrumented(lambda state, action_type, *_: f"execute_action.{action_type}")
 def execute_action(state: LorcanaState, action_type: str, from_node: str, to_node: str) -> None:
     """Execute an action, mutating the state."""
-    if action_type == "CAN_PASS":
-        advance_turn(state, from_node, to_node)
-    elif action_type == "CAN_INK":
-        execute_ink(state, from_node, to_node)
-    elif action_type == "CAN_PLAY":
-        execute_play(state, from_node, to_node)
-    elif action_type == "CAN_QUEST":
-        execute_quest(state, from_node, to_node)
-    elif action_type == "CAN_CHALLENGE":
-        execute_challenge(state, from_node, to_node)
+    mechanic = get_mechanic(action_type)
+    if mechanic:
+        mechanic.execute(state, from_node, to_node)
     else:
         print(f"TODO: Implement {action_type}", file=sys.stderr)
 
@@ -38,56 +31,128 @@ def execute_action(state: LorcanaState, action_type: str, from_node: str, to_nod
     check_state_based_effects(state)
 
     # Recompute legal actions after any mutation
-    compute_all(state.graph)
+    compute_all(state)
 
 
-def apply_action_at_path(path: Path) -> None:
+def apply_action_at_path(path: Path, store: FileStore | None = None, checkpoints: set[int] | None = None,
+                         transpositions: TranspositionTable | None = None) -> int:
     """
     Apply the action represented by this directory.
 
-    Recursively ensures all parent states exist before applying this action.
+    Loads the nearest stored ancestor once and replays the remaining
+    actions in memory. Only the requested state is written, plus any
+    intermediate states at the given checkpoint depths (plies below the
+    seed directory), so a deep path costs one load and one save.
+
+    Safe with concurrent workers: the directory is claimed first, and a
+    worker that finds it claimed waits for the owner's result instead of
+    computing it again. Checkpoints are claimed too, but never waited
+    for: one already stored or claimed by another worker is skipped.
+
+    Args:
+        path: State directory (.../<seed>/<action>/<action>/...)
+        store: FileStore to use (reuses its cache); a new one by default
+        checkpoints: Depths at which intermediate states are also saved
+        transpositions: Positions stored so far (hash -> path), kept across
+                        calls by long-running callers. Canonical-mode
+                        states already in it are linked to that path
+                        instead of saved again (see FileStore.link_state).
+
+    Returns:
+        Number of plies replayed (0 if the state already existed or was
+        computed by another worker)
+
+    Raises:
+        FileNotFoundError: If no ancestor of path has a stored state
+        ValueError: If an action ID on the path is not legal
     """
-    from lib.core.navigation import format_actions
-
     path = Path(path)
-    store = FileStore()
+    store = store or FileStore()
 
     # If state already exists, nothing to do
-    if store.state_exists(path):
-        return
+    while not store.state_exists(path):
+        with store.claim(path) as owned:
+            if owned:
+                # Re-check: the previous owner may have just finished
+                if store.state_exists(path):
+                    return 0
+                return _replay_path(path, store, checkpoints, transpositions)
+
+        # Another worker is computing it: wait for its result
+        store.wait_for_state(path)
+
+    return 0
+
+
+def _replay_path(path: Path, store: FileStore, checkpoints: set[int] | None,
+                 transpositions: TranspositionTable | None) -> int:
+    """Replay path from its nearest stored ancestor, saving the result (see apply_action_at_path)."""
+    # Walk up to the nearest stored ancestor, collecting action IDs
+    action_ids = []
+    ancestor = path
+    while not store.state_exists(ancestor):
+        if ancestor.parent == ancestor:
+            raise FileNotFoundError(f"No stored ancestor state for {path}")
+        action_ids.insert(0, ancestor.name)
+        ancestor = ancestor.parent
+
+    # Depth of the ancestor below the seed directory (for checkpoints)
+    seed_path = find_seed_path(str(path))
+    if checkpoints and seed_path and str(ancestor).startswith(seed_path):
+        depth = len(Path(str(ancestor)[len(seed_path):].lstrip('/')).parts)
+    else:
+        depth = 0
+
+    state = store.load_state(ancestor, LorcanaState)
+    current = ancestor
+    if transpositions is not None and state.canonical:
+        transpositions.setdefault(state.zobrist_hash, str(ancestor))
 
-    # Recursively ensure parent exists
-    parent_path = path.parent
-    if parent_path != path and not store.state_exists(parent_path):
-        apply_action_at_path(parent_path)
+    for action_id in action_ids:
+        # O(1) lookup by ID
+        action = state.get_action(action_id)
+        if action is None:
+            raise ValueError(f"Action {action_id} not found in state {current}")
 
-    # Now apply this action
-    action_id = path.name
+        execute_action(state, action.action_type, action.src, action.dst)
+        current = current / action_id
+        depth += 1
 
-    # Load parent state
-    parent = store.load_state(parent_path, LorcanaState)
+        if current != path and checkpoints and depth in checkpoints:
+            _save_checkpoint(store, state, current, transpositions)
 
-    # Find the action edge that matches this ID
-    action_found = False
-    for u, v, key, action_type, edge_action_id in can_edges(parent.graph):
-        if edge_action_id == action_id:
-            # Apply the action (mutates parent.graph)
-            execute_action(parent, action_type, u, v)
-            action_found = True
-            break
+    _save_replayed(store, state, path, transpositions)
+    return len(action_ids)
 
-    if not action_found:
-        raise ValueError(f"Action {action_id} not found in parent state")
 
-    # Save new state at action path
-    store.save_state(parent, path, format_actions_fn=format_actions)
+def _save_checkpoint(store: FileStore, state: LorcanaState, path: Path,
+                     transpositions: TranspositionTable | None) -> None:
+    """Save an intermediate state under its own claim, unless it is stored or being computed."""
+    if store.state_exists(path):
+        return
+    with store.claim(path) as owned:
+        if owned and not store.state_exists(path):
+            # Store a copy: replay keeps mutating state after a checkpoint
+            _save_replayed(store, copy.deepcopy(state), path, transpositions)
+
+
+def _save_replayed(store: FileStore, state: LorcanaState, path: Path,
+                   transpositions: TranspositionTable | None = None) -> None:
+    """Save a replayed state (or link a transposition); if the game is over, write and backpropagate the outcome."""
+    from lib.core.navigation import format_actions
+
+    first = str(path)
+    if transpositions is not None and state.canonical:
+        first = transpositions.setdefault(state.zobrist_hash, str(path))
+    if first == str(path) or not store.link_state(path, first):
+        store.save_state(state, path, format_actions_fn=format_actions)
 
     # If game is over, write outcome and backpropagate
-    if get_node_attr(parent.graph, 'game', 'game_over', '0') == '1':
+    if get_node_attr(state.graph, 'game', 'game_over', '0') == '1':
         outcome_data = {
-            'winner': get_node_attr(parent.graph, 'game', 'winner', None),
-            'p1_lore': int(get_node_attr(parent.graph, 'p1', 'lore', '0')),
-            'p2_lore': int(get_node_attr(parent.graph, 'p2', 'lore', '0')),
+            'winner': get_node_attr(state.graph, 'game', 'winner', None),
+            'p1_lore': int(get_node_attr(state.graph, 'p1', 'lore', '0')),
+            'p2_lore': int(get_node_attr(state.graph, 'p2', 'lore', '0')),
         }
 
         # Save at winning state
@@ -0,0 +1,313 @@
+"""
+Asyncio exploration service for many concurrent clients.
+
+Agents, notebooks and UIs exploring the same tree share one service:
+- apply/expand requests for children of the same parent are batched: the
+  parent is materialized and loaded once per batch
+- concurrent requests for the same path share one in-flight computation
+  (a path is computed and written once, never raced)
+- random playouts run in a process pool, off the event loop
+- the request queue is bounded (callers wait when it is full), and queue
+  depth, batching and dedup counters are exposed through metrics()
+
+Store operations run on a single worker thread, so the store has exactly
+one writer. Clients in other processes talk to it through serve() (JSON
+lines over a Unix socket or localhost TCP, see bin/explore-server.py).
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from lib.core.latency import LatencyStats
+from lib.lorcana.service import RulesService
+
+
+class ExplorationService:
+    """
+    Batched, deduplicating front end to a RulesService.
+
+    Use as an async context manager:
+
+        async with ExplorationService() as svc:
+            children = await svc.expand("output/b013/b123456.0123456.ab")
+            result = await svc.apply("output/b013/b123456.0123456.ab", "0")
+    """
+
+    def __init__(self, max_cached: int = 4096, max_queue: int = 256, playout_workers: int | None = None):
+        """
+        Args:
+            max_cached: Hot states kept in memory (FileStore LRU)
+            max_queue: Parent states waiting to be expanded before callers block
+            playout_workers: Processes for playouts (default: CPU count)
+        """
+        self.rules = RulesService(max_cached=max_cached)
+        self.max_queue = max_queue
+        self._playout_workers = playout_workers
+
+        self._queue = None                 # Parent paths with an open batch (created in start)
+        self._pending = {}                 # parent path -> {action_id: Future} (batch being filled)
+        self._inflight = {}                # child path -> Future
+        self._worker = None
+        self._store_thread = None
+        self._playout_pool = None
+        self._playout_slots = None
+        self._playouts_running = 0
+        self._playouts_waiting = 0
+
+        self.counters = {'requests': 0, 'dedup_hits': 0, 'batches': 0, 'batched_requests': 0, 'playouts': 0}
+        self.latency = {'apply': LatencyStats(), 'expand': LatencyStats(), 'playout': LatencyStats()}
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self) -> None:
+        """Start the batch worker and executors (inside the running loop)."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._store_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dotcana-store")
+        workers = self._playout_workers or os.cpu_count() or 1
+        self._playout_pool = ProcessPoolExecutor(workers)
+        self._playout_slots = asyncio.Semaphore(workers)
+        self._worker = asyncio.create_task(self._run_batches())
+
+    async def close(self) -> None:
+        """Finish queued batches, then stop the worker and executors."""
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._store_thread.shutdown()
+        self._playout_pool.shutdown()
+
+    # ========== Requests ==========
+
+    async def apply(self, path: Path | str, action_id: str) -> dict:
+        """
+        Materialize path/action_id (like RulesService.apply).
+
+        Returns:
+            State summary (see RulesService.play)
+        """
+        start = time.perf_counter()
+        try:
+            return await self._child(str(path), str(action_id))
+        finally:
+            self.latency['apply'].record(time.perf_counter() - start)
+
+    async def expand(self, path: Path | str) -> dict[str, dict]:
+        """
+        Materialize every child of a state, as one batch.
+
+        Returns:
+            dict action_id -> state summary
+        """
+        start = time.perf_counter()
+        try:
+            path = str(path)
+            actions = await self._in_store_thread(self.rules.actions, path)
+            ids = [a['id'] for a in actions]
+            results = await asyncio.gather(*(self._child(path, action_id) for action_id in ids))
+            return dict(zip(ids, results))
+        finally:
+            self.latency['expand'].record(time.perf_counter() - start)
+
+    async def actions(self, path: Path | str) -> list[dict]:
+        """Legal actions of a stored state."""
+        return await self._in_store_thread(self.rules.actions, str(path))
+
+    async def playout(self, path: Path | str, games: int = 1, seed: int | None = None,
+                      max_actions: int = 1000, stop_when_decided: bool = False) -> dict:
+        """Random playouts from a state, run in the process pool (see RulesService.playout)."""
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        # At most one playout per worker process; the rest wait here
+        self._playouts_waiting += 1
+        try:
+            await self._playout_slots.acquire()
+        finally:
+            self._playouts_waiting -= 1
+
+        self._playouts_running += 1
+        try:
+            result = await loop.run_in_executor(
+                self._playout_pool, _playout_worker, str(path), games, seed, max_actions, stop_when_decided)
+        finally:
+            self._playouts_running -= 1
+            self._playout_slots.release()
+            self.latency['playout'].record(time.perf_counter() - start)
+
+        self.counters['playouts'] += games
+        return result
+
+    def metrics(self) -> dict:
+        """Queue depth, backpressure state, counters and latency (ms)."""
+        depth = self._queue.qsize() if self._queue else 0
+        return {
+            'queue_depth': depth,
+            'queue_capacity': self.max_queue,
+            'saturated': depth >= self.max_queue,
+            'pending_batches': len(self._pending),
+            'inflight_paths': len(self._inflight),
+            'playouts_running': self._playouts_running,
+            'playouts_waiting': self._playouts_waiting,
+            **self.counters,
+            'latency': {name: stats.summary() for name, stats in self.latency.items()},
+        }
+
+    # ========== Internal Helpers ==========
+
+    async def _child(self, parent: str, action_id: str) -> dict:
+        """Join (or start) the computation of one child path."""
+        self.counters['requests'] += 1
+        child = str(Path(parent) / action_id)
+
+        # Same path already being computed: share its result
+        future = self._inflight.get(child)
+        if future is not None:
+            self.counters['dedup_hits'] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[child] = future
+
+        # Join the parent's open batch, or open one (waits if the queue is full)
+        batch = self._pending.get(parent)
+        if batch is not None:
+            batch[action_id] = future
+        else:
+            self._pending[parent] = {action_id: future}
+            await self._queue.put(parent)
+
+        return await asyncio.shield(future)
+
+    async def _run_batches(self) -> None:
+        """Worker: take one parent at a time and compute its whole batch."""
+        while True:
+            parent = await self._queue.get()
+            batch = self._pending.pop(parent)
+            self.counters['batches'] += 1
+            self.counters['batched_requests'] += len(batch)
+            try:
+                results = await self._in_store_thread(self._compute_batch, parent, list(batch))
+                for action_id, future in batch.items():
+                    outcome = results[action_id]
+                    if isinstance(outcome, Exception):
+                        future.set_exception(outcome)
+                    else:
+                        future.set_result(outcome)
+            except Exception as error:
+                for future in batch.values():
+                    if not future.done():
+                        future.set_exception(error)
+            finally:
+                for action_id in batch:
+                    self._inflight.pop(str(Path(parent) / action_id), None)
+                self._queue.task_done()
+
+    def _compute_batch(self, parent: str, action_ids: list[str]) -> dict:
+        """Store thread: materialize the parent once, then each child from it."""
+        self.rules.play(parent)
+
+        results = {}
+        for action_id in action_ids:
+            try:
+                results[action_id] = self.rules.apply(parent, action_id)
+            except (ValueError, FileNotFoundError) as error:
+                results[action_id] = error
+        return results
+
+    async def _in_store_thread(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._store_thread, fn, *args)
+
+
+# Per-process service for playout workers (card DB loaded once per process)
+_WORKER_RULES = None
+
+
+def _playout_worker(path: str, games: int, seed: int | None, max_actions: int,
+                    stop_when_decided: bool) -> dict:
+    """Process pool entry point for ExplorationService.playout."""
+    global _WORKER_RULES
+    if _WORKER_RULES is None:
+        _WORKER_RULES = RulesService()
+    return _WORKER_RULES.playout(path, games=games, seed=seed, max_actions=max_actions,
+                                 stop_when_decided=stop_when_decided)
+
+
+async def serve(service: ExplorationService, socket_path: str | None = None,
+                host: str = '127.0.0.1', port: int = 5152) -> None:
+    """
+    Serve an ExplorationService as JSON lines over a Unix socket or TCP.
+
+    Each request line is an object with "op" (apply, expand, actions,
+    playout, metrics) and its arguments; an optional "id" is echoed back.
+    Requests on one connection run concurrently, so responses can arrive
+    out of order - match them by id.
+    """
+    ops = {
+        'apply': lambda r: service.apply(r['path'], r['action_id']),
+        'expand': lambda r: service.expand(r['path']),
+        'actions': lambda r: service.actions(r['path']),
+        'playout': lambda r: service.playout(r['path'], int(r.get('games', 1)), r.get('seed'),
+                                             int(r.get('max_actions', 1000)),
+                                             bool(r.get('stop_when_decided', False))),
+    }
+
+    async def handle(reader, writer):
+        write_lock = asyncio.Lock()
+
+        async def respond(request: dict):
+            response = {'id': request.get('id')}
+            try:
+                op = request.get('op')
+                if op == 'metrics':
+                    response['result'] = service.metrics()
+                elif op in ops:
+                    response['result'] = await ops[op](request)
+                else:
+                    response['error'] = f"Unknown op: {op}"
+            except KeyError as error:
+                response['error'] = f"Missing parameter: {error.args[0]}"
+            except (ValueError, FileNotFoundError) as error:
+                response['error'] = str(error)
+            except Exception as error:
+                # Anything else (unreadable state, crashed worker) still gets
+                # an answer, or the client would wait for this id forever
+                response['error'] = f"{type(error).__name__}: {error}"
+            async with write_lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        tasks = set()
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object")
+            except ValueError as error:   # Includes json.JSONDecodeError
+                async with write_lock:
+                    writer.write((json.dumps({'id': None, 'error': str(error)}) + "\n").encode())
+                continue
+            task = asyncio.create_task(respond(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        writer.close()
+
+    if socket_path:
+        server = await asyncio.start_unix_server(handle, path=socket_path)
+    else:
+        server = await asyncio.start_server(handle, host=host, port=port)
+
+    async with server:
+        await server.serve_forever()
@@ -9,10 +9,12 @@ from pathlib import Path
 from lib.core.store import StateStore
 from lib.core.memory_store import MemoryStore
 from lib.core.file_store import FileStore
-from lib.core.graph import can_edges, get_node_attr
+from lib.core.graph import get_node_attr
 from lib.core.outcome import backpropagate, find_seed_path
+from lib.core.transposition import TranspositionTable
 from lib.lorcana.state import LorcanaState
 from lib.lorcana.execute import execute_action
+from lib.lorcana.lore_race import forced_winner
 from lib.core.navigation import format_actions, Action
 
 
@@ -24,7 +26,8 @@ class GameSession:
     No filesystem I/O - all operations in memory.
     """
 
-    def __init__(self, initial_state: LorcanaState, store: StateStore = None, root_key: str = "root"):
+    def __init__(self, initial_state: LorcanaState, store: StateStore = None, root_key: str = "root",
+                 transpositions: TranspositionTable = None, stop_when_decided: bool = False):
         """
         Create game session from initial state.
 
@@ -32,22 +35,46 @@ class GameSession:
             initial_state: Starting game state
             store: Storage backend (defaults to MemoryStore)
             root_key: Key/path for root state (defaults to "root")
+            transpositions: Optional table mapping position hash -> first key
+                            that reached it. When set, transposed states are
+                            linked in the store instead of saved again.
+                            Canonical-mode states get a new table by
+                            default, since merging is the point of the mode.
+            stop_when_decided: Treat positions the lore race already decides
+                               (lib/lorcana/lore_race.py) as game over: the
+                               forced winner is recorded as the outcome and
+                               random play stops there.
         """
         self.store = store or MemoryStore()
         self.root_key = root_key
         self.current_key = self.root_key
+        if transpositions is None and initial_state.canonical:
+            transpositions = TranspositionTable()
+        self.transpositions = transpositions
+        self.stop_when_decided = stop_when_decided
+        # Key -> forced winner of decided positions (stop_when_decided only)
+        self._decided = {}
 
         # Save initial state
         self.store.save_state(initial_state, self.root_key, format_actions_fn=format_actions)
+        if self.transpositions is not None:
+            self.transpositions.setdefault(initial_state.zobrist_hash, self.root_key)
+        if self.stop_when_decided and not self._game_over(initial_state):
+            winner = forced_winner(initial_state)
+            if winner is not None:
+                self._decided[self.root_key] = winner
 
     @classmethod
-    def from_file(cls, path: Path | str, store: StateStore = None):
+    def from_file(cls, path: Path | str, store: StateStore = None,
+                  transpositions: TranspositionTable = None, stop_when_decided: bool = False):
         """
         Create session from existing file-based state.
 
         Args:
             path: Path to state directory
             store: Storage backend (defaults to MemoryStore)
+            transpositions: Optional transposition table (see __init__)
+            stop_when_decided: Stop at decided positions (see __init__)
 
         Returns:
             GameSession instance
@@ -56,7 +83,8 @@ class GameSession:
         store = store or MemoryStore()
         file_store = FileStore()
         state = file_store.load_state(path, LorcanaState)
-        return cls(state, store=store, root_key=str(path))
+        return cls(state, store=store, root_key=str(path), transpositions=transpositions,
+                   stop_when_decided=stop_when_decided)
 
     def get_state(self) -> LorcanaState:
         """Get current game state."""
@@ -70,7 +98,7 @@ class GameSession:
             List of Action objects
         """
         state = self.get_state()
-        return format_actions(state.graph)
+        return format_actions(state)
 
     def apply_action(self, action_id: str) -> bool:
         """
@@ -86,42 +114,62 @@ class GameSession:
         """
         state = self.get_state()
 
-        # Find matching action
-        for u, v, key, action_type, edge_action_id in can_edges(state.graph):
-            if edge_action_id == action_id:
-                # Execute action (mutates state)
-                execute_action(state, action_type, u, v)
+        # O(1) lookup by ID
+        action = state.get_action(action_id)
+        if action is None:
+            return False
 
-                # Save to new key
-                new_key = f"{self.current_key}/{action_id}"
-                self.store.save_state(state, new_key, format_actions_fn=format_actions)
+        # Execute action (mutates state)
+        execute_action(state, action.action_type, action.src, action.dst)
 
-                # Update current position
-                self.current_key = new_key
+        # Save to new key (or link to an equivalent stored position)
+        new_key = f"{self.current_key}/{action_id}"
+        canonical_key = new_key
+        if self.transpositions is not None:
+            canonical_key = self.transpositions.setdefault(state.zobrist_hash, new_key)
+        if canonical_key == new_key or not self.store.link_state(new_key, canonical_key):
+            self.store.save_state(state, new_key, format_actions_fn=format_actions)
 
-                # If game is over, save outcome and backpropagate
-                if get_node_attr(state.graph, 'game', 'game_over', '0') == '1':
-                    outcome_data = {
-                        'winner': get_node_attr(state.graph, 'game', 'winner', None),
-                        'p1_lore': int(get_node_attr(state.graph, 'p1', 'lore', '0')),
-                        'p2_lore': int(get_node_attr(state.graph, 'p2', 'lore', '0')),
-                    }
+        # Update current position
+        self.current_key = new_key
 
-                    self.store.save_outcome(new_key, None, outcome_data)
+        # If game is over (or decided), save outcome and backpropagate
+        if self._game_over(state):
+            self._save_outcome(new_key, state, get_node_attr(state.graph, 'game', 'winner', None))
+        elif self.stop_when_decided:
+            winner = forced_winner(state)
+            if winner is not None:
+                self._decided[new_key] = winner
+                self._save_outcome(new_key, state, winner, decided=True)
 
-                    seed_path = find_seed_path(new_key)
-                    if seed_path:
-                        backpropagate(new_key, seed_path,
-                            lambda parent, suffix: self.store.save_outcome(parent, suffix, outcome_data))
+        return True
 
-                return True
+    def is_transposition(self) -> bool:
+        """
+        Check if the current state was first reached via a different path.
 
-        return False
+        Searchers can skip expanding transposed states: their subtree is
+        already reachable from the canonical path. Always False without a
+        transposition table.
+        """
+        return self.canonical_key() != self.current_key
 
-    def is_game_over(self) -> bool:
-        """Check if current game is over."""
+    def canonical_key(self) -> str:
+        """Get the first key that reached the current position."""
+        if self.transpositions is None:
+            return self.current_key
         state = self.get_state()
-        return get_node_attr(state.graph, 'game', 'game_over', '0') == '1'
+        return self.transpositions.get(state.zobrist_hash, self.current_key)
+
+    def is_game_over(self) -> bool:
+        """Check if current game is over (or decided, with stop_when_decided)."""
+        if self.current_key in self._decided:
+            return True
+        return self._game_over(self.get_state())
+
+    def is_decided(self) -> bool:
+        """Check if the current position was stopped early as decided by the lore race."""
+        return self.current_key in self._decided
 
     def get_winner(self) -> str | None:
         """
@@ -130,6 +178,8 @@ class GameSession:
         Returns:
             Winner player node ("p1" or "p2"), or None if no winner yet
         """
+        if self.current_key in self._decided:
+            return self._decided[self.current_key]
         if not self.is_game_over():
             return None
         state = self.get_state()
@@ -171,7 +221,7 @@ class GameSession:
 
     def play_until_game_over(self, prefer_non_end: bool = True, max_actions: int = 1000) -> str:
         """
-        Play random actions until game ends.
+        Play random actions until game ends (or is decided, with stop_when_decided).
 
         Args:
             prefer_non_end: Prefer non-end actions when available
@@ -187,3 +237,26 @@ class GameSession:
                 break
 
         return self.get_path()
+
+    # ========== Internal Helpers ==========
+
+    @staticmethod
+    def _game_over(state: LorcanaState) -> bool:
+        return get_node_attr(state.graph, 'game', 'game_over', '0') == '1'
+
+    def _save_outcome(self, key: str, state: LorcanaState, winner: str | None, decided: bool = False) -> None:
+        """Save the outcome at key and backpropagate it to the seed."""
+        outcome_data = {
+            'winner': winner,
+            'p1_lore': int(get_node_attr(state.graph, 'p1', 'lore', '0')),
+            'p2_lore': int(get_node_attr(state.graph, 'p2', 'lore', '0')),
+        }
+        if decided:
+            outcome_data['decided'] = True
+
+        self.store.save_outcome(key, None, outcome_data)
+
+        seed_path = find_seed_path(key)
+        if seed_path:
+            backpropagate(key, seed_path,
+                lambda parent, suffix: self.store.save_outcome(parent, suffix, outcome_data))
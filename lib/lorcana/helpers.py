@@ -7,6 +7,10 @@ from typing import NamedTuple
 from lib.core.graph import edges_by_label, get_node_attr
 from lib.lorcana.cards import get_card_db
 
+# Zone sets used by mechanics' invalidation predicates
+HAND_ZONES = frozenset({"z.p1.hand", "z.p2.hand"})
+PLAY_ZONES = frozenset({"z.p1.play", "z.p2.play"})
+
 
 class ActionEdge(NamedTuple):
     """
@@ -0,0 +1,256 @@
+"""
+Lore-race bounds: how many turns each player needs to reach 20 lore.
+
+Lore only comes from questing and nothing takes it away, so a cheap look
+at the board brackets each player's race:
+    min_turns  no sooner than this, however the game goes: every character
+               in play quests every turn, and every character in hand (or
+               drawn, in deck order) is played as soon as it is drawn and
+               costs no more than the ink that player could have by then
+    max_turns  guaranteed, whatever the opponent does: the player quests
+               with what is already in play and plays nothing more, while
+               the opponent challenges the best exerted questers it could
+               reach (every character it has or could play challenges once
+               a turn, banishing any quester whose remaining willpower its
+               combined strength covers)
+
+Turns are counted in the player's own turns: 0 is the current turn for
+the player to move, the next one for the other player. None means the
+player decks out first (min_turns) or has no guaranteed race (max_turns).
+
+A position is decided when one player's guaranteed turn comes before the
+opponent's earliest possible one. Only the rules the engine implements
+are assumed (no card abilities), so the verdict is exact, not a guess:
+the solver prunes on it and playouts can stop there.
+
+    bounds = race_bounds(state)
+    if bounds.winner:
+        print(bounds.winner, "wins; p1 needs", bounds.p1.max_turns, "turns at most")
+"""
+from typing import NamedTuple
+
+from lib.core.graph import get_node_attr
+from lib.lorcana.cards import get_card_db, get_strength, get_willpower
+from lib.lorcana.helpers import get_card_data, get_player_zone
+from lib.lorcana.state import LorcanaState
+
+LORE_TO_WIN = 20
+
+
+class PlayerRace(NamedTuple):
+    """One player's race to 20 lore, in own turns from now."""
+    lore: int
+    min_turns: int | None   # Earliest possible turn (None: decks out first)
+    max_turns: int | None   # Guaranteed by this turn (None: no guarantee)
+
+
+class RaceBounds(NamedTuple):
+    """Both players' races and the decided winner, if any."""
+    p1: PlayerRace
+    p2: PlayerRace
+    winner: str | None      # Winner the race already decides ('p1'/'p2'), else None
+
+
+def race_bounds(state: LorcanaState) -> RaceBounds:
+    """Bound both players' turns to 20 lore (see module docstring)."""
+    mover = state.current_player
+    characters = {player: _characters(state, player) for player in ('p1', 'p2')}
+    plays = {player: _play_turns(state, player, player == mover) for player in ('p1', 'p2')}
+    races = {}
+    for player in ('p1', 'p2'):
+        opponent = 'p2' if player == 'p1' else 'p1'
+        moving = player == mover
+        lore = int(get_node_attr(state.graph, player, 'lore', '0'))
+        deck_size = len(_deck(state, player))
+        races[player] = PlayerRace(
+            lore,
+            _min_turns(lore, deck_size, moving, characters[player], plays[player]),
+            _max_turns(lore, deck_size, moving, characters[player], characters[opponent], plays[opponent]),
+        )
+
+    if get_node_attr(state.graph, 'game', 'game_over', '0') == '1':
+        winner = get_node_attr(state.graph, 'game', 'winner', None)
+    else:
+        winner = None
+        for player, opponent in (('p1', 'p2'), ('p2', 'p1')):
+            guaranteed = races[player].max_turns
+            earliest = races[opponent].min_turns
+            if guaranteed is None:
+                continue
+            # Turns alternate starting with the mover: the mover's turn k
+            # comes before the other player's turn k, not after it
+            if earliest is None or (guaranteed <= earliest if player == mover else guaranteed < earliest):
+                winner = player
+    return RaceBounds(races['p1'], races['p2'], winner)
+
+
+def forced_winner(state: LorcanaState) -> str | None:
+    """Winner already decided by the lore race (or the game), else None."""
+    return race_bounds(state).winner
+
+
+# ========== Internal Helpers ==========
+
+class _Character(NamedTuple):
+    lore: int
+    strength: int
+    remaining: int      # Willpower left after damage
+    exerted: bool
+    dry: bool           # Entered play before this turn
+
+
+def _characters(state: LorcanaState, player: str) -> list[_Character]:
+    turn = get_node_attr(state.graph, 'game', 'turn', '0')
+    characters = []
+    for card_node in state.cards_in(get_player_zone(player, 'play')):
+        data = get_card_data(state.graph, card_node)
+        if data['type'] != 'Character':
+            continue
+        characters.append(_Character(
+            data.get('lore', 0),
+            get_strength(state, card_node),
+            get_willpower(state, card_node) - int(get_node_attr(state.graph, card_node, 'damage', '0')),
+            get_node_attr(state.graph, card_node, 'exerted', '0') == '1',
+            get_node_attr(state.graph, card_node, 'entered_play', '-1') != turn,
+        ))
+    return characters
+
+
+def _deck(state: LorcanaState, player: str) -> list[str]:
+    return state.deck1_ids if player == 'p1' else state.deck2_ids
+
+
+def _decks_out(deck_size: int, moving: bool, turn: int) -> bool:
+    """Whether the player's own turn `turn` starts with a draw from an empty deck."""
+    # The mover has drawn for the current turn; the other player draws on each of theirs
+    draws = turn if moving else turn + 1
+    return draws > deck_size
+
+
+def _play_turns(state: LorcanaState, player: str, moving: bool) -> list[tuple[int, dict]]:
+    """
+    (earliest own turn it can be played, card data) for characters in hand or deck.
+
+    Optimistic: each card on its own, paid with all the ink the player
+    could have that turn (one more card inked every turn).
+    """
+    ink_total = int(get_node_attr(state.graph, player, 'ink_total', '0'))
+    if moving:
+        # Turn 0: what is left plus this turn's unused ink drop; turn k: ink_base + k
+        ink_drops = int(get_node_attr(state.graph, player, 'ink_drops', '0'))
+        ink_now = int(get_node_attr(state.graph, player, 'ink_available', '0')) + ink_drops
+        ink_base = ink_total + ink_drops
+    else:
+        # Turn k: ink_base + k (one ink drop per turn from turn 0)
+        ink_base = ink_total + 1
+        ink_now = ink_base
+
+    card_db = get_card_db()
+    cards = [(0, get_card_data(state.graph, card_node))
+             for card_node in state.cards_in(get_player_zone(player, 'hand'))]
+    first_draw = 1 if moving else 0
+    cards += [(first_draw + index, card_db[card_id.rsplit('.', 1)[0]])
+              for index, card_id in enumerate(_deck(state, player))]
+
+    result = []
+    for drawn, data in cards:
+        if data['type'] != 'Character':
+            continue
+        cost = data.get('cost', 0)
+        if drawn == 0 and cost <= ink_now:
+            turn = 0
+        else:
+            turn = max(drawn, cost - ink_base, first_draw)
+        result.append((turn, data))
+    return result
+
+
+def _min_turns(lore: int, deck_size: int, moving: bool, characters: list[_Character],
+               plays: list[tuple[int, dict]]) -> int | None:
+    """Earliest own turn the player can reach 20 lore."""
+    need = LORE_TO_WIN - lore
+    if need <= 0:
+        return 0
+
+    board = sum(c.lore for c in characters)
+    # Played on turn k, quests from turn k + 1
+    arriving = {}
+    for turn, data in plays:
+        arriving[turn + 1] = arriving.get(turn + 1, 0) + data.get('lore', 0)
+    last_arrival = max(arriving, default=0)
+
+    turn = 0
+    while not _decks_out(deck_size, moving, turn):
+        board += arriving.get(turn, 0)
+        if turn == 0 and moving:
+            gain = sum(c.lore for c in characters if not c.exerted and c.dry)
+        else:
+            gain = board
+        need -= gain
+        if need <= 0:
+            return turn
+        # Only the ready board counts on the mover's turn 0: exerted
+        # characters still quest from turn 1
+        if board == 0 and turn >= last_arrival:
+            return None
+        turn += 1
+    return None
+
+
+def _max_turns(lore: int, deck_size: int, moving: bool, characters: list[_Character],
+               foes: list[_Character], foe_plays: list[tuple[int, dict]]) -> int | None:
+    """Own turn by which the player reaches 20 lore whatever the opponent does."""
+    need = LORE_TO_WIN - lore
+    if need <= 0:
+        return 0
+
+    questers = [c for c in characters if c.lore > 0]
+    total = sum(c.lore for c in questers)
+    if moving:
+        # Quests now with the ready, dry ones; wet ones stay ready (unchallengeable)
+        exposed_first = [c for c in questers if c.exerted or c.dry]
+    else:
+        exposed_first = [c for c in questers if c.exerted]
+
+    # Opponent challengers, by opponent turn: those in play (on its current
+    # turn only the ready, dry ones), plus any played on an earlier turn
+    foes = [c for c in foes if c.strength > 0]
+    ready_now = [c for c in foes if not c.exerted and c.dry] if not moving else foes
+    joining = {}
+    for turn, data in foe_plays:
+        if data.get('strength', 0) > 0:
+            count, strength = joining.get(turn + 1, (0, 0))
+            joining[turn + 1] = (count + 1, strength + data['strength'])
+
+    challenges = 0      # Opponent challenges so far (each banishes at most one quester)
+    damage = 0          # Opponent strength so far (a quester needs its remaining willpower of it)
+    ready, ready_strength = len(ready_now), sum(c.strength for c in ready_now)
+    opponent_turn = 0
+    turn = 0
+    while not _decks_out(deck_size, moving, turn):
+        # Opponent turns before this one (0..turn-1 if moving, 0..turn otherwise)
+        while opponent_turn < (turn if moving else turn + 1):
+            if opponent_turn == 1:
+                ready, ready_strength = len(foes), sum(c.strength for c in foes)
+            count, strength = joining.get(opponent_turn, (0, 0))
+            ready += count
+            ready_strength += strength
+            challenges += ready
+            damage += ready_strength
+            opponent_turn += 1
+
+        if turn == 0 and moving:
+            gain = sum(c.lore for c in questers if not c.exerted and c.dry)
+        else:
+            exposed = exposed_first if opponent_turn <= 1 else questers
+            # Worst case: the best reachable questers are gone
+            banishable = sorted((c.lore for c in exposed if c.remaining <= damage), reverse=True)
+            gain = total - sum(banishable[:challenges])
+            if gain == 0:
+                # Never grows back: more challenges, more damage, more exposed
+                return None
+        need -= gain
+        if need <= 0:
+            return turn
+        turn += 1
+    return None
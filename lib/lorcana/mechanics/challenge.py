@@ -3,30 +3,25 @@ Challenge mechanic.
 
 Compute when characters can challenge, and execute the challenge action.
 """
-import networkx as nx
-from lib.core.graph import edges_by_label, get_node_attr
 from lib.lorcana.cards import get_strength
-from lib.lorcana.helpers import ActionEdge, get_game_context, get_card_data
+from lib.lorcana.helpers import ActionEdge, PLAY_ZONES
+from lib.lorcana.mechanics.registry import Mechanic, register_mechanic
+from lib.lorcana.snapshot import GameSnapshot
 
 
-def compute_can_challenge(G: nx.MultiDiGraph) -> list[ActionEdge]:
+def compute_can_challenge(snap: GameSnapshot) -> list[ActionEdge]:
     """Return CAN_CHALLENGE edges for valid challenges."""
     result = []
 
-    # Get game context
-    ctx = get_game_context(G)
-    if not ctx:
-        return result
+    # Characters in current player's play zone (potential challengers)
+    cards_in_play = snap.cards_in(snap.play_zone)
 
-    # Find characters in current player's play zone (potential challengers)
-    cards_in_play = [u for u, v, _ in edges_by_label(G, "IN") if v == ctx['play_zone']]
-
-    # Find exerted characters in opponent's play zone (potential targets)
-    opponent_cards = [u for u, v, _ in edges_by_label(G, "IN") if v == ctx['opponent_play_zone']]
+    # Characters in opponent's play zone (potential targets)
+    opponent_cards = snap.cards_in(snap.opponent_play_zone)
 
     # Check each potential challenger
     for challenger in cards_in_play:
-        card_data = get_card_data(G, challenger)
+        card_data = snap.card_data(challenger)
 
         # Only characters can challenge
         if card_data['type'] != 'Character':
@@ -37,24 +32,24 @@ def compute_can_challenge(G: nx.MultiDiGraph) -> list[ActionEdge]:
             continue
 
         # Must be ready (not exerted)
-        if get_node_attr(G, challenger, 'exerted', '0') == '1':
+        if snap.card_attr(challenger, 'exerted', '0') == '1':
             continue
 
         # Must be dry (entered play before this turn)
-        entered_play = int(get_node_attr(G, challenger, 'entered_play', '-1'))
-        if entered_play == ctx['current_turn']:
+        entered_play = int(snap.card_attr(challenger, 'entered_play', '-1'))
+        if entered_play == snap.current_turn:
             continue
 
         # Find valid targets (exerted opposing characters)
         for defender in opponent_cards:
-            defender_data = get_card_data(G, defender)
+            defender_data = snap.card_data(defender)
 
             # Only characters can be challenged
             if defender_data['type'] != 'Character':
                 continue
 
             # Must be exerted to be challenged
-            if get_node_attr(G, defender, 'exerted', '0') != '1':
+            if snap.card_attr(defender, 'exerted', '0') != '1':
                 continue
 
             # Valid challenge!
@@ -71,7 +66,7 @@ def compute_can_challenge(G: nx.MultiDiGraph) -> list[ActionEdge]:
 def execute_challenge(state, attacker: str, defender: str) -> None:
     """Execute challenge action: exert attacker, deal damage, check for banish."""
     # 1. Exert the attacker
-    state.graph.nodes[attacker]['exerted'] = '1'
+    state.exert(attacker)
 
     # 2. Get strength values for both characters
     attacker_strength = get_strength(state, attacker)
@@ -80,3 +75,11 @@ def execute_challenge(state, attacker: str, defender: str) -> None:
     # 3. Deal damage simultaneously
     state.damage_card(defender, attacker_strength)
     state.damage_card(attacker, defender_strength)
+
+
+register_mechanic(Mechanic(
+    action_type="CAN_CHALLENGE",
+    compute=compute_can_challenge,
+    execute=execute_challenge,
+    invalidated_by=lambda c: bool(c.zones & PLAY_ZONES),
+))
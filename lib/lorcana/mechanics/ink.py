@@ -3,35 +3,28 @@ Ink card mechanic.
 
 Compute when cards can be inked, and execute the ink action.
 """
-import networkx as nx
-from lib.core.graph import edges_by_label, get_node_attr
-from lib.lorcana.helpers import ActionEdge, get_game_context, get_card_data
+from lib.core.graph import get_node_attr
+from lib.lorcana.helpers import ActionEdge, HAND_ZONES
+from lib.lorcana.mechanics.registry import Mechanic, register_mechanic
+from lib.lorcana.snapshot import GameSnapshot
 
 
-def compute_can_ink(G: nx.MultiDiGraph) -> list[ActionEdge]:
+def compute_can_ink(snap: GameSnapshot) -> list[ActionEdge]:
     """Return CAN_INK edges for inkable cards in current player's hand."""
     result = []
 
-    # Get game context
-    ctx = get_game_context(G)
-    if not ctx:
-        return result
-
     # Check ink_drops > 0
-    ink_drops = int(get_node_attr(G, ctx['player'], 'ink_drops', 0))
+    ink_drops = int(get_node_attr(snap.graph, snap.player, 'ink_drops', 0))
     if ink_drops <= 0:
         return result
 
-    # Find cards IN hand
-    cards_in_hand = [u for u, v, _ in edges_by_label(G, "IN") if v == ctx['hand_zone']]
-
-    # Check each card for inkwell property
-    for card_node in cards_in_hand:
-        card_data = get_card_data(G, card_node)
+    # Check each card in hand for inkwell property
+    for card_node in snap.cards_in(snap.hand_zone):
+        card_data = snap.card_data(card_node)
         if card_data.get('inkwell', False):
             result.append(ActionEdge(
                 src=card_node,
-                dst=ctx['ink_zone'],
+                dst=snap.ink_zone,
                 action_type="CAN_INK",
                 description=f"ink:{card_node}"
             ))
@@ -44,15 +37,22 @@ def execute_ink(state, from_node: str, to_node: str) -> None:
     # Move card from hand to inkwell
     state.move_card(from_node, to_node)
 
-    # Get game context
-    ctx = get_game_context(state.graph)
+    player = state.current_player
 
     # Decrement ink_drops
-    ink_drops = int(get_node_attr(state.graph, ctx['player'], 'ink_drops', 1))
-    state.graph.nodes[ctx['player']]['ink_drops'] = str(ink_drops - 1)
+    ink_drops = int(get_node_attr(state.graph, player, 'ink_drops', 1))
+    state.set_attr(player, 'ink_drops', str(ink_drops - 1))
 
     # Increment ink_total and ink_available
-    ink_total = int(get_node_attr(state.graph, ctx['player'], 'ink_total', 0))
-    state.graph.nodes[ctx['player']]['ink_total'] = str(ink_total + 1)
-    ink_available = int(get_node_attr(state.graph, ctx['player'], 'ink_available', 0))
-    state.graph.nodes[ctx['player']]['ink_available'] = str(ink_available + 1)
+    ink_total = int(get_node_attr(state.graph, player, 'ink_total', 0))
+    state.set_attr(player, 'ink_total', str(ink_total + 1))
+    ink_available = int(get_node_attr(state.graph, player, 'ink_available', 0))
+    state.set_attr(player, 'ink_available', str(ink_available + 1))
+
+
+register_mechanic(Mechanic(
+    action_type="CAN_INK",
+    compute=compute_can_ink,
+    execute=execute_ink,
+    invalidated_by=lambda c: bool(c.zones & HAND_ZONES) or 'ink_drops' in c.counters,
+))
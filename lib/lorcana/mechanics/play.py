@@ -3,33 +3,26 @@ Play card mechanic.
 
 Compute when cards can be played, and execute the play action.
 """
-import networkx as nx
-from lib.core.graph import edges_by_label, get_node_attr
-from lib.lorcana.helpers import ActionEdge, get_game_context, get_card_data
+from lib.core.graph import get_node_attr
+from lib.lorcana.helpers import ActionEdge, HAND_ZONES, get_card_data
+from lib.lorcana.mechanics.registry import Mechanic, register_mechanic
+from lib.lorcana.snapshot import GameSnapshot
 
 
-def compute_can_play(G: nx.MultiDiGraph) -> list[ActionEdge]:
+def compute_can_play(snap: GameSnapshot) -> list[ActionEdge]:
     """Return CAN_PLAY edges for playable cards in current player's hand."""
     result = []
 
-    # Get game context
-    ctx = get_game_context(G)
-    if not ctx:
-        return result
-
     # Get ink_available
-    ink_available = int(get_node_attr(G, ctx['player'], 'ink_available', 0))
-
-    # Find cards IN hand
-    cards_in_hand = [u for u, v, _ in edges_by_label(G, "IN") if v == ctx['hand_zone']]
+    ink_available = int(get_node_attr(snap.graph, snap.player, 'ink_available', 0))
 
-    # Check each card for playability
-    for card_node in cards_in_hand:
-        card_data = get_card_data(G, card_node)
+    # Check each card in hand for playability
+    for card_node in snap.cards_in(snap.hand_zone):
+        card_data = snap.card_data(card_node)
         cost = card_data.get('cost', 0)
 
         if ink_available >= cost:
-            destination = ctx['discard_zone'] if card_data['type'] == "Action" else ctx['play_zone']
+            destination = snap.discard_zone if card_data['type'] == "Action" else snap.play_zone
             result.append(ActionEdge(
                 src=card_node,
                 dst=destination,
@@ -45,19 +38,25 @@ def execute_play(state, from_node: str, to_node: str) -> None:
     # Move card from hand to play/discard
     state.move_card(from_node, to_node)
 
-    # Get card data and game context
+    # Get card data and current player
     card_data = get_card_data(state.graph, from_node)
-    ctx = get_game_context(state.graph)
+    player = state.current_player
 
     # Spend ink
     cost = card_data['cost']
-    ink_available = int(get_node_attr(state.graph, ctx['player'], 'ink_available', 0))
-    state.graph.nodes[ctx['player']]['ink_available'] = str(ink_available - cost)
+    ink_available = int(get_node_attr(state.graph, player, 'ink_available', 0))
+    state.set_attr(player, 'ink_available', str(ink_available - cost))
 
     # If card entered play zone (not discard), track the turn
     zone_kind = get_node_attr(state.graph, to_node, 'kind', '')
     if zone_kind == 'play':
-        state.graph.nodes[from_node]['entered_play'] = str(ctx['current_turn'])
-        state.graph.nodes[from_node]['exerted'] = '0'
+        state.set_attr(from_node, 'entered_play', get_node_attr(state.graph, 'game', 'turn', '0'))
+        state.ready(from_node)
 
 
+register_mechanic(Mechanic(
+    action_type="CAN_PLAY",
+    compute=compute_can_play,
+    execute=execute_play,
+    invalidated_by=lambda c: bool(c.zones & HAND_ZONES) or 'ink_available' in c.counters,
+))
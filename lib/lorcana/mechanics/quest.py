@@ -3,26 +3,18 @@ Quest mechanic.
 
 Compute when characters can quest, and execute the quest action.
 """
-import networkx as nx
-from lib.core.graph import edges_by_label, get_node_attr
-from lib.lorcana.helpers import ActionEdge, get_game_context, get_card_data
+from lib.lorcana.helpers import ActionEdge, PLAY_ZONES, get_card_data
+from lib.lorcana.mechanics.registry import Mechanic, register_mechanic
+from lib.lorcana.snapshot import GameSnapshot
 
 
-def compute_can_quest(G: nx.MultiDiGraph) -> list[ActionEdge]:
+def compute_can_quest(snap: GameSnapshot) -> list[ActionEdge]:
     """Return CAN_QUEST edges for characters that can quest."""
     result = []
 
-    # Get game context
-    ctx = get_game_context(G)
-    if not ctx:
-        return result
-
-    # Find cards IN play
-    cards_in_play = [u for u, v, _ in edges_by_label(G, "IN") if v == ctx['play_zone']]
-
-    # Check each card for quest eligibility
-    for card_node in cards_in_play:
-        card_data = get_card_data(G, card_node)
+    # Check each card in play for quest eligibility
+    for card_node in snap.cards_in(snap.play_zone):
+        card_data = snap.card_data(card_node)
 
         # Only characters can quest
         if card_data['type'] != 'Character':
@@ -33,17 +25,17 @@ def compute_can_quest(G: nx.MultiDiGraph) -> list[ActionEdge]:
             continue
 
         # Must be ready (not exerted)
-        if get_node_attr(G, card_node, 'exerted', '0') == '1':
+        if snap.card_attr(card_node, 'exerted', '0') == '1':
             continue
 
         # Must be dry (entered play before this turn)
-        entered_play = int(get_node_attr(G, card_node, 'entered_play', '-1'))
-        if entered_play == ctx['current_turn']:
+        entered_play = int(snap.card_attr(card_node, 'entered_play', '-1'))
+        if entered_play == snap.current_turn:
             continue
 
         result.append(ActionEdge(
             src=card_node,
-            dst=ctx['player'],
+            dst=snap.player,
             action_type="CAN_QUEST",
             description=f"quest:{card_node}"
         ))
@@ -54,9 +46,17 @@ def compute_can_quest(G: nx.MultiDiGraph) -> list[ActionEdge]:
 def execute_quest(state, from_node: str, to_node: str) -> None:
     """Execute quest action: exert card, add lore to player."""
     # Exert the card
-    state.graph.nodes[from_node]['exerted'] = '1'
+    state.exert(from_node)
 
     # Get lore value and add to player (checks win condition)
     card_data = get_card_data(state.graph, from_node)
     lore_value = card_data['lore']
     state.add_lore(to_node, lore_value)
+
+
+register_mechanic(Mechanic(
+    action_type="CAN_QUEST",
+    compute=compute_can_quest,
+    execute=execute_quest,
+    invalidated_by=lambda c: bool(c.zones & PLAY_ZONES),
+))
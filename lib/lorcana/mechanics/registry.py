@@ -0,0 +1,64 @@
+"""
+Mechanic interface and registry.
+
+A mechanic pairs "when is this legal?" with "what does it do?" for one
+action type. compute_all and execute_action work off this registry, so a
+new mechanic only needs to register itself:
+
+    register_mechanic(Mechanic(
+        action_type="CAN_X",
+        compute=compute_can_x,      # (snap: GameSnapshot) -> list[ActionEdge]
+        execute=execute_x,          # (state, src, dst) -> None
+        invalidated_by=lambda c: bool(c.zones & PLAY_ZONES),
+    ))
+
+invalidated_by receives the StateChanges recorded since the last compute
+and returns True when the mechanic's cached actions are stale. Any turn or
+step change invalidates every mechanic. The default recomputes after
+every action.
+
+Registered compute/execute functions are wrapped for lib.core.instrument
+(mechanic.compute.CAN_X / mechanic.execute.CAN_X).
+"""
+from typing import Callable, NamedTuple
+from lib.core.instrument import instrumented
+
+
+def _always(changes) -> bool:
+    return True
+
+
+class Mechanic(NamedTuple):
+    """A registered game mechanic for one action type."""
+    action_type: str                          # Edge action_type (CAN_X)
+    compute: Callable                         # compute(snap) -> list[ActionEdge]
+    execute: Callable                         # execute(state, src, dst)
+    invalidated_by: Callable = _always        # invalidated_by(changes) -> bool
+
+
+_MECHANICS: dict[str, Mechanic] = {}
+
+
+def register_mechanic(mechanic: Mechanic) -> Mechanic:
+    """
+    Register (or replace) the mechanic for its action type.
+
+    Returns:
+        The mechanic, so modules can keep a reference
+    """
+    mechanic = mechanic._replace(
+        compute=instrumented(f"mechanic.compute.{mechanic.action_type}")(mechanic.compute),
+        execute=instrumented(f"mechanic.execute.{mechanic.action_type}")(mechanic.execute),
+    )
+    _MECHANICS[mechanic.action_type] = mechanic
+    return mechanic
+
+
+def get_mechanics() -> list[Mechanic]:
+    """All registered mechanics, in registration order."""
+    return list(_MECHANICS.values())
+
+
+def get_mechanic(action_type: str) -> Mechanic | None:
+    """Mechanic for an action type, or None if unregistered."""
+    return _MECHANICS.get(action_type)
@@ -4,27 +4,18 @@ Turn structure mechanic.
 Handles turn phases and player switching.
 Steps: ready -> set -> draw -> main -> end
 """
-import networkx as nx
-from lib.core.graph import edges_by_label, get_node_attr
-from lib.lorcana.helpers import ActionEdge, get_game_context, get_player_zone, get_player_step
+from lib.core.graph import get_node_attr
+from lib.lorcana.helpers import ActionEdge, get_player_zone, get_player_step
+from lib.lorcana.mechanics.registry import Mechanic, register_mechanic
+from lib.lorcana.snapshot import GameSnapshot
 
 
-def compute_can_pass(G: nx.MultiDiGraph) -> list[ActionEdge]:
+def compute_can_pass(snap: GameSnapshot) -> list[ActionEdge]:
     """Return CAN_PASS edge for current player during main step."""
-    ctx = get_game_context(G)
-
-    # Find current step via CURRENT_STEP edge
-    current_step_edges = edges_by_label(G, "CURRENT_STEP")
-    if not current_step_edges or not ctx:
-        return []
-
-    _, current_step_node, _ = current_step_edges[0]
-
     # Can only pass during main step
-    step_type = get_node_attr(G, current_step_node, 'step', '')
-    if step_type == 'main':
+    if snap.step == 'main':
         return [ActionEdge(
-            src=ctx['player'],
+            src=snap.player,
             dst='game',
             action_type="CAN_PASS",
             description="end"
@@ -37,14 +28,14 @@ def advance_turn(state, from_node: str, to_node: str) -> None:
     Advance turn through steps: main -> end -> (switch) -> ready -> set -> draw -> main.
 
     Called when player passes during main step.
-    Moves CURRENT_STEP edge through step sequence.
+    Moves CURRENT_STEP edge through step sequence. Uses the state's
+    current player/step fields, so the cost is proportional to the cards
+    being readied and drawn rather than the graph size.
     """
-    # Get current player
-    turn_edges = edges_by_label(state.graph, "CURRENT_TURN")
-    if not turn_edges:
+    current_player = state.current_player
+    if current_player is None:
         return
 
-    game, current_player, turn_key = turn_edges[0]
     other_player = "p2" if current_player == "p1" else "p1"
 
     # Sequence: p1.main -> p1.end -> [switch] -> p2.ready -> p2.set -> p2.draw -> p2.main
@@ -54,34 +45,26 @@ def advance_turn(state, from_node: str, to_node: str) -> None:
     _end_step(state, current_player)
 
     # Switch players
-    state.graph.remove_edge(game, current_player, turn_key)
-    state.graph.add_edge(game, other_player, label="CURRENT_TURN")
+    state.set_current_player(other_player)
     turn = int(get_node_attr(state.graph, 'game', 'turn', 0))
-    state.graph.nodes['game']['turn'] = str(turn + 1)
+    state.set_attr('game', 'turn', str(turn + 1))
 
     # Move through new player's steps: ready -> set -> draw -> main
-    _move_to_step(state, get_player_step(other_player, 'ready'))
-    _ready_step(state, other_player)
+    _start_turn(state, other_player)
 
-    _move_to_step(state, get_player_step(other_player, 'set'))
-    _set_step(state, other_player)
 
-    _move_to_step(state, get_player_step(other_player, 'draw'))
-    _draw_step(state, other_player)
+def _start_turn(state, player: str) -> None:
+    """Fused ready -> set -> draw -> main transition for the new active player."""
+    for step, step_fn in (('ready', _ready_step), ('set', _set_step), ('draw', _draw_step)):
+        _move_to_step(state, get_player_step(player, step))
+        step_fn(state, player)
 
-    _move_to_step(state, get_player_step(other_player, 'main'))
+    _move_to_step(state, get_player_step(player, 'main'))
 
 
 def _move_to_step(state, step_node: str) -> None:
     """Move CURRENT_STEP edge to a new step node."""
-    # Remove old CURRENT_STEP edge
-    step_edges = edges_by_label(state.graph, "CURRENT_STEP")
-    if step_edges:
-        game, old_step, key = step_edges[0]
-        state.graph.remove_edge(game, old_step, key)
-
-    # Add new CURRENT_STEP edge
-    state.graph.add_edge('game', step_node, label="CURRENT_STEP")
+    state.set_current_step(step_node)
 
 
 def _end_step(state, player: str) -> None:
@@ -92,20 +75,20 @@ def _end_step(state, player: str) -> None:
 def _ready_step(state, player: str) -> None:
     """Ready step: Ready all cards in play for the new active player."""
     play_zone = get_player_zone(player, 'play')
-    cards_in_play = [u for u, v, _ in edges_by_label(state.graph, "IN") if v == play_zone]
 
-    for card_node in cards_in_play:
-        state.graph.nodes[card_node]['exerted'] = '0'
+    for card_node in state.cards_in(play_zone):
+        if get_node_attr(state.graph, card_node, 'exerted', '0') == '1':
+            state.ready(card_node)
 
 
 def _set_step(state, player: str) -> None:
     """Set step: Refill ink and reset ink drops."""
     # Give player 1 ink drop for this turn
-    state.graph.nodes[player]['ink_drops'] = '1'
+    state.set_attr(player, 'ink_drops', '1')
 
     # Refresh ink_available to match ink_total
     ink_total = int(get_node_attr(state.graph, player, 'ink_total', 0))
-    state.graph.nodes[player]['ink_available'] = str(ink_total)
+    state.set_attr(player, 'ink_available', str(ink_total))
 
 
 def _draw_step(state, player: str) -> None:
@@ -123,9 +106,18 @@ def _draw_step(state, player: str) -> None:
     if len(deck) == 0:
         # Lose by deck-out
         other_player = "p2" if player == "p1" else "p1"
-        state.graph.nodes['game']['winner'] = other_player
-        state.graph.nodes['game']['game_over'] = '1'
+        state.set_attr('game', 'winner', other_player)
+        state.set_attr('game', 'game_over', '1')
         return
 
     # Draw 1 card
     state.draw(player_num, count=1)
+
+
+register_mechanic(Mechanic(
+    action_type="CAN_PASS",
+    compute=compute_can_pass,
+    execute=advance_turn,
+    # Only legal in main step: changes with turn/step, which invalidate all
+    invalidated_by=lambda c: False,
+))
@@ -0,0 +1,163 @@
+"""
+Opening-hand enumeration for hand-spec seeds.
+
+A hand-spec seed (xxxxxxx.xxxxxxx.xx) names each player's 7 starting
+cards by unique-card index in the decklist. Specs listing the same indices
+in another order deal the same hands, so the distinct openings of a
+matchup are pairs of index multisets - one canonical seed (sorted indices)
+per pair.
+
+Each hand has a natural probability: the chance that a uniformly shuffled
+deck opens with it (multivariate hypergeometric). Openings can be listed
+in index order, most probable first, or sampled (by probability or
+uniformly over distinct pairs).
+
+    deck1, deck2 = matchup_decklists("output/b013")
+    for opening in enumerate_openings(deck1, deck2, by_probability=True, limit=100):
+        print(opening.seed, opening.probability)
+"""
+import heapq
+import random
+import re
+from itertools import islice, product
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from lib.core.seed import MAX_INDEX, format_seed, hand_multisets, hand_probability
+from lib.lorcana.setup import DECK1_SOURCE, DECK2_SOURCE, Decklist, parse_decklist
+
+HAND_SIZE = 7
+
+
+class Opening(NamedTuple):
+    """A distinct pair of opening hands."""
+    seed: str              # Canonical hand-spec seed (sorted indices)
+    probability: float     # Chance both shuffled decks open with these hands
+
+
+def matchup_decklists(matchdir: str | Path) -> tuple[Decklist, Decklist]:
+    """Both players' decklists as copied into the matchup directory by init_game."""
+    matchdir = Path(matchdir)
+    return parse_decklist(matchdir / DECK1_SOURCE), parse_decklist(matchdir / DECK2_SOURCE)
+
+
+def deck_copies(decklist: Decklist) -> list[int]:
+    """
+    Copies of each unique card, by hand-spec index.
+
+    Raises:
+        ValueError: If the deck has more unique cards than a seed character can address
+    """
+    names = [name for count, name in decklist.entries]
+    if len(names) > MAX_INDEX + 1:
+        raise ValueError(f"Deck has {len(names)} unique cards; hand-spec seeds address {MAX_INDEX + 1}")
+    return [len(decklist.card_ids[name]) for name in names]
+
+
+def opening_hands(decklist: Decklist, by_probability: bool = False) -> list[tuple[tuple[int, ...], float]]:
+    """
+    Every distinct opening hand of one deck with its probability.
+
+    Args:
+        decklist: Parsed decklist
+        by_probability: Most probable first (ties in index order); default index order
+    """
+    copies = deck_copies(decklist)
+    hands = [(hand, hand_probability(hand, copies)) for hand in hand_multisets(copies, HAND_SIZE)]
+    if by_probability:
+        hands.sort(key=lambda item: -item[1])   # Stable: ties stay in index order
+    return hands
+
+
+def count_openings(deck1: Decklist, deck2: Decklist) -> dict:
+    """Distinct hands per player and distinct pairs (without listing the pairs)."""
+    p1 = sum(1 for _ in hand_multisets(deck_copies(deck1), HAND_SIZE))
+    p2 = sum(1 for _ in hand_multisets(deck_copies(deck2), HAND_SIZE))
+    return {'p1_hands': p1, 'p2_hands': p2, 'pairs': p1 * p2}
+
+
+def enumerate_openings(deck1: Decklist, deck2: Decklist, suffix: str = "aa",
+                       by_probability: bool = False, limit: int | None = None) -> Iterator[Opening]:
+    """
+    Distinct opening-hand pairs as canonical seeds.
+
+    Args:
+        deck1, deck2: Parsed decklists
+        suffix: Seed suffix (2 lowercase letters) for every seed
+        by_probability: Most probable pairs first; default index order
+        limit: Stop after this many
+
+    Raises:
+        ValueError: If suffix is invalid
+    """
+    _check_suffix(suffix)   # Before the first seed is asked for
+    hands1 = opening_hands(deck1, by_probability)
+    hands2 = opening_hands(deck2, by_probability)
+    pairs = _pairs_by_probability(hands1, hands2) if by_probability else product(hands1, hands2)
+
+    return (Opening(format_seed(hand1, hand2, suffix), prob1 * prob2)
+            for (hand1, prob1), (hand2, prob2) in islice(pairs, limit))
+
+
+def sample_openings(deck1: Decklist, deck2: Decklist, n: int, suffix: str = "aa",
+                    weighted: bool = True, rng: random.Random | None = None) -> list[Opening]:
+    """
+    Up to n distinct opening pairs drawn at random.
+
+    Args:
+        deck1, deck2: Parsed decklists
+        n: Distinct pairs wanted
+        suffix: Seed suffix (2 lowercase letters) for every seed
+        weighted: Draw pairs by natural probability (shuffle and deal);
+                  otherwise uniformly over distinct pairs
+        rng: Random source (default: a fresh unseeded one)
+
+    Returns:
+        Openings in draw order (fewer than n if the draws keep repeating,
+        as with weighted sampling of most of a small space)
+    """
+    _check_suffix(suffix)
+    rng = rng or random.Random()
+    copies1, copies2 = deck_copies(deck1), deck_copies(deck2)
+
+    if weighted:
+        cards1 = [index for index, count in enumerate(copies1) for _ in range(count)]
+        cards2 = [index for index, count in enumerate(copies2) for _ in range(count)]
+        draw = lambda: (tuple(sorted(rng.sample(cards1, HAND_SIZE))), tuple(sorted(rng.sample(cards2, HAND_SIZE))))
+    else:
+        hands1 = list(hand_multisets(copies1, HAND_SIZE))
+        hands2 = list(hand_multisets(copies2, HAND_SIZE))
+        draw = lambda: (rng.choice(hands1), rng.choice(hands2))
+
+    seen = {}
+    attempts = 0
+    while len(seen) < n and attempts < n * 50:
+        attempts += 1
+        pair = draw()
+        if pair not in seen:
+            seen[pair] = Opening(format_seed(pair[0], pair[1], suffix),
+                                 hand_probability(pair[0], copies1) * hand_probability(pair[1], copies2))
+    return list(seen.values())
+
+
+# ========== Internal Helpers ==========
+
+def _pairs_by_probability(hands1: list, hands2: list) -> Iterator[tuple]:
+    """Pairs of two probability-sorted lists, by product of probabilities (best first)."""
+    if not hands1 or not hands2:
+        return
+    heap = [(-hands1[0][1] * hands2[0][1], 0, 0)]
+    queued = {(0, 0)}
+    while heap:
+        _, i, j = heapq.heappop(heap)
+        yield hands1[i], hands2[j]
+        for a, b in ((i + 1, j), (i, j + 1)):
+            if a < len(hands1) and b < len(hands2) and (a, b) not in queued:
+                queued.add((a, b))
+                heapq.heappush(heap, (-hands1[a][1] * hands2[b][1], a, b))
+
+
+def _check_suffix(suffix: str) -> None:
+    # Two lowercase letters: what find_seed_path recognizes
+    if not re.fullmatch(r'[a-z]{2}', suffix):
+        raise ValueError(f"Seed suffix must be 2 lowercase letters, got {suffix!r}")
@@ -0,0 +1,143 @@
+"""
+Long-lived rules service.
+
+Keeps the card DB, a FileStore and its hot states in memory across
+requests, so navigating costs an in-memory replay instead of Python
+startup plus DOT parsing. Transport-agnostic: bin/rules-server.py exposes
+it over localhost HTTP or a Unix socket.
+"""
+import random
+import threading
+import time
+from pathlib import Path
+from lib.core.file_store import FileStore
+from lib.core.graph import get_node_attr
+from lib.core.navigation import format_actions
+from lib.core.transposition import TranspositionTable
+from lib.lorcana.cards import get_card_db
+from lib.lorcana.execute import apply_action_at_path
+from lib.lorcana.game_api import GameSession
+from lib.lorcana.state import LorcanaState
+
+
+class RulesService:
+    """
+    rules-engine operations against a persistent store.
+
+    Calls are serialized with a lock (FileStore and the global RNG used by
+    playouts are not thread-safe); each one is still a single in-memory
+    operation, so the lock is held briefly.
+    """
+
+    def __init__(self, max_cached: int = 4096):
+        """
+        Args:
+            max_cached: Hot states kept in the FileStore cache (LRU)
+        """
+        self.store = FileStore(max_cached=max_cached)
+        self._lock = threading.Lock()
+
+        # Positions this service has stored, so canonical-mode transpositions
+        # are linked rather than saved again (play and persisted playouts)
+        self.transpositions = TranspositionTable()
+
+        # Load the card DB once, up front
+        get_card_db()
+
+    def show(self, path: Path | str) -> list[dict]:
+        """Actions listed in a state's actions.txt (like `rules-engine.py show`)."""
+        return self.store.get_actions(Path(path))
+
+    def play(self, path: Path | str, checkpoints: set[int] | None = None) -> dict:
+        """
+        Navigate to a state, replaying from the nearest stored ancestor if needed.
+
+        Returns:
+            dict with path, plies replayed, player summary and actions
+        """
+        path = Path(path)
+        with self._lock:
+            plies = apply_action_at_path(path, store=self.store, checkpoints=checkpoints,
+                                         transpositions=self.transpositions)
+            state = self.store.load_state(path, LorcanaState)
+        return self._summary(path, state, plies)
+
+    def apply(self, path: Path | str, action_id: str) -> dict:
+        """Apply one action from a state (play of path/action_id)."""
+        return self.play(Path(path) / str(action_id))
+
+    def actions(self, path: Path | str) -> list[dict]:
+        """Legal actions of a stored state, computed from the in-memory state."""
+        with self._lock:
+            state = self.store.load_state(Path(path), LorcanaState)
+        return [a._asdict() for a in format_actions(state)]
+
+    def playout(self, path: Path | str, games: int = 1, seed: int | None = None,
+                prefer_non_end: bool = True, max_actions: int = 1000, persist: bool = False,
+                stop_when_decided: bool = False) -> dict:
+        """
+        Play random games from a state.
+
+        Args:
+            path: Starting state directory
+            games: Number of games
+            seed: RNG seed (reproducible playouts)
+            prefer_non_end: Only pass when nothing else is legal
+            max_actions: Per-game action limit
+            persist: Write the games to the filesystem (like play-random.py);
+                     by default they stay in memory
+            stop_when_decided: End games once the lore race decides them
+                               (the forced winner is recorded)
+
+        Returns:
+            dict with per-game results (path, winner, plies, decided) and totals
+        """
+        path = Path(path)
+        with self._lock:
+            root = self.store.load_state(path, LorcanaState)
+            # In memory, a canonical session brings its own table (GameSession)
+            transpositions = self.transpositions if persist and root.canonical else None
+            session = GameSession(root, store=self.store if persist else None, root_key=str(path),
+                                  transpositions=transpositions, stop_when_decided=stop_when_decided)
+            if seed is not None:
+                random.seed(seed)
+
+            start = time.perf_counter()
+            results = []
+            for _ in range(games):
+                session.reset()
+                final_path = session.play_until_game_over(prefer_non_end, max_actions)
+                results.append({
+                    'path': final_path,
+                    'winner': session.get_winner(),
+                    'plies': final_path.count('/'),
+                    'decided': session.is_decided(),
+                })
+            elapsed = time.perf_counter() - start
+
+        wins = {}
+        for result in results:
+            wins[result['winner']] = wins.get(result['winner'], 0) + 1
+        return {'games': results, 'wins': wins, 'elapsed_ms': round(elapsed * 1000, 3)}
+
+    # ========== Internal Helpers ==========
+
+    def _summary(self, path: Path, state: LorcanaState, plies: int) -> dict:
+        """Player status and actions, as printed by `rules-engine.py play`."""
+        players = {}
+        for player in ('p1', 'p2'):
+            players[player] = {
+                'lore': int(get_node_attr(state.graph, player, 'lore', '0')),
+                'ink_available': int(get_node_attr(state.graph, player, 'ink_available', '0')),
+                'ink_total': int(get_node_attr(state.graph, player, 'ink_total', '0')),
+            }
+
+        return {
+            'path': str(path),
+            'plies_replayed': plies,
+            'current_player': state.current_player,
+            'game_over': get_node_attr(state.graph, 'game', 'game_over', '0') == '1',
+            'winner': get_node_attr(state.graph, 'game', 'winner', None),
+            'players': players,
+            'actions': self.store.get_actions(path),
+        }
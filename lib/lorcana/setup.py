@@ -1,14 +1,19 @@
 """
 Lorcana game setup - initialization and shuffling.
 """
+import copy
 import hashlib
+import os
 import random
 import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 from lib.core.graph import load_dot, save_dot
 from lib.core.file_store import FileStore
+from lib.core.store import StateStore
 from lib.core.seed import parse_seed
 from lib.core.navigation import format_actions
 from lib.lorcana.cards import get_card_db
@@ -24,14 +29,20 @@ def normalize_card_name(name: str) -> str:
     return name.lower().replace(' - ', '_').replace(' ', '_').replace('-', '_')
 
 
-def build_deck(deck_txt: Path) -> list[str]:
+class Decklist(NamedTuple):
+    """A parsed decklist with its card instance IDs."""
+    entries: list[tuple[int, str]]   # (count, card name) per line, in file order
+    card_ids: dict[str, list[str]]   # card name -> instance IDs (name.a, name.b, ...)
+
+
+def parse_decklist(deck_txt: Path) -> Decklist:
     """
-    Build unshuffled deck from decklist.
+    Parse a decklist file (format: "4 Tinker Bell - Giant Fairy" per line).
 
     Returns:
-        List of 60 card IDs in decklist order
+        Decklist; parse once and reuse it for every shuffle
     """
-    cards = []
+    entries = []
     with open(deck_txt) as f:
         for line in f:
             line = line.strip()
@@ -39,16 +50,24 @@ def build_deck(deck_txt: Path) -> list[str]:
                 continue
             match = re.match(r"(\d+)\s+(.+)", line)
             if match:
-                cards.append((int(match.group(1)), match.group(2).strip()))
+                entries.append((int(match.group(1)), match.group(2).strip()))
 
-    deck = []
-    for count, name in cards:
+    card_ids = {}
+    for count, name in entries:
         base = normalize_card_name(name)
-        for i in range(count):
-            suffix = chr(ord('a') + i)
-            deck.append(f"{base}.{suffix}")
+        card_ids[name] = [f"{base}.{chr(ord('a') + i)}" for i in range(count)]
+
+    return Decklist(entries, card_ids)
 
-    return deck
+
+def build_deck(deck_txt: Path) -> list[str]:
+    """
+    Build unshuffled deck from decklist.
+
+    Returns:
+        List of 60 card IDs in decklist order
+    """
+    return [card_id for ids in parse_decklist(deck_txt).card_ids.values() for card_id in ids]
 
 
 def build_shuffled_deck(deck_txt: Path, shuffle_seed: str, hand_indices: list[int] | None = None) -> list[str]:
@@ -64,36 +83,27 @@ def build_shuffled_deck(deck_txt: Path, shuffle_seed: str, hand_indices: list[in
     Returns:
         List of 60 card IDs (top 7 become hand)
     """
-    # Parse decklist
-    cards = []
-    with open(deck_txt) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            match = re.match(r"(\d+)\s+(.+)", line)
-            if match:
-                cards.append((int(match.group(1)), match.group(2).strip()))
+    return shuffle_decklist(parse_decklist(deck_txt), shuffle_seed, hand_indices)
 
-    # Build card map
-    card_map = {}
-    for count, name in cards:
-        base = normalize_card_name(name)
-        card_map[name] = []
-        for i in range(count):
-            suffix = chr(ord('a') + i)
-            card_map[name].append(f"{base}.{suffix}")
 
+def shuffle_decklist(decklist: Decklist, shuffle_seed: str, hand_indices: list[int] | None = None) -> list[str]:
+    """
+    Shuffle a parsed decklist (see build_shuffled_deck).
+
+    Returns:
+        List of 60 card IDs (top 7 become hand)
+    """
     rng = random.Random(shuffle_seed)
 
     if hand_indices is None:
         # True random shuffle
-        deck = [card_id for ids in card_map.values() for card_id in ids]
+        deck = [card_id for ids in decklist.card_ids.values() for card_id in ids]
         rng.shuffle(deck)
         return deck
 
     # Hand-spec mode: specific cards go to hand first
-    unique_cards = [name for count, name in cards]
+    card_map = {name: list(ids) for name, ids in decklist.card_ids.items()}
+    unique_cards = [name for count, name in decklist.entries]
     hand_cards = []
     for idx in hand_indices:
         if idx >= len(unique_cards):
@@ -141,10 +151,11 @@ def init_game(deck1_txt: str | Path, deck2_txt: str | Path) -> str:
     shutil.copy(deck2_txt, matchdir / DECK2_SOURCE)
 
     # Compute initial legal actions
-    compute_all(G)
+    state = LorcanaState(G, [], [])
+    compute_all(state)
 
     # Save initial game state
-    save_dot(G, matchdir / "game.dot")
+    save_dot(state.export_graph(), matchdir / "game.dot")
 
     return matchup_hash
 
@@ -157,7 +168,7 @@ def _generate_matchup_hash(deck1: Path, deck2: Path) -> str:
     return hashlib.md5(combined.encode()).hexdigest()[:4]
 
 
-def shuffle_and_draw(matchdir: str | Path, seed: str) -> str:
+def shuffle_and_draw(matchdir: str | Path, seed: str, canonical: bool = False) -> str:
     """
     Shuffle decks and draw starting hands (7 cards each).
 
@@ -166,47 +177,143 @@ def shuffle_and_draw(matchdir: str | Path, seed: str) -> str:
     - deck2.dek (53 cards remaining)
     - game.dot (14 cards in hands)
 
+    For many seeds of one matchup, use shuffle_many (parses and loads once).
+
     Args:
         matchdir: Matchup directory (e.g., "output/b013")
         seed: Either a simple seed string (true random shuffle)
               or hand-spec format (xxxxxxx.xxxxxxx.xx)
+        canonical: Enable symmetry reduction for the whole game tree
+                   (identical card copies collapse into one action/hash)
 
     Returns:
         Seed (for display)
     """
     matchdir = Path(matchdir)
-    store = FileStore()
-
-    # Load parent state
-    parent = store.load_state(matchdir, LorcanaState)
-
-    # Build shuffled decks from .txt files
-    deck1_txt = matchdir / DECK1_SOURCE
-    deck2_txt = matchdir / DECK2_SOURCE
-
-    if '.' in seed:
-        # Hand-spec format
-        hand_spec = parse_seed(seed)
-        if not hand_spec:
-            raise ValueError(f"Invalid hand-spec seed format: {seed}")
-        deck1_ids = build_shuffled_deck(deck1_txt, seed, hand_spec['p1_hand'])
-        deck2_ids = build_shuffled_deck(deck2_txt, seed, hand_spec['p2_hand'])
+    state = SeedBuilder(matchdir).build(seed, canonical=canonical)
+    FileStore().save_state(state, matchdir / seed, format_actions_fn=format_actions)
+    return seed
+
+
+class SeedBuilder:
+    """
+    Builds seed root states for one matchup.
+
+    The matchup state and both decklists are loaded once, so each seed only
+    costs a shuffle, the opening draws and one compute_all.
+    """
+
+    def __init__(self, matchdir: str | Path):
+        """
+        Args:
+            matchdir: Matchup directory (e.g., "output/b013")
+        """
+        self.matchdir = Path(matchdir)
+        self.parent = FileStore(max_cached=0).load_state(self.matchdir, LorcanaState)
+        self.deck1 = parse_decklist(self.matchdir / DECK1_SOURCE)
+        self.deck2 = parse_decklist(self.matchdir / DECK2_SOURCE)
+
+    def build(self, seed: str, canonical: bool = False) -> LorcanaState:
+        """
+        Seed root state: shuffled decks, starting hands drawn, legal actions computed.
+
+        Args:
+            seed: Simple seed string or hand-spec (see shuffle_and_draw)
+            canonical: Enable symmetry reduction (see shuffle_and_draw)
+
+        Raises:
+            ValueError: If a hand-spec seed is malformed or asks for cards the deck lacks
+        """
+        if '.' in seed:
+            # Hand-spec format
+            hand_spec = parse_seed(seed)
+            if not hand_spec:
+                raise ValueError(f"Invalid hand-spec seed format: {seed}")
+            deck1_ids = shuffle_decklist(self.deck1, seed, hand_spec['p1_hand'])
+            deck2_ids = shuffle_decklist(self.deck2, seed, hand_spec['p2_hand'])
+        else:
+            # Simple seed - true random shuffle
+            deck1_ids = shuffle_decklist(self.deck1, seed + "_p1")
+            deck2_ids = shuffle_decklist(self.deck2, seed + "_p2")
+
+        # Create new state with decks (on a copy of the matchup graph)
+        state = LorcanaState(copy.deepcopy(self.parent.graph), deck1_ids, deck2_ids)
+        if canonical:
+            state.set_attr('game', 'canonical', '1')
+
+        # Draw hands
+        state.draw(player=1, count=7)
+        state.draw(player=2, count=7)
+
+        # Recompute legal actions
+        compute_all(state)
+        return state
+
+
+def shuffle_many(matchdir: str | Path, seeds: list[str], store: StateStore | None = None,
+                 workers: int | None = None, canonical: bool = False) -> dict:
+    """
+    Create many seed roots for one matchup in one process (plus workers).
+
+    Seed roots are saved at <matchdir>/<seed> (the store key for other
+    stores). Seeds already in the store are skipped, so an interrupted
+    run can be repeated.
+
+    With a FileStore (the default) each worker process builds and writes
+    its own seeds. Other stores can't be shared across processes: workers
+    build the states and this process saves them as they arrive.
+
+    Args:
+        matchdir: Matchup directory (e.g., "output/b013")
+        seeds: Seed strings (simple or hand-spec)
+        store: Destination store (default: FileStore)
+        workers: Worker processes (default: CPU count; 1 = no pool)
+        canonical: Enable symmetry reduction (see shuffle_and_draw)
+
+    Returns:
+        dict with created (seeds written, in order), skipped (already stored)
+
+    Raises:
+        ValueError: On the first invalid hand-spec seed
+    """
+    matchdir = Path(matchdir)
+    store = store or FileStore()
+    todo, skipped = [], []
+    for seed in dict.fromkeys(seeds):   # Unique, in order
+        (skipped if store.state_exists(matchdir / seed) else todo).append(seed)
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    writes_in_workers = isinstance(store, FileStore)
+
+    if workers <= 1:
+        builder = SeedBuilder(matchdir)
+        for seed in todo:
+            store.save_state(builder.build(seed, canonical), matchdir / seed, format_actions_fn=format_actions)
     else:
-        # Simple seed - true random shuffle
-        deck1_ids = build_shuffled_deck(deck1_txt, seed + "_p1")
-        deck2_ids = build_shuffled_deck(deck2_txt, seed + "_p2")
+        chunksize = max(1, len(todo) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_seed_worker,
+                                 initargs=(str(matchdir), canonical, writes_in_workers)) as pool:
+            for seed, state in zip(todo, pool.map(_build_seed, todo, chunksize=chunksize)):
+                if state is not None:
+                    store.save_state(state, matchdir / seed, format_actions_fn=format_actions)
 
-    # Create new state with decks
-    state = LorcanaState(parent.graph, deck1_ids, deck2_ids)
+    return {'created': todo, 'skipped': skipped}
 
-    # Draw hands
-    state.draw(player=1, count=7)
-    state.draw(player=2, count=7)
 
-    # Recompute legal actions
-    compute_all(state.graph)
+# Per-process builder for shuffle_many workers (matchup and decklists loaded once)
+_WORKER_SEEDS = None
 
-    # Save to seed path
-    store.save_state(state, matchdir / seed, format_actions_fn=format_actions)
 
-    return seed
+def _init_seed_worker(matchdir: str, canonical: bool, save: bool) -> None:
+    global _WORKER_SEEDS
+    _WORKER_SEEDS = (SeedBuilder(matchdir), canonical, FileStore(max_cached=0) if save else None)
+
+
+def _build_seed(seed: str) -> LorcanaState | None:
+    """Process pool entry point for shuffle_many: the state, or None if saved here."""
+    builder, canonical, store = _WORKER_SEEDS
+    state = builder.build(seed, canonical)
+    if store is None:
+        return state
+    store.save_state(state, builder.matchdir / seed, format_actions_fn=format_actions)
+    return None
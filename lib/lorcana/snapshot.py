@@ -0,0 +1,90 @@
+"""
+Per-state snapshot shared by all mechanics.
+
+compute_all builds one GameSnapshot per state in a single pass over the
+graph and hands it to every mechanic's compute function, instead of each
+mechanic re-scanning edges for CURRENT_TURN, CURRENT_STEP and IN.
+"""
+import networkx as nx
+from lib.core.graph import get_node_attr
+from lib.lorcana.helpers import get_card_data, get_player_zone
+
+
+class GameSnapshot:
+    """
+    Read-only view of a state: current player/step and zone contents.
+
+    Attributes:
+        graph: The game graph (for attributes not captured here)
+        player: Current player ID ("p1" or "p2")
+        opponent: Opponent player ID
+        current_turn: Turn number (int)
+        step: Current step type ("ready", "set", "draw", "main", "end")
+        play_zone, opponent_play_zone, hand_zone, ink_zone, discard_zone:
+            Zone node IDs, as in get_game_context
+    """
+
+    def __init__(self, G: nx.MultiDiGraph, player: str, step_node: str | None, zones: dict[str, list[str]]):
+        self.graph = G
+        self.player = player
+        self.opponent = "p2" if player == "p1" else "p1"
+        self.current_turn = int(get_node_attr(G, 'game', 'turn', 0))
+        self.step = get_node_attr(G, step_node, 'step', '') if step_node else ''
+
+        self.play_zone = get_player_zone(player, 'play')
+        self.opponent_play_zone = get_player_zone(self.opponent, 'play')
+        self.hand_zone = get_player_zone(player, 'hand')
+        self.ink_zone = get_player_zone(player, 'ink')
+        self.discard_zone = get_player_zone(player, 'discard')
+
+        self._zones = zones
+        self._card_data = {}
+
+    @classmethod
+    def from_graph(cls, G: nx.MultiDiGraph):
+        """
+        Build a snapshot with one pass over the graph's edges.
+
+        Returns:
+            GameSnapshot, or None if there is no current player
+        """
+        player = None
+        step_node = None
+        zones = {}
+
+        for u, v, data in G.edges(data=True):
+            label = data.get("label")
+            if label is None:
+                continue
+            if isinstance(label, str):
+                label = label.strip('"')
+            if label == "IN":
+                zones.setdefault(v, []).append(u)
+            elif label == "CURRENT_TURN":
+                player = v
+            elif label == "CURRENT_STEP":
+                step_node = v
+
+        if player is None:
+            return None
+        return cls(G, player, step_node, zones)
+
+    def cards_in(self, zone: str) -> list[str]:
+        """Cards IN a zone (empty list if none)."""
+        return self._zones.get(zone, [])
+
+    def zones(self) -> dict[str, list[str]]:
+        """All non-empty zones: zone node -> cards IN it."""
+        return self._zones
+
+    def card_data(self, card_node: str) -> dict:
+        """Card database entry for a card node (memoized per snapshot)."""
+        data = self._card_data.get(card_node)
+        if data is None:
+            data = get_card_data(self.graph, card_node)
+            self._card_data[card_node] = data
+        return data
+
+    def card_attr(self, card_node: str, attr: str, default=None):
+        """Card node attribute (exerted, damage, entered_play), quotes stripped."""
+        return get_node_attr(self.graph, card_node, attr, default)
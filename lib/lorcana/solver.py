@@ -0,0 +1,370 @@
+"""
+Perfect-information endgame solver.
+
+Once the decks are shuffled nothing is hidden or random: deck order is
+part of the state, so a position has an exact game-theoretic value. The
+solver runs depth-limited minimax with alpha-beta pruning from player 1's
+point of view:
+    WIN - k    player 1 wins in k plies whatever player 2 does
+    -(WIN - k) player 2 wins in k plies
+    0          not decided within the search depth
+
+With lore_bounds, positions the lore race already decides (see
+lib/lorcana/lore_race.py) are leaves worth DECIDED - k: proven, but the
+distance to the end of the game is unknown, so exact wins still rank
+above them and such results report no plies.
+
+A search that returns a win value is a proof: positions beyond the depth
+count as 0, so a nonzero value holds however they turn out. Values are
+relative to the node they belong to, so transposition table entries are
+reusable wherever the position recurs.
+
+Iterative deepening (depth 1, 2, ...) stops at the first proof, which is
+then the shortest forced win, or when a time or node budget runs out (the
+last completed depth is returned). Each iteration orders moves by the
+previous one's best move (from the transposition table), then winning
+quests, other quests, lethal challenges, plays, ink, other challenges and
+passing last.
+
+solve_parallel splits the root: each legal action is solved in its own
+worker process (own table), and the results are combined.
+"""
+import copy
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, NamedTuple
+
+from lib.core.graph import get_node_attr
+from lib.core.transposition import TranspositionTable
+from lib.lorcana.cards import get_strength, get_willpower
+from lib.lorcana.execute import execute_action
+from lib.lorcana.helpers import get_card_data
+from lib.lorcana.lore_race import forced_winner
+from lib.lorcana.state import LorcanaState
+
+# Value of a win at the node itself (a win k plies away is WIN - k)
+WIN = 1_000_000
+# Value of a position won by the lore race (distance to the end unknown)
+DECIDED = WIN // 2
+_INF = float('inf')
+
+# Transposition table bound types
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+# Deadline/budget is checked every this many nodes
+_CHECK_EVERY = 256
+
+
+class SolveResult(NamedTuple):
+    """Outcome of a solve."""
+    winner: str | None      # Proven winner ('p1'/'p2'), None if undecided at this depth
+    value: int              # Player 1's point of view (see module docstring)
+    plies: int | None       # Plies to the end of the game along line, if proven exactly
+    line: list[str]         # Best line found (action IDs from the root)
+    depth: int              # Deepest fully searched depth
+    nodes: int              # Positions visited
+    tt_hits: int            # Transposition table hits
+    seconds: float
+    complete: bool          # False if the budget ran out before max_depth or a proof
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class _Budget(Exception):
+    """Time or node budget exhausted (abandons the current iteration)."""
+
+
+class Solver:
+    """
+    Alpha-beta search with a transposition table and iterative deepening.
+
+        result = Solver(max_depth=30, time_limit=60).solve(state)
+        if result.winner:
+            print(result.winner, "wins in", result.plies, "plies:", result.line)
+    """
+
+    def __init__(self, max_depth: int = 40, time_limit: float | None = None,
+                 node_limit: int | None = None, table: TranspositionTable | None = None,
+                 should_stop: Callable[[], bool] | None = None, lore_bounds: bool = False):
+        """
+        Args:
+            max_depth: Deepest iteration, in plies (actions)
+            time_limit: Seconds before giving up (keeps the last completed depth)
+            node_limit: Positions before giving up
+            table: Transposition table (new one by default; entries are
+                   (depth, value, bound, best action ID, line))
+            should_stop: Polled with the budget; True gives up like a timeout
+            lore_bounds: Stop at positions the lore race decides (value
+                         DECIDED: the winner is exact, the distance is not)
+        """
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.table = table if table is not None else TranspositionTable()
+        self.should_stop = should_stop
+        self.lore_bounds = lore_bounds
+        self.nodes = 0
+        self._deadline = None
+
+    def solve(self, state: LorcanaState) -> SolveResult:
+        """Solve a position (not modified) by iterative deepening."""
+        start = time.perf_counter()
+        self.nodes = 0
+        self._deadline = start + self.time_limit if self.time_limit else None
+
+        value, line, depth = 0, [], 0
+        complete = True
+        if _winner(state) is not None:
+            value = _terminal_value(state)
+        else:
+            for iteration in range(1, self.max_depth + 1):
+                try:
+                    value, line = self._search(state, iteration, -_INF, _INF)
+                except _Budget:
+                    complete = False
+                    break
+                depth = iteration
+                if value != 0:
+                    break
+
+        return _result(value, line, depth, self.nodes, self.table.hits,
+                       time.perf_counter() - start, complete)
+
+    def _search(self, state: LorcanaState, depth: int, alpha: float, beta: float) -> tuple[int, list[str]]:
+        """Node-relative value and best line of state, searched depth plies deep."""
+        self.nodes += 1
+        if self.nodes % _CHECK_EVERY == 0:
+            self._check_budget()
+
+        if _winner(state) is not None:
+            return _terminal_value(state), []
+        if self.lore_bounds:
+            decided = forced_winner(state)
+            if decided is not None:
+                return (DECIDED if decided == 'p1' else -DECIDED), []
+        if depth == 0 or not state.actions:
+            return 0, []
+
+        key = state.zobrist_hash
+        entry = self.table.get(key)
+        best_move = None
+        if entry is not None:
+            entry_depth, entry_value, bound, best_move, entry_line = entry
+            proven = bound == _EXACT and entry_value != 0   # Proofs hold at any depth
+            if entry_depth >= depth or proven:
+                if bound == _EXACT:
+                    return entry_value, entry_line
+                if bound == _LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value, [best_move] if best_move is not None else []
+
+        maximizing = state.current_player == 'p1'
+        original_alpha, original_beta = alpha, beta
+        best = -_INF if maximizing else _INF
+        best_line = []
+
+        for action_id, action in order_actions(state, best_move):
+            child = copy.deepcopy(state)
+            execute_action(child, action.action_type, action.src, action.dst)
+            child_value, child_line = self._search(child, depth - 1, _unstep(alpha), _unstep(beta))
+            value = _step(child_value)
+
+            if (value > best) if maximizing else (value < best):
+                best = value
+                best_line = [action_id] + child_line
+            if maximizing:
+                alpha = max(alpha, best)
+            else:
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+
+        if best <= original_alpha:
+            bound = _UPPER
+        elif best >= original_beta:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        self.table.put(key, (depth, best, bound, best_line[0] if best_line else None,
+                             best_line if bound == _EXACT else []))
+        return best, best_line
+
+    def _check_budget(self) -> None:
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _Budget()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise _Budget()
+        if self.should_stop is not None and self.should_stop():
+            raise _Budget()
+
+
+def solve(state: LorcanaState, max_depth: int = 40, time_limit: float | None = None,
+          node_limit: int | None = None, lore_bounds: bool = False) -> SolveResult:
+    """Solve a position with a fresh Solver (see Solver.__init__)."""
+    return Solver(max_depth, time_limit, node_limit, lore_bounds=lore_bounds).solve(state)
+
+
+def solve_parallel(state: LorcanaState, workers: int | None = None, max_depth: int = 40,
+                   time_limit: float | None = None, node_limit: int | None = None,
+                   lore_bounds: bool = False) -> SolveResult:
+    """
+    Root split: solve each legal action's position in its own process.
+
+    Workers don't share tables or bounds, so this searches more nodes than
+    solve() in total but finishes sooner on several cores. Once one action
+    is proven to win for the player to move, the other workers stop.
+
+    Args:
+        workers: Worker processes (default: CPU count)
+        max_depth, time_limit, node_limit, lore_bounds: Per child (see Solver.__init__)
+    """
+    start = time.perf_counter()
+    if (_winner(state) is not None or not state.actions or max_depth < 1
+            or (lore_bounds and forced_winner(state) is not None)):
+        return Solver(max_depth, time_limit, node_limit, lore_bounds=lore_bounds).solve(state)
+
+    maximizing = state.current_player == 'p1'
+    results = {}
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(stop,)) as pool:
+        pending = {}
+        for action_id, action in order_actions(state):
+            child = copy.deepcopy(state)
+            execute_action(child, action.action_type, action.src, action.dst)
+            pending[pool.submit(_solve_child, child, max_depth - 1, time_limit, node_limit,
+                                lore_bounds)] = action_id
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            # A proven win for the player to move decides the root
+            if any(r.value != 0 and (r.value > 0) == maximizing for r in results.values()):
+                stop.set()
+                for future in pending:
+                    future.cancel()
+                break
+
+    # Best child for the player to move (ties: first in move order)
+    order = [action_id for action_id, _ in order_actions(state)]
+    best_id = None
+    for action_id in sorted(results, key=order.index):
+        value = _step(results[action_id].value)
+        if best_id is None or ((value > _step(results[best_id].value)) if maximizing
+                               else (value < _step(results[best_id].value))):
+            best_id = action_id
+
+    best = results[best_id]
+    value = _step(best.value)
+    decided = value != 0 and (len(results) == len(order) or (value > 0) == maximizing)
+    # Depth every undecided child was searched to (proven children are final)
+    open_depths = [r.depth for r in results.values() if r.value == 0]
+    depth = 1 + (min(open_depths) if open_depths else max(r.depth for r in results.values()))
+    return _result(value if decided else 0, [best_id] + best.line, depth,
+                   1 + sum(r.nodes for r in results.values()),
+                   sum(r.tt_hits for r in results.values()),
+                   time.perf_counter() - start,
+                   all(r.complete for r in results.values()))
+
+
+def order_actions(state: LorcanaState, first: str | None = None) -> list[tuple[str, object]]:
+    """
+    Legal actions as (action ID, ActionEdge), most promising first.
+
+    Args:
+        first: Action ID to put in front (e.g. the best move of a shallower search)
+    """
+    player_lore = int(get_node_attr(state.graph, state.current_player, 'lore', '0'))
+    scored = []
+    for index, action in enumerate(state.actions):
+        action_id = str(index)
+        if action_id == first:
+            rank = (-1, 0)
+        else:
+            rank = _rank(state, action, player_lore)
+        scored.append((rank, index, action_id, action))
+    scored.sort(key=lambda item: (item[0], item[1]))
+    return [(action_id, action) for _, _, action_id, action in scored]
+
+
+# ========== Internal Helpers ==========
+
+# Set in solve_parallel workers: the root's stop signal
+_WORKER_STOP = None
+
+
+def _init_worker(stop) -> None:
+    global _WORKER_STOP
+    _WORKER_STOP = stop
+
+
+def _solve_child(state: LorcanaState, max_depth: int, time_limit: float | None,
+                 node_limit: int | None, lore_bounds: bool) -> SolveResult:
+    """Process pool entry point for solve_parallel."""
+    return Solver(max_depth, time_limit, node_limit, should_stop=_WORKER_STOP.is_set,
+                  lore_bounds=lore_bounds).solve(state)
+
+
+def _rank(state: LorcanaState, action, player_lore: int) -> tuple[int, int]:
+    """(move class, tiebreak) - lower sorts first."""
+    kind = action.action_type
+    if kind == 'CAN_QUEST':
+        lore = get_card_data(state.graph, action.src).get('lore', 0)
+        return (0 if player_lore + lore >= 20 else 1, -lore)
+    if kind == 'CAN_CHALLENGE':
+        remaining = get_willpower(state, action.dst) - int(get_node_attr(state.graph, action.dst, 'damage', '0'))
+        if get_strength(state, action.src) >= remaining:
+            # Banishing the best quester first
+            return (2, -get_card_data(state.graph, action.dst).get('lore', 0))
+        return (5, 0)
+    if kind == 'CAN_PLAY':
+        return (3, 0)
+    if kind == 'CAN_INK':
+        return (4, 0)
+    if kind == 'CAN_PASS':
+        return (7, 0)
+    return (6, 0)
+
+
+def _winner(state: LorcanaState) -> str | None:
+    if get_node_attr(state.graph, 'game', 'game_over', '0') != '1':
+        return None
+    return get_node_attr(state.graph, 'game', 'winner', None)
+
+
+def _terminal_value(state: LorcanaState) -> int:
+    return WIN if _winner(state) == 'p1' else -WIN
+
+
+def _step(value: float) -> float:
+    """Child value -> parent value (a win one ply further away)."""
+    if value > 0:
+        return value - 1
+    if value < 0:
+        return value + 1
+    return value
+
+
+def _unstep(bound: float) -> float:
+    """Parent bound -> child bound (inverse of _step, so cutoffs are unchanged)."""
+    if bound > 0:
+        return bound + 1
+    if bound < 0:
+        return bound - 1
+    return bound
+
+
+def _result(value: int, line: list[str], depth: int, nodes: int, tt_hits: int,
+            seconds: float, complete: bool) -> SolveResult:
+    winner = None
+    plies = None
+    if value != 0:
+        winner = 'p1' if value > 0 else 'p2'
+        if abs(value) > DECIDED:
+            plies = WIN - abs(value)
+    return SolveResult(winner, int(value), plies, line, depth, nodes, tt_hits, seconds, complete)
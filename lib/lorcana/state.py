@@ -4,10 +4,43 @@ LorcanaState - pure game state with Lorcana-specific operations.
 No filesystem knowledge. Just graph + game logic.
 Persistence handled separately in lib/core/persistence.py
 """
+import copy
 import networkx as nx
-from lib.core.graph import get_node_attr
+from lib.core.graph import can_edges, get_edge_attr, get_node_attr
+from lib.core.instrument import instrumented
+from lib.core.zobrist import HASH_MASK, zobrist_key
 from lib.lorcana.cards import get_card_db
-from lib.lorcana.helpers import get_player_zone
+from lib.lorcana.helpers import ActionEdge, get_player_zone
+
+# Edge labels that carry game position (hashed as edge -> target)
+_HASHED_EDGES = ("CURRENT_TURN", "CURRENT_STEP")
+
+
+class StateChanges:
+    """
+    What changed since legal actions were last computed.
+
+    Filled in by LorcanaState operations, consumed and cleared by
+    compute_all to decide which action families need recomputing.
+    """
+
+    def __init__(self):
+        self.zones = set()     # Zones whose contents or cards' status changed
+        self.counters = set()  # Player attributes changed (ink_drops, lore, ...)
+        self.turn = False      # Game attributes or CURRENT_TURN/STEP changed
+
+    def clear(self):
+        """Reset after actions have been recomputed."""
+        self.zones.clear()
+        self.counters.clear()
+        self.turn = False
+
+    def __deepcopy__(self, memo):
+        clone = StateChanges()
+        clone.zones = set(self.zones)
+        clone.counters = set(self.counters)
+        clone.turn = self.turn
+        return clone
 
 
 class LorcanaState:
@@ -15,12 +48,18 @@ class LorcanaState:
     Pure Lorcana game state - graph + decks + game operations.
 
     This is where ALL Lorcana game logic lives. Persistence is separate.
+
+    Mutations should go through the operations below (not raw graph writes)
+    so the incremental Zobrist hash stays in sync with the graph.
     """
 
     def __init__(self, graph: nx.MultiDiGraph, deck1_ids: list[str], deck2_ids: list[str]):
         """
         Create state from components.
 
+        CAN_* edges in the graph (e.g. loaded from DOT) are moved into
+        self.actions; the in-memory graph only holds the position.
+
         Args:
             graph: NetworkX MultiDiGraph representing game state
             deck1_ids: List of card IDs remaining in P1's deck
@@ -30,6 +69,98 @@ class LorcanaState:
         self.deck1_ids = deck1_ids
         self.deck2_ids = deck2_ids
 
+        # Legal actions, index = action ID (set by compute_all)
+        self.actions = self._take_action_edges()
+
+        # Mirrors of the CURRENT_TURN / CURRENT_STEP edges (kept in sync by
+        # set_current_player / set_current_step) so turn logic never scans
+        self.current_player = self._game_edge_target("CURRENT_TURN")
+        self.current_step = self._game_edge_target("CURRENT_STEP")
+
+        # Zobrist hash, computed on first access then updated incrementally
+        self._hash = None
+        self._canonical = False
+
+        # Derived caches maintained by compute_all (not part of the position)
+        self.changes = StateChanges()
+        self.action_cache = None   # action_type -> list[ActionEdge]
+
+        # Cards whose damage or willpower changed since state-based effects
+        # last ran (only these can have become lethal)
+        self.dirty_cards = set()
+
+    @instrumented("state.deepcopy")
+    def __deepcopy__(self, memo):
+        """
+        Deep copy the position; share immutable cached data.
+
+        Stores copy states on every load/save, so cached ActionEdge tuples
+        are shared rather than rebuilt element by element.
+        """
+        cls = self.__class__
+        clone = cls.__new__(cls)
+        clone.__dict__.update(self.__dict__)
+        clone.graph = copy.deepcopy(self.graph, memo)
+        clone.deck1_ids = list(self.deck1_ids)
+        clone.deck2_ids = list(self.deck2_ids)
+        clone.changes = copy.deepcopy(self.changes, memo)
+        clone.actions = list(self.actions)
+        if self.action_cache is not None:
+            clone.action_cache = dict(self.action_cache)
+        clone.dirty_cards = set(self.dirty_cards)
+        return clone
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bit position hash.
+
+        Covers card zones and status, player counters, turn/step and deck
+        order. Action edges are derived data and are not hashed.
+
+        In canonical mode (game node canonical="1") card copies are keyed
+        by name without the copy suffix, so states that differ only by
+        which copy of a card is where hash equal.
+        """
+        if self._hash is None:
+            self._hash = self._compute_hash()
+        return self._hash
+
+    @property
+    def canonical(self) -> bool:
+        """Canonical mode (game node canonical="1"): identical card copies collapse."""
+        return get_node_attr(self.graph, 'game', 'canonical', '0') == '1'
+
+    # ========== Legal Actions ==========
+
+    def get_action(self, action_id: str | int) -> ActionEdge | None:
+        """
+        Look up a legal action by ID in O(1).
+
+        Returns:
+            ActionEdge, or None if the ID is not a legal action
+        """
+        try:
+            index = int(action_id)
+        except (TypeError, ValueError):
+            return None
+        if 0 <= index < len(self.actions):
+            return self.actions[index]
+        return None
+
+    def export_graph(self) -> nx.MultiDiGraph:
+        """
+        Graph with legal actions materialized as CAN_* edges.
+
+        Used when saving DOT so game.dot stays self-documenting. The
+        in-memory graph never carries action edges.
+        """
+        G = self.graph.copy()
+        for idx, edge in enumerate(self.actions):
+            G.add_edge(edge.src, edge.dst, action_type=edge.action_type,
+                       action_id=str(idx), description=edge.description)
+        return G
+
     # ========== Game Operations ==========
 
     def draw(self, player: int, count: int = 1):
@@ -46,9 +177,12 @@ class LorcanaState:
         hand_zone = get_player_zone(f"p{player}", 'hand')
 
         # Draw cards
-        for card_id in deck_ids[:count]:
+        for i, card_id in enumerate(deck_ids[:count]):
+            self._update_hash(-1, *self._deck_feature(player, card_id, len(deck_ids) - 1 - i))
             node_id = self._create_card_node(card_id, player)
             self.graph.add_edge(node_id, hand_zone, label="IN")
+            self._update_card_hash(+1, node_id)
+            self.changes.zones.add(hand_zone)
 
         # Update deck state
         remaining = deck_ids[count:]
@@ -59,11 +193,53 @@ class LorcanaState:
 
     def exert(self, card_node: str):
         """Set card to exerted state."""
-        self.graph.nodes[card_node]['exerted'] = '1'
+        self.set_attr(card_node, 'exerted', '1')
 
     def ready(self, card_node: str):
         """Set card to ready state."""
-        self.graph.nodes[card_node]['exerted'] = '0'
+        self.set_attr(card_node, 'exerted', '0')
+
+    def set_attr(self, node: str, attr: str, value: str):
+        """
+        Set a node attribute, keeping the hash in sync.
+
+        Use instead of writing G.nodes[node][attr] directly in game logic.
+        """
+        data = self.graph.nodes[node]
+        is_card = _clean(data.get('type')) == 'Card'
+
+        if is_card:
+            self._update_card_hash(-1, node)
+        elif attr in data:
+            self._update_hash(-1, 'attr', node, attr, _clean(data[attr]))
+
+        data[attr] = value
+
+        if is_card:
+            self._update_card_hash(+1, node)
+            self.changes.zones.add(self.card_zone(node))
+            if attr == 'damage':
+                self.dirty_cards.add(node)
+        else:
+            self._update_hash(+1, 'attr', node, attr, _clean(value))
+            if node == 'game':
+                self.changes.turn = True
+            else:
+                self.changes.counters.add(attr)
+
+        # Switching hash mode changes every card key: recompute lazily
+        if node == 'game' and attr == 'canonical':
+            self._hash = None
+
+    def set_current_player(self, player: str):
+        """Point the CURRENT_TURN edge at a player."""
+        self._move_game_edge("CURRENT_TURN", self.current_player, player)
+        self.current_player = player
+
+    def set_current_step(self, step_node: str):
+        """Point the CURRENT_STEP edge at a step node."""
+        self._move_game_edge("CURRENT_STEP", self.current_step, step_node)
+        self.current_step = step_node
 
     def add_lore(self, player: str, amount: int):
         """
@@ -73,12 +249,12 @@ class LorcanaState:
         """
         current = int(get_node_attr(self.graph, player, 'lore', '0'))
         new_lore = current + amount
-        self.graph.nodes[player]['lore'] = str(new_lore)
+        self.set_attr(player, 'lore', str(new_lore))
 
         # Check win condition
         if new_lore >= 20:
-            self.graph.nodes['game']['winner'] = player
-            self.graph.nodes['game']['game_over'] = '1'
+            self.set_attr('game', 'winner', player)
+            self.set_attr('game', 'game_over', '1')
 
     def move_card(self, card_node: str, to_zone: str):
         """
@@ -86,6 +262,8 @@ class LorcanaState:
 
         Removes old IN edge, adds new IN edge.
         """
+        self._update_card_hash(-1, card_node)
+
         # Remove existing IN edges
         to_remove = []
         for u, v, key, data in self.graph.edges(card_node, keys=True, data=True):
@@ -94,17 +272,132 @@ class LorcanaState:
 
         for edge in to_remove:
             self.graph.remove_edge(*edge)
+            self.changes.zones.add(edge[1])
 
         # Add new IN edge
         self.graph.add_edge(card_node, to_zone, label="IN")
+        self.changes.zones.add(to_zone)
+
+        self._update_card_hash(+1, card_node)
 
     def damage_card(self, card_node: str, amount: int):
         """Deal damage to card."""
         current = int(self.graph.nodes[card_node].get('damage', 0))
-        self.graph.nodes[card_node]['damage'] = str(current + amount)
+        self.set_attr(card_node, 'damage', str(current + amount))
+
+    def mark_stats_changed(self, card_node: str):
+        """
+        Flag a card for the next state-based effects check.
+
+        Damage changes are flagged automatically. Future effects that lower
+        willpower must call this for each card they modify.
+        """
+        self.dirty_cards.add(card_node)
+
+    def cards_in(self, zone: str) -> list[str]:
+        """Cards IN a zone. O(zone size) via the zone's in-edges, no graph scan."""
+        return [u for u, _, data in self.graph.in_edges(zone, data=True)
+                if _clean(data.get('label')) == 'IN']
+
+    def card_zone(self, card_node: str) -> str:
+        """Zone a card is IN ('' if none). O(card's edges), no graph scan."""
+        for _, v, data in self.graph.edges(card_node, data=True):
+            if _clean(data.get('label')) == 'IN':
+                return v
+        return ''
 
     # ========== Internal Helpers ==========
 
+    def _take_action_edges(self) -> list[ActionEdge]:
+        """Remove CAN_* edges from the graph, returning them in ID order."""
+        found = can_edges(self.graph)
+        actions = [None] * len(found)
+
+        for u, v, key, action_type, action_id in found:
+            description = get_edge_attr(self.graph, u, v, key, "description", action_type.lower())
+            actions[int(action_id)] = ActionEdge(src=u, dst=v, action_type=action_type, description=description)
+            self.graph.remove_edge(u, v, key)
+
+        return actions
+
+    def _game_edge_target(self, label: str) -> str | None:
+        """Target of the game node's edge with this label (None if absent)."""
+        if 'game' not in self.graph:
+            return None
+        for _, v, data in self.graph.edges('game', data=True):
+            if _clean(data.get('label')) == label:
+                return v
+        return None
+
+    def _move_game_edge(self, label: str, old_target: str | None, target: str):
+        """Replace the game node's single edge with this label."""
+        if old_target is not None:
+            # Only look at edges between game and the known old target
+            for key, data in list(self.graph.get_edge_data('game', old_target, default={}).items()):
+                if _clean(data.get('label')) == label:
+                    self.graph.remove_edge('game', old_target, key)
+                    self._update_hash(-1, label, old_target)
+
+        self.graph.add_edge('game', target, label=label)
+        self._update_hash(+1, label, target)
+        self.changes.turn = True
+
+    def _update_hash(self, sign: int, *feature):
+        """Add (+1) or remove (-1) a feature key (no-op until hash is used)."""
+        if self._hash is not None:
+            self._hash = (self._hash + sign * zobrist_key(*feature)) & HASH_MASK
+
+    def _update_card_hash(self, sign: int, card_node: str):
+        """Add (+1) or remove (-1) a card's current signature."""
+        if self._hash is not None:
+            self._update_hash(sign, 'card', *self._card_signature(card_node))
+
+    def _deck_feature(self, player: int, card_id: str, index_from_bottom: int) -> tuple:
+        """Hashed feature for a card at a deck position."""
+        if self._canonical:
+            card_id = card_id.rsplit('.', 1)[0]
+        return ('deck', player, card_id, index_from_bottom)
+
+    def _card_signature(self, card_node: str) -> tuple:
+        """Hashed card features: (identity, zone, exerted, damage, entered_play)."""
+        identity = card_node.rsplit('.', 1)[0] if self._canonical else card_node
+
+        data = self.graph.nodes[card_node]
+        return (
+            identity,
+            self.card_zone(card_node),
+            _clean(data.get('exerted', '0')),
+            _clean(data.get('damage', '0')),
+            _clean(data.get('entered_play', '')),
+        )
+
+    def _compute_hash(self) -> int:
+        """Compute the Zobrist hash from scratch (one pass over the graph)."""
+        self._canonical = get_node_attr(self.graph, 'game', 'canonical', '0') == '1'
+        features = []
+
+        for node, data in self.graph.nodes(data=True):
+            node_type = _clean(data.get('type'))
+            if node_type == 'Card':
+                features.append(('card', *self._card_signature(node)))
+            elif node_type in ('Game', 'Player'):
+                for attr, value in data.items():
+                    if attr != 'type':
+                        features.append(('attr', node, attr, _clean(value)))
+
+        for u, v, data in self.graph.edges(data=True):
+            label = _clean(data.get('label'))
+            if label in _HASHED_EDGES:
+                features.append((label, v))
+
+        # Deck order matters for future draws. Index from the bottom so a
+        # draw (which removes the top card) leaves other keys unchanged.
+        for player, deck_ids in ((1, self.deck1_ids), (2, self.deck2_ids)):
+            for i, card_id in enumerate(deck_ids):
+                features.append(self._deck_feature(player, card_id, len(deck_ids) - 1 - i))
+
+        return sum(zobrist_key(*feature) for feature in features) & HASH_MASK
+
     def _create_card_node(self, card_id: str, player: int) -> str:
         """
         Create card node in graph.
@@ -139,3 +432,10 @@ class LorcanaState:
         )
 
         return node_id
+
+
+def _clean(value) -> str:
+    """Normalize an attribute value (pydot may leave quotes on strings)."""
+    if value is None:
+        return ''
+    return str(value).strip('"')
@@ -0,0 +1,250 @@
+"""
+Card trajectory extraction (AI.md phase 2).
+
+Replays whole game trees once and records every card's status at every
+state: zone, exerted, damage and turns in its current zone. Games that
+share a prefix share the replay and the stored rows - each distinct tree
+node is computed and stored once, and a game is a path of node indices.
+
+Turns in zone count from when the card entered the zone, also when the
+tree starts below its seed: the path from the seed is replayed first
+(without rows) to learn when the root's cards got where they are. A
+root with no seed directory above it counts from the root's turn.
+
+Columnar layout (Trajectories):
+    node_parent, node_turn          per tree node (node 0 = root)
+    node_offset                     rows of node i: node_offset[i]:node_offset[i+1]
+    row_card, row_zone, row_exerted, row_damage, row_turns_in_zone
+                                    one row per (node, card with a node)
+    game_leaf                       last node of each game
+    games, cards, zones             labels for game/card/zone indices
+
+extract_trajectory(game_path, card_id) from AI.md is trajectories.timeline().
+"""
+import copy
+from pathlib import Path
+import numpy as np
+from lib.core.file_store import FileStore
+from lib.core.graph import get_node_attr
+from lib.core.outcome import find_seed_path
+from lib.lorcana.execute import execute_action
+from lib.lorcana.snapshot import GameSnapshot
+from lib.lorcana.state import LorcanaState
+
+ZONES = ('hand', 'play', 'ink', 'discard')
+_ZONE_CODES = {kind: code for code, kind in enumerate(ZONES)}
+
+
+class Trajectories:
+    """Columnar card trajectories for a set of games (see module docstring)."""
+
+    _ARRAYS = ('node_parent', 'node_turn', 'node_offset', 'row_card', 'row_zone',
+               'row_exerted', 'row_damage', 'row_turns_in_zone', 'game_leaf')
+
+    def __init__(self, arrays: dict, games: list[str], cards: list[str]):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self.games = games
+        self.cards = cards
+        self.zones = list(ZONES)
+        self._card_index = {card: i for i, card in enumerate(cards)}
+
+    def game_nodes(self, game: int) -> list[int]:
+        """Tree nodes of a game, root first (one per state, including the start)."""
+        nodes = []
+        node = int(self.game_leaf[game])
+        while node != -1:
+            nodes.append(node)
+            node = int(self.node_parent[node])
+        nodes.reverse()
+        return nodes
+
+    def timeline(self, game: int | str, card_id: str) -> list[dict | None]:
+        """
+        One card's state at each step of a game.
+
+        Args:
+            game: Game index, or its action path as listed in games
+            card_id: Card node ID (e.g. "p1.elsa_spirit_of_winter.a")
+
+        Returns:
+            Per step: dict(zone, exerted, damage, turns_in_zone, turn), or
+            None while the card is still in the deck
+        """
+        if isinstance(game, str):
+            game = self.games.index(game)
+        card = self._card_index.get(card_id)
+
+        result = []
+        for node in self.game_nodes(game):
+            start, end = self.node_offset[node], self.node_offset[node + 1]
+            hits = np.nonzero(self.row_card[start:end] == card)[0] if card is not None else []
+            if len(hits) == 0:
+                result.append(None)
+                continue
+            row = start + hits[0]
+            result.append({
+                'zone': ZONES[self.row_zone[row]],
+                'exerted': bool(self.row_exerted[row]),
+                'damage': int(self.row_damage[row]),
+                'turns_in_zone': int(self.row_turns_in_zone[row]),
+                'turn': int(self.node_turn[node]),
+            })
+        return result
+
+    def save(self, path: Path | str) -> None:
+        """Write as a single .npz (labels included)."""
+        np.savez_compressed(
+            path,
+            games=np.array(self.games, dtype=str),
+            cards=np.array(self.cards, dtype=str),
+            **{name: getattr(self, name) for name in self._ARRAYS},
+        )
+
+    @classmethod
+    def load(cls, path: Path | str):
+        """Read a file written by save()."""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in cls._ARRAYS}
+            return cls(arrays, list(data['games']), list(data['cards']))
+
+
+def extract_trajectories(root_path: Path | str, games: list[str] | None = None,
+                         store: FileStore | None = None) -> Trajectories:
+    """
+    Replay a game tree once and collect trajectories for all its cards.
+
+    Args:
+        root_path: Stored state the games start from (usually a seed dir)
+        games: Action paths below root ("0.1.2" or "0/1/2"); defaults to
+               every finished game recorded under root (outcome.txt.*)
+        store: Store to load the root from
+
+    Returns:
+        Trajectories for the games, in the order given
+    """
+    store = store or FileStore()
+    if games is None:
+        games = sorted(store.get_outcomes(root_path))
+
+    # Prefix tree of the games' action paths: key -> {action_id: key}
+    children = {(): {}}
+    leaves = []
+    for game in games:
+        ids = tuple(part for part in game.replace('.', '/').split('/') if part)
+        for depth in range(len(ids)):
+            children.setdefault(ids[:depth], {}).setdefault(ids[depth], ids[:depth + 1])
+            children.setdefault(ids[:depth + 1], {})
+        leaves.append(ids)
+
+    builder = _Builder()
+    root = store.load_state(root_path, LorcanaState)
+    node_of = {(): builder.add_node(root, -1, _root_zones(root_path, store))}
+
+    # Depth-first replay; the state is only copied where the tree branches
+    stack = [((), root, builder.last_zones)]
+    while stack:
+        key, state, zones = stack.pop()
+        branches = list(children[key].items())
+        for i, (action_id, child_key) in enumerate(branches):
+            child = state if i == len(branches) - 1 else copy.deepcopy(state)
+            action = child.get_action(action_id)
+            if action is None:
+                raise ValueError(f"Action {action_id} not found after {'/'.join(key) or 'root'}")
+            execute_action(child, action.action_type, action.src, action.dst)
+            node_of[child_key] = builder.add_node(child, node_of[key], zones)
+            stack.append((child_key, child, builder.last_zones))
+
+    arrays = builder.arrays()
+    arrays['game_leaf'] = np.array([node_of[ids] for ids in leaves], dtype=np.int32)
+    return Trajectories(arrays, list(games), builder.cards)
+
+
+class _Builder:
+    """Accumulates node and row columns during the replay."""
+
+    def __init__(self):
+        self.cards = []
+        self._card_index = {}
+        self.node_parent, self.node_turn, self.node_offset = [], [], [0]
+        self.rows = {'card': [], 'zone': [], 'exerted': [], 'damage': [], 'turns_in_zone': []}
+        self.last_zones = {}
+
+    def add_node(self, state: LorcanaState, parent: int, parent_zones: dict) -> int:
+        """
+        Record one state's cards. parent_zones maps card -> (zone, turn
+        entered) at the parent; this node's map is left in last_zones.
+        """
+        snap = GameSnapshot.from_graph(state.graph)
+        turn = int(get_node_attr(state.graph, 'game', 'turn', 0))
+        zones = _card_zones(snap, turn, parent_zones)
+
+        for card, (code, entered) in zones.items():
+            self.rows['card'].append(self._card(card))
+            self.rows['zone'].append(code)
+            self.rows['exerted'].append(snap.card_attr(card, 'exerted', '0') == '1')
+            self.rows['damage'].append(int(snap.card_attr(card, 'damage', '0')))
+            self.rows['turns_in_zone'].append(turn - entered)
+
+        self.node_parent.append(parent)
+        self.node_turn.append(turn)
+        self.node_offset.append(len(self.rows['card']))
+        self.last_zones = zones
+        return len(self.node_parent) - 1
+
+    def arrays(self) -> dict:
+        return {
+            'node_parent': np.array(self.node_parent, dtype=np.int32),
+            'node_turn': np.array(self.node_turn, dtype=np.int16),
+            'node_offset': np.array(self.node_offset, dtype=np.int64),
+            'row_card': np.array(self.rows['card'], dtype=np.int32),
+            'row_zone': np.array(self.rows['zone'], dtype=np.int8),
+            'row_exerted': np.array(self.rows['exerted'], dtype=np.int8),
+            'row_damage': np.array(self.rows['damage'], dtype=np.int16),
+            'row_turns_in_zone': np.array(self.rows['turns_in_zone'], dtype=np.int16),
+        }
+
+    def _card(self, card: str) -> int:
+        index = self._card_index.get(card)
+        if index is None:
+            index = len(self.cards)
+            self._card_index[card] = index
+            self.cards.append(card)
+        return index
+
+
+def _card_zones(snap: GameSnapshot | None, turn: int, parent_zones: dict) -> dict:
+    """card -> (zone code, turn entered), keeping the entry turn of cards that stayed put."""
+    zones = {}
+    if snap is None:
+        return zones
+    for zone_node, cards in snap.zones().items():
+        code = _ZONE_CODES.get(zone_node.rsplit('.', 1)[-1])
+        if code is None:
+            continue
+        for card in cards:
+            previous = parent_zones.get(card)
+            zones[card] = (code, previous[1] if previous and previous[0] == code else turn)
+    return zones
+
+
+def _root_zones(root_path: Path | str, store: FileStore) -> dict:
+    """
+    Zone entry turns of the root's parent, replayed from the seed (see
+    module docstring); empty for a seed root or one without a stored seed.
+    """
+    seed_path = find_seed_path(str(root_path))
+    if seed_path is None or Path(seed_path) == Path(root_path) or not store.state_exists(seed_path):
+        return {}
+
+    state = store.load_state(seed_path, LorcanaState)
+    action_ids = Path(str(root_path)[len(seed_path):].lstrip('/')).parts
+    zones = {}
+    for action_id in action_ids:
+        zones = _card_zones(GameSnapshot.from_graph(state.graph),
+                            int(get_node_attr(state.graph, 'game', 'turn', 0)), zones)
+        action = state.get_action(action_id)
+        if action is None:
+            raise ValueError(f"Action {action_id} not found on the way from {seed_path} to {root_path}")
+        execute_action(state, action.action_type, action.src, action.dst)
+    return zones
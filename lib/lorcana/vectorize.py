@@ -0,0 +1,161 @@
+"""
+Board-state vectorizer (AI.md phase 3).
+
+Turns a LorcanaState into a fixed-width float32 feature vector, read
+straight from the in-memory graph (one edge pass via GameSnapshot, no DOT
+round-trip). Features are from the current player's perspective: "me_*"
+is the player to act, "opp_*" the opponent, so positions are comparable
+regardless of seat.
+
+The layout is versioned: FEATURES lists the column names and
+SCHEMA_VERSION changes whenever columns are added, removed or reordered.
+Persist both next to any stored vectors.
+"""
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+from lib.core.file_store import FileStore
+from lib.core.graph import get_node_attr
+from lib.lorcana.helpers import get_player_zone
+from lib.lorcana.snapshot import GameSnapshot
+from lib.lorcana.state import LorcanaState
+
+SCHEMA_VERSION = 1
+
+_GLOBAL_FEATURES = (
+    'turn',               # Turn number
+    'current_is_p1',      # 1 if p1 is the player to act
+    'game_over',          # 1 if the game has ended
+)
+
+_SIDE_FEATURES = (
+    'lore', 'ink_available', 'ink_total', 'ink_drops',      # Player counters
+    'hand', 'deck', 'play', 'inkwell', 'discard',           # Zone counts
+    'strength', 'willpower', 'board_lore',                  # Characters in play: stat totals
+    'exerted', 'ready', 'drying',                           # Characters in play: status counts
+    'damaged', 'damage',                                    # Damaged characters, total damage
+)
+
+FEATURES = (
+    _GLOBAL_FEATURES
+    + tuple(f"me_{name}" for name in _SIDE_FEATURES)
+    + tuple(f"opp_{name}" for name in _SIDE_FEATURES)
+)
+NUM_FEATURES = len(FEATURES)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURES)}
+
+# Rows per chunk when the number of states isn't known up front
+_CHUNK_ROWS = 4096
+
+
+def vectorize_board(state: LorcanaState, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Board state -> float32 vector of NUM_FEATURES (see FEATURES).
+
+    Args:
+        state: Game state
+        out: Optional float32 row to fill in place (e.g. a row of a batch)
+
+    Returns:
+        The feature vector (out, if given)
+    """
+    if out is None:
+        out = np.zeros(NUM_FEATURES, dtype=np.float32)
+    else:
+        out[:] = 0
+
+    snap = GameSnapshot.from_graph(state.graph)
+    if snap is None:
+        return out
+
+    out[0] = snap.current_turn
+    out[1] = snap.player == 'p1'
+    out[2] = get_node_attr(state.graph, 'game', 'game_over', '0') == '1'
+
+    base = len(_GLOBAL_FEATURES)
+    for player in (snap.player, snap.opponent):
+        _fill_side(state, snap, player, out[base:base + len(_SIDE_FEATURES)])
+        base += len(_SIDE_FEATURES)
+
+    return out
+
+
+def vectorize_batch(states: Iterable[LorcanaState]) -> np.ndarray:
+    """
+    Vectorize many states into a 2-D float32 array (one row per state).
+
+    Accepts any iterable (including generators); rows are filled in place.
+    """
+    if isinstance(states, (list, tuple)):
+        batch = np.zeros((len(states), NUM_FEATURES), dtype=np.float32)
+        for row, state in zip(batch, states):
+            vectorize_board(state, out=row)
+        return batch
+
+    chunks = []
+    chunk = np.zeros((_CHUNK_ROWS, NUM_FEATURES), dtype=np.float32)
+    filled = 0
+    for state in states:
+        vectorize_board(state, out=chunk[filled])
+        filled += 1
+        if filled == _CHUNK_ROWS:
+            chunks.append(chunk)
+            chunk = np.zeros((_CHUNK_ROWS, NUM_FEATURES), dtype=np.float32)
+            filled = 0
+    chunks.append(chunk[:filled])
+    return np.concatenate(chunks)
+
+
+def vectorize_paths(paths: Iterable[Path | str], store: FileStore | None = None) -> np.ndarray:
+    """
+    Vectorize stored states, streaming them from disk one at a time.
+
+    Args:
+        paths: State directories (any iterable, e.g. a directory walk)
+        store: Store to load from (defaults to an uncached FileStore, so
+               memory stays flat over millions of paths)
+
+    Returns:
+        2-D float32 array, one row per path, in order
+    """
+    store = store or FileStore(max_cached=0)
+    return vectorize_batch(store.load_state(path, LorcanaState) for path in paths)
+
+
+# ========== Internal Helpers ==========
+
+def _fill_side(state: LorcanaState, snap: GameSnapshot, player: str, row: np.ndarray) -> None:
+    """Fill one player's _SIDE_FEATURES slice."""
+    G = state.graph
+    row[0] = int(get_node_attr(G, player, 'lore', 0))
+    row[1] = int(get_node_attr(G, player, 'ink_available', 0))
+    row[2] = int(get_node_attr(G, player, 'ink_total', 0))
+    row[3] = int(get_node_attr(G, player, 'ink_drops', 0))
+
+    row[4] = len(snap.cards_in(get_player_zone(player, 'hand')))
+    row[5] = len(state.deck1_ids if player == 'p1' else state.deck2_ids)
+    in_play = snap.cards_in(get_player_zone(player, 'play'))
+    row[6] = len(in_play)
+    row[7] = len(snap.cards_in(get_player_zone(player, 'ink')))
+    row[8] = len(snap.cards_in(get_player_zone(player, 'discard')))
+
+    for card_node in in_play:
+        card_data = snap.card_data(card_node)
+        if card_data['type'] != 'Character':
+            continue
+
+        row[9] += card_data.get('strength', 0)
+        row[10] += card_data.get('willpower', 0)
+        row[11] += card_data.get('lore', 0)
+
+        if snap.card_attr(card_node, 'exerted', '0') == '1':
+            row[12] += 1
+        else:
+            row[13] += 1
+        if int(snap.card_attr(card_node, 'entered_play', '-1')) == snap.current_turn:
+            row[14] += 1
+
+        damage = int(snap.card_attr(card_node, 'damage', '0'))
+        if damage > 0:
+            row[15] += 1
+            row[16] += damage
@@ -0,0 +1,64 @@
+"""
+Shared fixtures: a seed root built from the bundled decks.
+
+Engine tests need the card database (data/cards.json, not in the repo)
+and run from the repository root, like the CLIs.
+"""
+import copy
+import shutil
+from pathlib import Path
+
+import pytest
+
+from lib.core.file_store import FileStore
+from lib.core.graph import load_dot, save_dot
+from lib.core.navigation import format_actions
+from lib.lorcana.compute import compute_all
+from lib.lorcana.setup import DECK1_SOURCE, DECK2_SOURCE, SeedBuilder
+from lib.lorcana.state import LorcanaState
+
+SEED = "b123456.0123456.ab"
+
+
+@pytest.fixture(scope="session")
+def matchdir(tmp_path_factory) -> Path:
+    """Matchup of data/decks/bs01.txt vs rp01.txt (as `just match` creates it)."""
+    if not Path("data/cards.json").exists():
+        pytest.skip("needs the card database data/cards.json")
+    matchdir = tmp_path_factory.mktemp("matchup")
+    shutil.copy("data/decks/bs01.txt", matchdir / DECK1_SOURCE)
+    shutil.copy("data/decks/rp01.txt", matchdir / DECK2_SOURCE)
+    state = LorcanaState(load_dot("data/template.dot"), [], [])
+    compute_all(state)
+    save_dot(state.export_graph(), matchdir / "game.dot")
+    return matchdir
+
+
+@pytest.fixture(scope="session")
+def seed_builder(matchdir) -> SeedBuilder:
+    return SeedBuilder(matchdir)
+
+
+@pytest.fixture(scope="session")
+def _seed_state(seed_builder) -> LorcanaState:
+    return seed_builder.build(SEED)
+
+
+@pytest.fixture
+def seed_state(_seed_state) -> LorcanaState:
+    """Fresh copy of the seed root (p1 to move, turn 0 main step)."""
+    return copy.deepcopy(_seed_state)
+
+
+@pytest.fixture
+def canonical_seed_state(seed_builder) -> LorcanaState:
+    """The same seed root in canonical mode (card copies collapsed)."""
+    return seed_builder.build(SEED, canonical=True)
+
+
+@pytest.fixture
+def seed_dir(seed_state, tmp_path) -> Path:
+    """The seed root saved as a state directory (<tmp>/b013/<seed>)."""
+    seed_dir = tmp_path / "b013" / SEED
+    FileStore().save_state(seed_state, seed_dir, format_actions_fn=format_actions)
+    return seed_dir
@@ -0,0 +1,35 @@
+"""Legal actions as an ID-indexed list on the state (LorcanaState.actions)."""
+import random
+
+from lib.core.file_store import FileStore
+from lib.core.graph import can_edges
+from lib.core.navigation import format_actions
+from lib.lorcana.execute import execute_action
+from lib.lorcana.state import LorcanaState
+
+
+def test_actions_survive_a_dot_round_trip(seed_state, tmp_path):
+    store = FileStore(max_cached=0)
+    rng = random.Random(0)
+    for ply in range(8):
+        store.save_state(seed_state, tmp_path / str(ply), format_actions_fn=format_actions)
+        loaded = store.load_state(tmp_path / str(ply), LorcanaState)
+        assert loaded.actions == seed_state.actions
+        assert not can_edges(loaded.graph)
+        assert len(can_edges(seed_state.export_graph())) == len(seed_state.actions)
+
+        lines = (tmp_path / str(ply) / "actions.txt").read_text().splitlines()
+        assert [line.split(":")[0] for line in lines] == [str(i) for i in range(len(seed_state.actions))]
+
+        if not seed_state.actions:
+            break
+        edge = rng.choice(seed_state.actions)
+        execute_action(seed_state, edge.action_type, edge.src, edge.dst)
+
+
+def test_get_action_by_id(seed_state):
+    last = len(seed_state.actions) - 1
+    assert seed_state.get_action(0) == seed_state.actions[0]
+    assert seed_state.get_action(str(last)) == seed_state.actions[last]
+    for bad in (last + 1, -1, "x", None):
+        assert seed_state.get_action(bad) is None
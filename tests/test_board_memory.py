@@ -0,0 +1,28 @@
+"""Recording games into the board memory (lib/lorcana/board_memory.py)."""
+import random
+
+from lib.lorcana.board_memory import BoardMemory
+from lib.lorcana.game_api import GameSession
+
+
+def _random_game(state, game) -> list[str]:
+    random.seed(game)
+    session = GameSession(state)
+    return session.play_until_game_over().strip('/').split('/')
+
+
+def test_only_recorded_games_add_rows_and_keys(seed_state, tmp_path):
+    memory = BoardMemory(tmp_path / "memory")
+    finished = _random_game(seed_state, 0)
+    assert memory.record_game(seed_state, finished, "root") == len(finished)
+    keys = (tmp_path / "memory" / "action_keys.txt").read_text()
+
+    # Already recorded, or no winner yet: no rows, and the key table stays put
+    assert memory.record_game(seed_state, finished, "root") == 0
+    assert memory.record_game(seed_state, _random_game(seed_state, 1)[:12], "root") == 0
+    assert (tmp_path / "memory" / "action_keys.txt").read_text() == keys
+    assert len(memory) == len(finished)
+
+    reopened = BoardMemory(tmp_path / "memory")
+    assert reopened.record_game(seed_state, finished, "root") == 0
+    assert reopened.action_keys == memory.action_keys
@@ -0,0 +1,25 @@
+"""Census of stored game trees (lib/core/census.py)."""
+import pytest
+
+from lib.core.census import census_tree, sample_census
+
+
+def _state(path, turn, actions=2):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "game.dot").write_text(f'digraph {{\ngame [turn="{turn}", game_over="0"];\n}}\n')
+    (path / "actions.txt").write_text("".join(f"{i}: end\n" for i in range(actions)))
+
+
+def test_replayed_path_counts_only_stored_states(tmp_path):
+    # A seed plus one replayed 5-ply path: the intermediate directories
+    # exist but hold no state
+    seed = tmp_path / "seed"
+    _state(seed, turn=0, actions=7)
+    _state(seed / "0" / "0" / "0" / "0" / "0", turn=2, actions=3)
+
+    for census in (census_tree(seed, workers=1), sample_census(seed, walks=20, seed=1)):
+        d = census.to_dict()
+        assert d['nodes'] == pytest.approx(2)
+        assert d['by_depth'] == pytest.approx({0: 1, 5: 1})
+        assert d['by_turn'] == pytest.approx({0: 1, 2: 1})
+        assert d['branching'] == pytest.approx({3: 1, 7: 1})
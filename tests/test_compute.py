@@ -0,0 +1,33 @@
+"""Incremental legal-action recompute (lib/lorcana/compute.py)."""
+import copy
+import random
+
+import pytest
+
+from lib.lorcana.compute import compute_all
+from lib.lorcana.execute import execute_action
+
+
+def _playout(state, rng, max_plies=400):
+    """Apply random legal actions until the game ends, yielding after each."""
+    for _ in range(max_plies):
+        if not state.actions:
+            return
+        edge = rng.choice(state.actions)
+        execute_action(state, edge.action_type, edge.src, edge.dst)
+        yield edge
+
+
+@pytest.mark.parametrize("root", ["seed_state", "canonical_seed_state"])
+def test_incremental_matches_full_recompute(request, root):
+    root = request.getfixturevalue(root)
+    plies = 0
+    for game in range(6):
+        state = copy.deepcopy(root)
+        for edge in _playout(state, random.Random(game)):
+            fresh = copy.deepcopy(state)
+            fresh.action_cache = None
+            compute_all(fresh)
+            assert state.actions == fresh.actions, f"game {game}, after {edge.description}"
+            plies += 1
+    assert plies > 100
@@ -0,0 +1,66 @@
+"""Columnar dataset export and its versioned shards (lib/lorcana/dataset.py)."""
+import random
+
+from lib.core.file_store import FileStore
+from lib.core.navigation import format_actions
+from lib.lorcana.dataset import export_dataset, load_dataset, shard_name
+from lib.lorcana.game_api import GameSession
+
+
+def _finish_game(seed, state, game) -> int:
+    """Play a random game in memory and record its outcome under seed; returns its plies."""
+    random.seed(game)
+    session = GameSession(state)
+    path = session.play_until_game_over().strip('/').split('/')
+
+    store = FileStore()
+    seed.joinpath(*path).mkdir(parents=True, exist_ok=True)
+    store.save_outcome(seed.joinpath(*path), None, {'winner': session.get_winner()})
+    store.save_outcome(seed, '.'.join(path), {'winner': session.get_winner()})
+    return len(path)
+
+
+def _versions(out):
+    return sorted(path.name for path in out.iterdir() if path.name.startswith('.'))
+
+
+def test_reexport_switches_shard_versions(seed_state, tmp_path):
+    seed = tmp_path / "b013" / "seed"
+    FileStore().save_state(seed_state, seed, format_actions_fn=format_actions)
+    plies = _finish_game(seed, seed_state, 0) + _finish_game(seed, seed_state, 1)
+
+    out = tmp_path / "dataset"
+    shard = out / shard_name(seed)
+    summary = export_dataset([tmp_path / "b013"], out, workers=1)
+    assert (summary['exported'], summary['rows']) == (1, plies)
+    assert shard.is_symlink()
+    assert _versions(out) == [shard.readlink().name]
+
+    assert export_dataset([seed], out, workers=1)['skipped'] == 1
+
+    plies += _finish_game(seed, seed_state, 2)
+    first = shard.readlink()
+    summary = export_dataset([seed], out, workers=1)
+    assert (summary['exported'], summary['updated']) == (1, 1)
+    assert shard.readlink() != first
+    assert _versions(out) == [shard.readlink().name]
+    assert len(load_dataset(out)['ply']) == plies
+
+
+def test_plain_shard_directory_is_replaced(seed_state, tmp_path):
+    seed = tmp_path / "b013" / "seed"
+    FileStore().save_state(seed_state, seed, format_actions_fn=format_actions)
+    _finish_game(seed, seed_state, 0)
+
+    # A shard written before versioning: a directory under the shard's name
+    out = tmp_path / "dataset"
+    export_dataset([seed], out, workers=1)
+    shard = out / shard_name(seed)
+    version = shard.resolve()
+    shard.unlink()
+    version.rename(shard)
+
+    _finish_game(seed, seed_state, 1)
+    assert export_dataset([seed], out, workers=1)['updated'] == 1
+    assert shard.is_symlink()
+    assert _versions(out) == [shard.readlink().name]
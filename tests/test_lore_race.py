@@ -0,0 +1,70 @@
+"""Lore-race bounds and the forced winner (lib/lorcana/lore_race.py)."""
+from lib.lorcana.helpers import get_player_zone
+from lib.lorcana.lore_race import PlayerRace, _Character, _min_turns, forced_winner, race_bounds
+
+# Non-character cards: drawing them never adds to a race
+ACTIONS = ["beyond_the_horizon.z", "spooky_sight.z", "strength_of_a_raging_fire.z",
+           "he_hurled_his_thunderbolt.z"] * 2
+
+
+def _board(state, player, lore, play=(), exerted=False, deck=ACTIONS):
+    """Clear a player's hand and play, then set lore, characters in play and deck."""
+    for zone in ('hand', 'play'):
+        for card in state.cards_in(get_player_zone(player, zone)):
+            state.move_card(card, get_player_zone(player, 'discard'))
+    state.set_attr(player, 'lore', str(lore))
+
+    # Draw the characters (unique copy suffixes), then put them into play
+    number = int(player[1])
+    setattr(state, f"deck{number}_ids", [f"{name}.t{i}" for i, name in enumerate(play)] + list(deck))
+    state.draw(number, len(play))
+    for card in state.cards_in(get_player_zone(player, 'hand')):
+        state.move_card(card, get_player_zone(player, 'play'))
+        if exerted:
+            state.exert(card)
+
+
+def test_exerted_board_quests_from_next_turn(seed_state):
+    # p1 (to move) has only an exerted 3-lore character and no characters
+    # left to draw: it quests from turn 1, reaching 20 on turn 4
+    assert _min_turns(10, 5, True, [_Character(3, 0, 3, True, True)], []) == 4
+
+    _board(seed_state, 'p1', 8, ["mulan_disguised_soldier"], exerted=True)
+    _board(seed_state, 'p2', 2, ["mulan_disguised_soldier"])
+    bounds = race_bounds(seed_state)
+    assert bounds.p1 == PlayerRace(8, 4, 4)
+    assert bounds.p2 == PlayerRace(2, 5, 5)
+    assert bounds.winner == 'p1'
+
+
+def test_mover_wins_equal_races(seed_state):
+    _board(seed_state, 'p1', 17, ["mulan_disguised_soldier"])
+    _board(seed_state, 'p2', 17, ["mulan_disguised_soldier"])
+    assert race_bounds(seed_state).p1 == race_bounds(seed_state).p2 == PlayerRace(17, 0, 0)
+    assert forced_winner(seed_state) == 'p1'
+
+    seed_state.set_current_player('p2')
+    assert forced_winner(seed_state) == 'p2'
+
+
+def test_empty_deck_has_no_race(seed_state):
+    # The mover decks out on its next draw; the other player on its first
+    _board(seed_state, 'p1', 10, ["mulan_disguised_soldier"], deck=[])
+    _board(seed_state, 'p2', 10, ["mulan_disguised_soldier"])
+    bounds = race_bounds(seed_state)
+    assert bounds.p1 == PlayerRace(10, None, None)
+    assert bounds.p2 == PlayerRace(10, 3, 3)
+    assert bounds.winner == 'p2'
+
+    _board(seed_state, 'p1', 10, ["mulan_disguised_soldier"])
+    _board(seed_state, 'p2', 10, ["mulan_disguised_soldier"], deck=[])
+    assert race_bounds(seed_state).p2 == PlayerRace(10, None, None)
+    assert forced_winner(seed_state) == 'p1'
+
+
+def test_undecided_seed_and_finished_game(seed_state):
+    assert forced_winner(seed_state) is None
+
+    seed_state.set_attr('game', 'winner', 'p2')
+    seed_state.set_attr('game', 'game_over', '1')
+    assert forced_winner(seed_state) == 'p2'
@@ -0,0 +1,46 @@
+"""Mechanic registry and the shared per-state snapshot (lib/lorcana/mechanics, snapshot.py)."""
+import random
+
+from lib.core.graph import edges_by_label
+from lib.lorcana.compute import compute_all
+from lib.lorcana.execute import execute_action
+from lib.lorcana.helpers import ActionEdge
+from lib.lorcana.mechanics import registry
+from lib.lorcana.mechanics.registry import Mechanic, get_mechanic, register_mechanic
+from lib.lorcana.snapshot import GameSnapshot
+
+
+def test_snapshot_matches_graph(seed_state):
+    rng = random.Random(0)
+    for _ in range(60):
+        snap = GameSnapshot.from_graph(seed_state.graph)
+        [(_, player, _)] = edges_by_label(seed_state.graph, 'CURRENT_TURN')
+        assert snap.player == player == seed_state.current_player
+        assert snap.step == seed_state.current_step.rsplit('.', 1)[1]
+        for zone, cards in snap.zones().items():
+            assert sorted(cards) == sorted(seed_state.cards_in(zone))
+
+        if not seed_state.actions:
+            break
+        edge = rng.choice(seed_state.actions)
+        execute_action(seed_state, edge.action_type, edge.src, edge.dst)
+
+
+def test_registered_mechanic_plugs_in(seed_state, monkeypatch):
+    monkeypatch.setattr(registry, '_MECHANICS', dict(registry._MECHANICS))
+    executed = []
+    register_mechanic(Mechanic(
+        action_type="CAN_WAVE",
+        compute=lambda snap: [ActionEdge(snap.player, snap.opponent, "CAN_WAVE", "wave")],
+        execute=lambda state, src, dst: executed.append((src, dst)),
+    ))
+
+    seed_state.action_cache = None
+    compute_all(seed_state)
+    assert ActionEdge('p1', 'p2', "CAN_WAVE", "wave") in seed_state.actions
+
+    execute_action(seed_state, "CAN_WAVE", 'p1', 'p2')
+    assert executed == [('p1', 'p2')]
+    # The default invalidation recomputes it after every action
+    assert ActionEdge('p1', 'p2', "CAN_WAVE", "wave") in seed_state.actions
+    assert get_mechanic("CAN_WAVE").action_type == "CAN_WAVE"
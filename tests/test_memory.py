@@ -0,0 +1,22 @@
+"""Store memory accounting (StateStore.memory_usage, lib/core/memsize.py)."""
+from lib.core.memory_store import MemoryStore
+from lib.core.memsize import format_usage
+
+
+def test_peak_states_is_tracked_between_samples(seed_state):
+    store = MemoryStore()
+    for key in ("a", "b", "c"):
+        store.save_state(seed_state, key)
+    store.clear()
+    store.save_state(seed_state, "d")
+
+    usage = store.memory_usage()
+    assert usage['states'] == 1
+    # Every save counts toward peak_states; bytes are only what was sampled
+    assert usage['peak_states'] == 3
+    assert usage['max_sampled_bytes'] == usage['bytes'] > 0
+
+    store.clear()
+    usage = store.memory_usage()
+    assert usage['bytes'] < usage['max_sampled_bytes']
+    assert "largest sample" in format_usage(usage)
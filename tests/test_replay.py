@@ -0,0 +1,36 @@
+"""Replaying deep paths from the nearest stored state (lib/lorcana/execute.py)."""
+from lib.core.file_store import FileStore
+from lib.lorcana.execute import apply_action_at_path
+
+PATH = ("0", "0", "8", "0")
+
+
+def test_replay_saves_leaf_and_checkpoints(seed_dir):
+    store = FileStore()
+    assert apply_action_at_path(seed_dir.joinpath(*PATH), store=store, checkpoints={2}) == 4
+    assert store.state_exists(seed_dir.joinpath(*PATH))
+    assert store.state_exists(seed_dir.joinpath(*PATH[:2]))
+    assert not store.state_exists(seed_dir.joinpath(*PATH[:1]))
+    assert not store.state_exists(seed_dir.joinpath(*PATH[:3]))
+
+    # Already stored: nothing replayed
+    assert apply_action_at_path(seed_dir.joinpath(*PATH), store=store, checkpoints={2}) == 0
+
+
+def test_claimed_checkpoint_is_left_to_its_owner(seed_dir):
+    store = FileStore()
+    checkpoint = seed_dir.joinpath(*PATH[:2])
+    with store.claim(checkpoint) as owned:
+        assert owned
+        apply_action_at_path(seed_dir.joinpath(*PATH), store=store, checkpoints={2})
+        assert not store.state_exists(checkpoint)
+    assert store.state_exists(seed_dir.joinpath(*PATH))
+
+
+def test_stored_checkpoint_is_not_rewritten(seed_dir):
+    store = FileStore()
+    apply_action_at_path(seed_dir.joinpath(*PATH[:2]), store=store)
+    written = (seed_dir.joinpath(*PATH[:2]) / "game.dot").stat().st_mtime_ns
+
+    apply_action_at_path(seed_dir.joinpath(*PATH), store=FileStore(), checkpoints={2})
+    assert (seed_dir.joinpath(*PATH[:2]) / "game.dot").stat().st_mtime_ns == written
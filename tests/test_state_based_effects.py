@@ -0,0 +1,61 @@
+"""Banishing lethally damaged characters from the changed cards only (lib/lorcana/state_based_effects.py)."""
+import copy
+import random
+
+from lib.core.graph import get_node_attr
+from lib.lorcana.cards import get_willpower
+from lib.lorcana.execute import execute_action
+from lib.lorcana.helpers import get_card_data, get_player_zone
+from lib.lorcana.state_based_effects import check_state_based_effects
+
+
+def _lethal_in_play(state) -> list[str]:
+    """Characters in play with damage >= willpower, found by scanning both boards."""
+    return [card for player in ('p1', 'p2') for card in state.cards_in(get_player_zone(player, 'play'))
+            if get_card_data(state.graph, card)['type'] == 'Character'
+            and int(get_node_attr(state.graph, card, 'damage', '0')) >= get_willpower(state, card)]
+
+
+def test_no_lethal_damage_survives_random_games(seed_state):
+    challenges = 0
+    for game in range(6):
+        state = copy.deepcopy(seed_state)
+        rng = random.Random(game)
+        while state.actions:
+            edge = rng.choice(state.actions)
+            execute_action(state, edge.action_type, edge.src, edge.dst)
+            challenges += edge.action_type == "CAN_CHALLENGE"
+            assert not _lethal_in_play(state), f"game {game}, after {edge.description}"
+            assert not state.dirty_cards
+    assert challenges > 0
+
+
+def test_only_changed_cards_are_checked(seed_state):
+    hand = get_player_zone('p1', 'hand')
+    character = next(card for card in seed_state.cards_in(hand)
+                     if get_card_data(seed_state.graph, card)['type'] == 'Character')
+    seed_state.move_card(character, get_player_zone('p1', 'play'))
+    lethal = str(get_willpower(seed_state, character))
+
+    # A raw write bypasses dirty tracking: the card is not examined
+    seed_state.graph.nodes[character]['damage'] = lethal
+    check_state_based_effects(seed_state)
+    assert seed_state.card_zone(character) == get_player_zone('p1', 'play')
+
+    # mark_stats_changed (as willpower modifiers must) gets it checked
+    seed_state.mark_stats_changed(character)
+    check_state_based_effects(seed_state)
+    assert seed_state.card_zone(character) == get_player_zone('p1', 'discard')
+
+
+def test_damage_marks_the_card(seed_state):
+    hand = get_player_zone('p2', 'hand')
+    character = next(card for card in seed_state.cards_in(hand)
+                     if get_card_data(seed_state.graph, card)['type'] == 'Character')
+    seed_state.move_card(character, get_player_zone('p2', 'play'))
+    seed_state.damage_card(character, get_willpower(seed_state, character))
+    assert character in seed_state.dirty_cards
+
+    check_state_based_effects(seed_state)
+    assert seed_state.card_zone(character) == get_player_zone('p2', 'discard')
+    assert not seed_state.dirty_cards
@@ -0,0 +1,26 @@
+"""Per-card trajectories replayed from a game tree (lib/lorcana/trajectory.py)."""
+import random
+
+from lib.core.file_store import FileStore
+from lib.lorcana.execute import apply_action_at_path
+from lib.lorcana.game_api import GameSession
+from lib.lorcana.trajectory import extract_trajectories
+
+
+def test_rows_do_not_depend_on_the_extraction_root(seed_dir, seed_state):
+    random.seed(0)
+    session = GameSession(seed_state)
+    ids = session.play_until_game_over().strip('/').split('/')
+    start = len(ids) // 2
+    root = seed_dir.joinpath(*ids[:start])
+    apply_action_at_path(root, store=FileStore())
+
+    from_seed = extract_trajectories(seed_dir, ['/'.join(ids)])
+    from_root = extract_trajectories(root, ['/'.join(ids[start:])])
+
+    held = 0
+    for card in from_seed.cards:
+        expected = from_seed.timeline(0, card)[start:]
+        assert from_root.timeline(0, card) == expected, card
+        held += bool(expected[0] and expected[0]['turns_in_zone'])
+    assert held > 0
@@ -0,0 +1,37 @@
+"""Turn advance through the mirrored CURRENT_TURN/CURRENT_STEP edges (lib/lorcana/mechanics/turn.py)."""
+import copy
+import random
+
+from lib.core.graph import edges_by_label, get_node_attr
+from lib.lorcana.execute import execute_action
+from lib.lorcana.helpers import get_player_step, get_player_zone
+from lib.lorcana.state import LorcanaState
+
+
+def test_turn_mirrors_follow_the_edges(seed_state):
+    passes = 0
+    for game in range(4):
+        state = copy.deepcopy(seed_state)
+        rng = random.Random(game)
+        while state.actions:
+            edge = rng.choice(state.actions)
+            player, turn = state.current_player, int(get_node_attr(state.graph, 'game', 'turn'))
+            other = 'p2' if player == 'p1' else 'p1'
+            hand = len(state.cards_in(get_player_zone(other, 'hand')))
+            execute_action(state, edge.action_type, edge.src, edge.dst)
+
+            assert [v for _, v, _ in edges_by_label(state.graph, 'CURRENT_TURN')] == [state.current_player]
+            assert [v for _, v, _ in edges_by_label(state.graph, 'CURRENT_STEP')] == [state.current_step]
+            reloaded = LorcanaState(state.graph, state.deck1_ids, state.deck2_ids)
+            assert (reloaded.current_player, reloaded.current_step) == (state.current_player, state.current_step)
+
+            if edge.action_type != "CAN_PASS" or not state.actions:
+                continue
+            passes += 1
+            assert state.current_player == other
+            assert state.current_step == get_player_step(other, 'main')
+            assert int(get_node_attr(state.graph, 'game', 'turn')) == turn + 1
+            assert len(state.cards_in(get_player_zone(other, 'hand'))) == hand + 1
+            assert all(get_node_attr(state.graph, card, 'exerted', '0') == '0'
+                       for card in state.cards_in(get_player_zone(other, 'play')))
+    assert passes > 20
@@ -0,0 +1,95 @@
+"""Incremental Zobrist hashing and transpositions (LorcanaState.zobrist_hash, lib/core/transposition.py)."""
+import copy
+import random
+
+import pytest
+
+from lib.core.file_store import FileStore
+from lib.core.navigation import format_actions
+from lib.core.transposition import TranspositionTable
+from lib.lorcana.execute import execute_action
+from lib.lorcana.game_api import GameSession
+from lib.lorcana.service import RulesService
+from lib.lorcana.state import LorcanaState
+
+# Ink Jasmine, pass, pass, ink Mulan - and the other way round
+PATH = "0/0/8/0"
+TRANSPOSED = "1/0/8/0"
+
+
+def _full_hash(state) -> int:
+    return LorcanaState(copy.deepcopy(state.graph), list(state.deck1_ids), list(state.deck2_ids)).zobrist_hash
+
+
+@pytest.mark.parametrize("root", ["seed_state", "canonical_seed_state"])
+def test_incremental_hash_matches_full_hash(request, root):
+    root = request.getfixturevalue(root)
+    for game in range(4):
+        state = copy.deepcopy(root)
+        assert state.zobrist_hash == _full_hash(state)
+        rng = random.Random(game)
+        while state.actions:
+            edge = rng.choice(state.actions)
+            execute_action(state, edge.action_type, edge.src, edge.dst)
+            assert state.zobrist_hash == _full_hash(state), f"game {game}, after {edge.description}"
+
+
+def test_canonical_hash_ignores_copy_suffix(seed_state, canonical_seed_state):
+    def drawn(root, card_id):
+        state = copy.deepcopy(root)
+        state.deck1_ids = [card_id] + state.deck1_ids[1:]
+        state.draw(1)
+        return state.zobrist_hash
+
+    assert drawn(seed_state, "tipo_growing_son.b") != drawn(seed_state, "tipo_growing_son.c")
+    assert drawn(canonical_seed_state, "tipo_growing_son.b") == drawn(canonical_seed_state, "tipo_growing_son.c")
+
+
+def _play(session, path):
+    session.reset()
+    for action_id in path.split("/"):
+        assert session.apply_action(action_id)
+
+
+def test_transposed_paths_share_a_position(seed_state):
+    table = TranspositionTable()
+    session = GameSession(seed_state, transpositions=table)
+    _play(session, PATH)
+    first = session.get_state()
+    assert not session.is_transposition()
+
+    _play(session, TRANSPOSED)
+    assert session.is_transposition()
+    assert session.canonical_key() == f"root/{PATH}"
+    assert session.get_state().zobrist_hash == first.zobrist_hash
+    assert session.store.load_state(f"root/{TRANSPOSED}", LorcanaState).actions == first.actions
+    assert table.hits > 0
+
+
+def test_transposed_directory_links_to_the_first(seed_state, tmp_path):
+    root = tmp_path / "seed"
+    session = GameSession(seed_state, store=FileStore(), root_key=str(root), transpositions=TranspositionTable())
+    _play(session, PATH)
+    _play(session, TRANSPOSED)
+
+    linked = root / TRANSPOSED / "game.dot"
+    assert linked.is_symlink()
+    assert linked.resolve() == (root / PATH / "game.dot").resolve()
+    assert not (root / PATH / "game.dot").is_symlink()
+
+
+def test_canonical_session_merges_by_default(canonical_seed_state):
+    session = GameSession(canonical_seed_state)
+    _play(session, PATH)
+    _play(session, TRANSPOSED)
+    assert session.is_transposition()
+
+
+def test_rules_service_links_canonical_transpositions(seed_state, canonical_seed_state, tmp_path):
+    service = RulesService()
+    for name, state in (("plain", seed_state), ("canonical", canonical_seed_state)):
+        root = tmp_path / name
+        FileStore().save_state(state, root, format_actions_fn=format_actions)
+        service.play(root / PATH)
+        service.play(root / TRANSPOSED)
+        assert (root / TRANSPOSED / "game.dot").is_symlink() == (name == "canonical")